@@ -0,0 +1,420 @@
+import dotenv
+
+dotenv.load_dotenv(
+    override=True,
+)
+
+from typing import Dict, List, Any, Tuple
+import os
+import sys
+import json
+import time
+import resource
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+import hydra
+from hydra.utils import instantiate
+from omegaconf import DictConfig
+
+from src.databases import FaissIndex
+from src.managers import RecommendationManager, ReportManager
+
+CATEGORY_NAMES = [
+    "cream",
+    "lotion",
+    "serum",
+    "toner",
+    "essence",
+    "cleanser",
+    "sunscreen",
+    "mask",
+    "gel",
+    "balm",
+    "mist",
+    "oil",
+]
+INGREDIENT_NAMES = [
+    "water",
+    "glycerin",
+    "butylene glycol",
+    "niacinamide",
+    "dimethicone",
+    "cetearyl alcohol",
+    "panthenol",
+    "squalane",
+    "sodium hyaluronate",
+    "caprylic/capric triglyceride",
+    "tocopherol",
+    "allantoin",
+    "ceramide np",
+    "adenosine",
+    "xanthan gum",
+    "carbomer",
+    "tromethamine",
+    "phenoxyethanol",
+    "ethylhexylglycerin",
+    "disodium edta",
+    "citric acid",
+    "shea butter",
+    "jojoba seed oil",
+    "centella asiatica extract",
+    "madecassoside",
+    "zinc oxide",
+    "titanium dioxide",
+    "propanediol",
+    "1,2-hexanediol",
+    "fragrance",
+]
+
+
+def make_catalog(
+    config: DictConfig,
+    num_items: int,
+) -> pd.DataFrame:
+    rng = np.random.default_rng(config.seed)
+    vocab_size = config.benchmark.vocab_size
+    vocab = np.array(
+        [
+            (
+                INGREDIENT_NAMES[i]
+                if i < len(INGREDIENT_NAMES)
+                else f"{INGREDIENT_NAMES[i % len(INGREDIENT_NAMES)]} {i // len(INGREDIENT_NAMES)}"
+            )
+            for i in range(vocab_size)
+        ]
+    )
+    popularity = 1 / np.arange(1, vocab_size + 1) ** 1.1
+    popularity /= popularity.sum()
+
+    num_categories = min(config.benchmark.num_categories, len(CATEGORY_NAMES))
+    categories = rng.integers(0, num_categories, size=num_items)
+    num_ingredients = rng.integers(
+        config.benchmark.min_ingredients,
+        config.benchmark.max_ingredients + 1,
+        size=num_items,
+    )
+
+    ingredients = []
+    amounts = []
+    for count in num_ingredients.tolist():
+        ingredients.append(
+            "|".join(
+                vocab[
+                    rng.choice(
+                        vocab_size,
+                        size=count,
+                        replace=False,
+                        p=popularity,
+                    )
+                ]
+            )
+        )
+        amount = np.sort(rng.dirichlet(np.ones(count)))[::-1] * 100
+        amounts.append("|".join(f"{value:.4f}" for value in amount))
+
+    catalog = pd.DataFrame(
+        {
+            config.lab_id_column_name: [f"LAB{i:08d}" for i in range(num_items)],
+            config.category_column_name: [f"C{c:02d}" for c in categories.tolist()],
+            config.category_name_column_name: [
+                f"{CATEGORY_NAMES[c]}|{CATEGORY_NAMES[(c + 1) % num_categories]}"
+                for c in categories.tolist()
+            ],
+            config.target_column_name: ingredients,
+            config.amount_column_name: amounts,
+        }
+    )
+    return catalog
+
+
+def build_index(
+    config: DictConfig,
+    num_items: int,
+    embedding: Any,
+) -> Tuple[FaissIndex, Dict[str, float]]:
+    timings = {}
+    start_time = time.perf_counter()
+    catalog = make_catalog(
+        config=config,
+        num_items=num_items,
+    )
+    os.makedirs(
+        config.benchmark.data_path,
+        exist_ok=True,
+    )
+    catalog.to_csv(
+        os.path.join(
+            config.benchmark.data_path,
+            f"catalog_{num_items}.csv",
+        ),
+        index=False,
+    )
+    timings["catalog"] = time.perf_counter() - start_time
+
+    index: FaissIndex = instantiate(
+        config.database,
+        data_path=config.benchmark.data_path,
+        indices_name=f"catalog_{num_items}.faiss",
+        items_name=f"catalog_{num_items}.csv",
+    )
+    start_time = time.perf_counter()
+    index.import_items()
+    queries = index.items.column(config.target_column_name).tolist()
+    timings["import_items"] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    index.lexical.build(documents=queries)
+    index.lexical.save(version=index.version)
+    timings["lexical"] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    embedded = embedding.embed_batch(
+        queries=[embedding.canonicalize_query(query=query) for query in queries],
+        batch_size=config.build.batch_size,
+    )
+    timings["embed"] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    if not index.is_trained:
+        train_size = min(config.build.train_size, num_items)
+        train_rows = np.random.default_rng(config.seed).choice(
+            num_items,
+            size=train_size,
+            replace=False,
+        )
+        index.train(embedded=embedded[np.sort(train_rows)])
+    index.add(embedded=embedded)
+    index.save()
+    index.publish(keep_generations=config.build.keep_generations)
+    index.load()
+    timings["index"] = time.perf_counter() - start_time
+    return index, timings
+
+
+def get_latency_stats(
+    latencies: List[float],
+) -> Dict[str, float]:
+    latencies = np.array(latencies)
+    total = float(latencies.sum())
+    stats = {
+        "count": len(latencies),
+        "mean_ms": float(latencies.mean() * 1000),
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p95_ms": float(np.percentile(latencies, 95) * 1000),
+        "p99_ms": float(np.percentile(latencies, 99) * 1000),
+        "throughput": len(latencies) / total if total > 0 else 0.0,
+    }
+    return stats
+
+
+def get_peak_rss_mb() -> float:
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak_rss / (1024 * 1024)
+    return peak_rss / 1024
+
+
+def run_size(
+    config: DictConfig,
+    num_items: int,
+) -> Dict[str, Any]:
+    embedding = instantiate(
+        config.model.embedding,
+        cache_size=0,
+        cache_path=None,
+    )
+    reranker = instantiate(
+        config.model.reranker,
+        cache_size=0,
+        cache_path=None,
+    )
+    generator = instantiate(
+        config.model.generator,
+        cache_size=0,
+        cache_path=None,
+    )
+    index, build_timings = build_index(
+        config=config,
+        num_items=num_items,
+        embedding=embedding,
+    )
+    manager: RecommendationManager = instantiate(
+        config.manager.recommendation,
+        embedding=embedding,
+        reranker=reranker,
+        index=index,
+        render_cache_size=0,
+        result_cache_size=0,
+        use_neighbor_table=False,
+    )
+    report_manager: ReportManager = instantiate(
+        config.manager.report,
+        generator=generator,
+    )
+
+    num_queries = config.benchmark.num_queries
+    warmup = config.benchmark.warmup
+    lab_ids = np.random.default_rng(config.seed + 1).choice(
+        list(index.lab_rows),
+        size=warmup + num_queries,
+        replace=warmup + num_queries > len(index.lab_rows),
+    )
+    use_lexical = manager.retrieval.mode != "dense" and index.lexical.is_loaded
+
+    stages: Dict[str, List[float]] = {
+        "search": [],
+        "lexical_search": [],
+        "materialize": [],
+        "rerank": [],
+        "create_html_tables": [],
+        "summarize": [],
+        "prepare_report": [],
+    }
+    for i, lab_id in enumerate(lab_ids.tolist()):
+        row_id = index.get_row_id(lab_id=lab_id)
+        query = index.items.get_value(
+            row_id=row_id,
+            column_name=config.target_column_name,
+        )
+        query_embedding = index.get_vector(row_id=row_id).reshape(1, -1)
+
+        timings = {}
+        start_time = time.perf_counter()
+        distances, indices = index.index.search(
+            query_embedding,
+            k=index.retrieval_top_k,
+        )
+        timings["search"] = time.perf_counter() - start_time
+
+        if use_lexical:
+            start_time = time.perf_counter()
+            index.search_lexical(query=query)
+            timings["lexical_search"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        candidates = index.get_candidates(
+            indices=indices,
+            distances=distances,
+        )[0]
+        timings["materialize"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        reranked_candidates = manager.rerank(
+            query=query,
+            candidates=candidates,
+            category_value=None,
+        )
+        timings["rerank"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        recommendation = manager.create_html_tables(reranked_candidates)
+        timings["create_html_tables"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        summary = manager.summarize(reranked_candidates)
+        timings["summarize"] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        payload, instruction_name = report_manager.prepare(
+            recommendations=summary if summary is not None else recommendation,
+            instruction_name=None,
+        )
+        generator.get_prompt(
+            recommendations=payload,
+            instruction_name=instruction_name,
+        )
+        timings["prepare_report"] = time.perf_counter() - start_time
+
+        if i >= warmup:
+            for stage, elapsed in timings.items():
+                stages[stage].append(elapsed)
+
+    end_to_end = []
+    for i, lab_id in enumerate(lab_ids.tolist()):
+        start_time = time.perf_counter()
+        manager.recommend(
+            input_value=lab_id,
+            input_type=config.input_mode.lab_id,
+            category_value=None,
+        )
+        if i >= warmup:
+            end_to_end.append(time.perf_counter() - start_time)
+
+    result = {
+        "num_items": num_items,
+        "build_seconds": build_timings,
+        "stages": {
+            stage: get_latency_stats(latencies)
+            for stage, latencies in stages.items()
+            if latencies
+        },
+        "end_to_end": get_latency_stats(end_to_end),
+        "peak_rss_mb": get_peak_rss_mb(),
+    }
+    return result
+
+
+@hydra.main(
+    config_path="configs/",
+    config_name="main.yaml",
+)
+def benchmark(
+    config: DictConfig,
+) -> None:
+    results = []
+    for num_items in config.benchmark.sizes:
+        print(f"Benchmarking {num_items} items")
+        if config.benchmark.isolate:
+            with ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=mp.get_context("spawn"),
+            ) as executor:
+                result = executor.submit(
+                    run_size,
+                    config,
+                    num_items,
+                ).result()
+        else:
+            result = run_size(
+                config=config,
+                num_items=num_items,
+            )
+        results.append(result)
+        print(json.dumps(result))
+
+    report = {
+        "settings": {
+            "embedding": config.model.embedding._target_,
+            "reranker": config.model.reranker._target_,
+            "generator": config.model.generator._target_,
+            "index_factory": config.database.index_factory,
+            "dim": config.dim,
+            "retrieval_top_k": config.top_k.retrieval,
+            "rerank_top_k": config.top_k.rerank,
+            "retrieval_mode": config.retrieval.mode,
+            "cascade": config.cascade.enabled,
+            "num_queries": config.benchmark.num_queries,
+            "warmup": config.benchmark.warmup,
+            "isolate": config.benchmark.isolate,
+        },
+        "results": results,
+    }
+    os.makedirs(
+        os.path.dirname(config.benchmark.output_path),
+        exist_ok=True,
+    )
+    with open(config.benchmark.output_path, "w", encoding="utf-8") as f:
+        json.dump(
+            report,
+            f,
+            indent=2,
+        )
+    print(f"Saved benchmark results to {config.benchmark.output_path}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,95 @@
+import dotenv
+
+dotenv.load_dotenv(
+    override=True,
+)
+
+from typing import List
+import time
+
+import hydra
+from omegaconf import DictConfig
+
+from src.databases import FaissIndex
+from src.utils import SetUp
+
+
+def get_lab_ids(
+    config: DictConfig,
+    index: FaissIndex,
+) -> List[str]:
+    if config.report_batch.lab_ids_path:
+        with open(config.report_batch.lab_ids_path, "r", encoding="utf-8") as f:
+            lab_ids = [line.strip() for line in f if line.strip()]
+    else:
+        lab_id_column = index.items.column(config.lab_id_column_name)
+        if config.report_batch.category_value is None:
+            lab_ids = lab_id_column.astype(str).tolist()
+        else:
+            rows = index.category_rows.get(str(config.report_batch.category_value))
+            if rows is None:
+                raise ValueError(
+                    f"Unknown category: {config.report_batch.category_value}"
+                )
+            lab_ids = lab_id_column.iloc[rows].astype(str).tolist()
+
+    if config.report_batch.limit:
+        lab_ids = lab_ids[: config.report_batch.limit]
+    return lab_ids
+
+
+@hydra.main(
+    config_path="configs/",
+    config_name="main.yaml",
+)
+def generate_reports(
+    config: DictConfig,
+) -> None:
+    setup = SetUp(config)
+    recommendation_manager = setup.get_manager(manager_type="recommendation")
+    report_manager = setup.get_manager(manager_type="report")
+
+    lab_ids = get_lab_ids(
+        config=config,
+        index=recommendation_manager.index,
+    )
+    print(f"Generating reports for {len(lab_ids)} labs")
+
+    start = time.perf_counter()
+    results = []
+    batch_size = config.batching.max_batch_size
+    for i in range(0, len(lab_ids), batch_size):
+        results.extend(
+            recommendation_manager.recommend_batch_with_summary(
+                inputs=[
+                    (
+                        lab_id,
+                        config.input_mode.lab_id,
+                        config.report_batch.category_value,
+                    )
+                    for lab_id in lab_ids[i : i + batch_size]
+                ],
+            )
+        )
+    elapsed = time.perf_counter() - start
+    print(
+        f"Recommended {len(lab_ids)} labs in {elapsed:.1f}s ({len(lab_ids) / max(elapsed, 1e-9):.1f} labs/sec)"
+    )
+
+    recommendations_list = [
+        summary if summary is not None else recommendation
+        for recommendation, summary in results
+    ]
+    report_summary = report_manager.generate_many(
+        recommendations_list=recommendations_list,
+        output_path=config.report_batch.output_path,
+        instruction_name=config.report_batch.instruction_name,
+        ids=lab_ids,
+    )
+    print(
+        f"Generated {report_summary['count']} reports in {report_summary['elapsed']:.1f}s ({report_summary['tokens_per_sec']:.1f} tokens/sec) -> {report_summary['output_path']}"
+    )
+
+
+if __name__ == "__main__":
+    generate_reports()
@@ -0,0 +1,9 @@
+#!/bin/bash
+
+sizes="[1000,10000,100000]"
+num_queries=200
+
+HYDRA_FULL_ERROR=1 python benchmark.py \
+    model=stub \
+    benchmark.sizes=$sizes \
+    benchmark.num_queries=$num_queries
\ No newline at end of file
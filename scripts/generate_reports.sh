@@ -0,0 +1,8 @@
+#!/bin/bash
+
+category_value=null
+limit=null
+
+HYDRA_FULL_ERROR=1 python generate_reports.py \
+    report_batch.category_value=$category_value \
+    report_batch.limit=$limit
\ No newline at end of file
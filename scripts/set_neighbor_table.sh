@@ -0,0 +1,13 @@
+#!/bin/bash
+
+# Run after set_vector_store.sh: with neighbor_table.enabled it only stages the
+# new index generation, and this script builds the neighbor table into that
+# staged generation before publishing it, so serving processes reload both at once.
+# Pass neighbor_table.version=<version> to pick a staged generation other than the newest.
+
+indices_name="data_base_only.faiss"
+items_name="data_base_only.csv"
+
+HYDRA_FULL_ERROR=1 python set_neighbor_table.py \
+    indices_name=$indices_name \
+    items_name=$items_name
\ No newline at end of file
@@ -0,0 +1,112 @@
+import dotenv
+
+dotenv.load_dotenv(
+    override=True,
+)
+
+import time
+
+import numpy as np
+
+import hydra
+from hydra.utils import instantiate
+from omegaconf import DictConfig
+
+from src.databases import FaissIndex
+from src.managers import RecommendationManager
+
+
+@hydra.main(
+    config_path="configs/",
+    config_name="main.yaml",
+)
+def set_neighbor_table(
+    config: DictConfig,
+) -> None:
+    index: FaissIndex = instantiate(
+        config.database,
+    )
+    version = config.neighbor_table.version
+    if version is None:
+        staged_versions = index.get_staged_versions()
+        if not staged_versions:
+            raise FileNotFoundError(
+                f"No staged index generation in {index.generations_path}, run set_vector_store.py first"
+            )
+        version = staged_versions[-1]
+    if version in index.read_history():
+        raise ValueError(
+            f"Index version {version} is already published, rebuild it with set_vector_store.py"
+        )
+    index.load(version=version)
+
+    manager: RecommendationManager = instantiate(
+        config.manager.recommendation,
+        index=index,
+        rerank_top_k=config.neighbor_table.top_n,
+        use_neighbor_table=False,
+    )
+
+    if config.neighbor_table.categories is None:
+        categories = list(index.categories)
+    else:
+        categories = [str(category) for category in config.neighbor_table.categories]
+    index.neighbors.create(
+        row_ids=np.fromiter(
+            index.lab_rows.values(),
+            dtype=np.int64,
+        ),
+        category_rows={
+            category: index.category_rows.get(
+                category,
+                np.empty(0, dtype=np.int64),
+            )
+            for category in categories
+        },
+        top_n=config.neighbor_table.top_n,
+    )
+    lab_ids = index.items.column(config.lab_id_column_name).astype(str)
+
+    batch_size = config.batching.max_batch_size
+    for category_value in [None] + categories:
+        row_ids = index.neighbors.get_members(category_value=category_value).tolist()
+        start = time.perf_counter()
+        for i in range(0, len(row_ids), batch_size):
+            batch_row_ids = row_ids[i : i + batch_size]
+            results = manager.retrieve_and_rerank_batch(
+                inputs=[
+                    (
+                        lab_ids.iloc[row_id],
+                        config.input_mode.lab_id,
+                        category_value,
+                    )
+                    for row_id in batch_row_ids
+                ],
+            )
+            for row_id, candidates in zip(batch_row_ids, results):
+                candidates = candidates or []
+                index.neighbors.set(
+                    row_id=row_id,
+                    category_value=category_value,
+                    row_ids=[
+                        candidate[config.row_id_column_name] for candidate in candidates
+                    ],
+                    scores=[
+                        candidate[config.score_column_name] for candidate in candidates
+                    ],
+                )
+        elapsed = time.perf_counter() - start
+        print(
+            f"Category {category_value or 'ALL'}: {len(row_ids)} labs in {elapsed:.1f}s ({len(row_ids) / max(elapsed, 1e-9):.1f} labs/sec)"
+        )
+
+    index.neighbors.commit(
+        version=index.version,
+        reranker_id=manager.reranker.cache_namespace,
+    )
+    index.publish(keep_generations=config.build.keep_generations)
+    print(f"Published index version {index.version} with its neighbor table")
+
+
+if __name__ == "__main__":
+    set_neighbor_table()
@@ -4,14 +4,37 @@ dotenv.load_dotenv(
     override=True,
 )
 
+from typing import Union
+import os
+import time
+
 import numpy as np
 
 import hydra
 from hydra.utils import instantiate
 from omegaconf import DictConfig
 
-from src.databases import FaissIndex
-from src.models import VllmEmbedding
+from transformers import AutoTokenizer
+
+from src.databases import FaissIndex, EmbeddingStore
+from src.models import BaseEmbedding, BaseReranker, EmbeddingPool
+
+
+def get_embedding(
+    config: DictConfig,
+) -> Union[BaseEmbedding, EmbeddingPool]:
+    if config.build.device_ids:
+        embedding = EmbeddingPool(
+            embedding_config=config.model.embedding,
+            device_ids=config.build.device_ids,
+        )
+    else:
+        embedding = instantiate(
+            config.model.embedding,
+            cache_size=0,
+            cache_path=None,
+        )
+    return embedding
 
 
 @hydra.main(
@@ -24,19 +47,117 @@ def set_vector_store(
     index: FaissIndex = instantiate(
         config.database,
     )
-    embedding: VllmEmbedding = instantiate(
-        config.model.embedding,
+    store = EmbeddingStore(
+        store_path=os.path.join(
+            config.data_path,
+            config.embedding_store_name,
+        ),
+        dim=config.dim,
+        model_id=config.model_id.embedding,
+    )
+
+    index.import_items()
+    queries = index.items.column(config.target_column_name).tolist()
+    index.lexical.build(documents=queries)
+    index.lexical.save(version=index.version)
+    canonical_queries = [
+        BaseEmbedding.canonicalize_query(query=query) for query in queries
+    ]
+    keys = [
+        BaseEmbedding.get_key(
+            instruction=config.model.embedding.instruction,
+            query=query,
+        )
+        for query in canonical_queries
+    ]
+
+    missing = {}
+    for key, query in zip(keys, canonical_queries):
+        if key not in store and key not in missing:
+            missing[key] = query
+    missing_keys = list(missing.keys())
+    missing_queries = list(missing.values())
+    num_rows = len(queries)
+    num_missing = len(missing_keys)
+    print(
+        f"{num_missing} of {len(set(keys))} unique rows need embedding ({num_rows} rows total)"
     )
 
-    queries = index.df[config.target_column_name].tolist()
-    embedded = [embedding(query=query) for query in queries]
-    embedded = np.array(
-        embedded,
+    chunk_size = config.build.chunk_size
+    if num_missing:
+        embedding = get_embedding(config)
+        start_time = time.perf_counter()
+        try:
+            for start in range(0, num_missing, chunk_size):
+                end = min(start + chunk_size, num_missing)
+                embedded = embedding.embed_batch(
+                    queries=missing_queries[start:end],
+                    batch_size=config.build.batch_size,
+                )
+                store.put_many(
+                    keys=missing_keys[start:end],
+                    vectors=embedded,
+                )
+
+                elapsed = time.perf_counter() - start_time
+                print(
+                    f"Embedded {end}/{num_missing} rows ({end / max(elapsed, 1e-9):.1f} rows/sec)"
+                )
+        finally:
+            if isinstance(embedding, EmbeddingPool):
+                embedding.shutdown()
+
+    rows = store.get_rows(keys=keys)
+    if not index.is_trained:
+        train_size = min(config.build.train_size, num_rows)
+        train_rows = np.random.default_rng(config.seed).choice(
+            rows,
+            size=train_size,
+            replace=False,
+        )
+        print(f"Training {index.index_factory} index on {train_size} rows")
+        index.train(embedded=store.vectors[np.sort(train_rows)])
+
+    buffer = np.empty(
+        (chunk_size, config.dim),
         dtype=np.float32,
     )
-    index.add(embedded=embedded)
+    for start in range(0, num_rows, chunk_size):
+        end = min(start + chunk_size, num_rows)
+        np.take(
+            store.vectors,
+            rows[start:end],
+            axis=0,
+            out=buffer[: end - start],
+        )
+        index.add(embedded=buffer[: end - start])
     index.save()
 
+    tokenizer = AutoTokenizer.from_pretrained(
+        config.model.reranker.model_id,
+        use_fast=True,
+    )
+    document_tokens = []
+    for start in range(0, num_rows, chunk_size):
+        document_tokens.extend(
+            BaseReranker.tokenize_documents(
+                tokenizer=tokenizer,
+                documents=queries[start : start + chunk_size],
+            )
+        )
+    index.document_tokens.write(
+        token_ids=document_tokens,
+        tokenizer_id=config.model.reranker.model_id,
+        version=index.version,
+    )
+    if config.neighbor_table.enabled:
+        print(
+            f"Staged index version {index.version}, run set_neighbor_table.py to build its neighbor table and publish it"
+        )
+    else:
+        index.publish(keep_generations=config.build.keep_generations)
+        print(f"Published index version {index.version}")
+
 
 if __name__ == "__main__":
     set_vector_store()
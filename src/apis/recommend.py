@@ -6,24 +6,42 @@ dotenv.load_dotenv(
 
 from typing import Dict, Any, Optional
 import os
+import asyncio
 
 import uvicorn
 from fastapi import FastAPI, HTTPException, Header, Depends
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 
 import hydra
 from omegaconf import DictConfig
 
-from src.utils import SetUp
+from src.utils import (
+    SetUp,
+    MicroBatcher,
+    AdmissionController,
+    ServiceOverloaded,
+    render_metrics,
+    render_gauges,
+    render_stats,
+)
 
 
 class RecommendIn(BaseModel):
-    lab_id: str
+    input_value: str
+    input_type: int
     category_value: Optional[str] = None
+    include_summary: bool = False
 
 
 class RecommendOut(BaseModel):
     result: Any
+    summary: Optional[Dict[str, Any]] = None
+    generation: Optional[str] = None
+
+
+class ReloadIn(BaseModel):
+    force: bool = True
 
 
 app = FastAPI(title="Recipe-AI Recommend API")
@@ -39,30 +57,72 @@ def _auth(authorization: str = Header(default="")) -> None:
         )
 
 
-_app_state: Dict[str, Any] = {"manager": None}
+_app_state: Dict[str, Any] = {
+    "manager": None,
+    "batcher": None,
+    "admission": None,
+}
 
 
 @app.get("/healthz")
-def healthz() -> Dict[str, str]:
+async def healthz() -> Dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+)
+async def metrics() -> str:
+    text = ""
+    if _app_state["batcher"] is not None:
+        text += render_metrics(_app_state["batcher"].get_histograms())
+    if _app_state["admission"] is not None:
+        text += render_gauges(
+            prefix="recommend_admission",
+            values=_app_state["admission"].get_stats(),
+        )
+    if _app_state["manager"] is not None:
+        text += render_stats(
+            prefix="recommend",
+            stats=_app_state["manager"].get_stats(),
+        )
+    return text
+
+
 @app.post(
     "/recommend",
     response_model=RecommendOut,
 )
-def recommend_api(body: RecommendIn, _=Depends(_auth)) -> RecommendOut:
-    if _app_state["manager"] is None:
+async def recommend_api(body: RecommendIn, _=Depends(_auth)) -> RecommendOut:
+    if _app_state["batcher"] is None:
         raise HTTPException(
             status_code=500,
             detail="Manager not initialized.",
         )
     try:
-        result = _app_state["manager"].recommend(
-            lab_id=body.lab_id,
-            category_value=body.category_value,
+        async with _app_state["admission"].admit():
+            result, reranked_candidates, generation = await asyncio.wrap_future(
+                _app_state["batcher"].submit(
+                    input_value=body.input_value,
+                    input_type=body.input_type,
+                    category_value=body.category_value,
+                )
+            )
+        summary = None
+        if body.include_summary:
+            summary = _app_state["manager"].summarize(reranked_candidates)
+        return {
+            "result": result,
+            "summary": summary,
+            "generation": generation,
+        }
+    except ServiceOverloaded as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail,
+            headers={"Retry-After": str(int(e.retry_after))},
         )
-        return {"result": result}
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -70,6 +130,34 @@ def recommend_api(body: RecommendIn, _=Depends(_auth)) -> RecommendOut:
         )
 
 
+@app.get("/admin/index")
+async def index_status(_=Depends(_auth)) -> Dict[str, Any]:
+    if _app_state["manager"] is None:
+        raise HTTPException(
+            status_code=500,
+            detail="Manager not initialized.",
+        )
+    return _app_state["manager"].index.get_status()
+
+
+@app.post(
+    "/admin/reload",
+    status_code=202,
+)
+async def reload_index(body: ReloadIn, _=Depends(_auth)) -> Dict[str, Any]:
+    if _app_state["manager"] is None:
+        raise HTTPException(
+            status_code=500,
+            detail="Manager not initialized.",
+        )
+    index = _app_state["manager"].index
+    started = index.reload(force=body.force)
+    return {
+        "started": started,
+        **index.get_status(),
+    }
+
+
 @hydra.main(
     config_path="../configs",
     config_name="main.yaml",
@@ -80,14 +168,30 @@ def main(
     setup = SetUp(config)
     manager = setup.get_manager(manager_type="recommendation")
     _app_state["manager"] = manager
-
-    uvicorn.run(
-        app,
-        host=config.server.host,
-        port=config.server.recommend_port,
-        workers=1,
-        log_level="info",
+    batcher = MicroBatcher(
+        manager=manager,
+        max_batch_size=config.batching.max_batch_size,
+        max_wait_ms=config.batching.max_wait_ms,
+    )
+    _app_state["batcher"] = batcher
+    _app_state["admission"] = AdmissionController(
+        name="recommend",
+        **config.admission.recommend,
     )
+    if config.index_reload.watch:
+        manager.index.watch(interval=config.index_reload.interval)
+
+    try:
+        uvicorn.run(
+            app,
+            host=config.server.host,
+            port=config.server.recommend_port,
+            workers=1,
+            log_level="info",
+        )
+    finally:
+        manager.index.stop_watch()
+        batcher.shutdown()
 
 
 if __name__ == "__main__":
@@ -4,27 +4,67 @@ dotenv.load_dotenv(
     override=True,
 )
 
-from typing import Dict, Any
+from typing import Dict, Any, AsyncIterator, Optional, Union
 import os
+import json
 
 import uvicorn
 from fastapi import FastAPI, HTTPException, Header, Depends
+from fastapi.responses import PlainTextResponse, StreamingResponse, JSONResponse
+from starlette.types import Scope, Receive, Send
 from pydantic import BaseModel
 
 import hydra
 from omegaconf import DictConfig
 
-from src.utils import SetUp
+from src.utils import SetUp, AdmissionController, ServiceOverloaded, render_gauges
 
 
 class ReportIn(BaseModel):
-    recommendations: str
+    recommendations: Optional[str] = None
+    summary: Optional[Dict[str, Any]] = None
 
 
 class ReportOut(BaseModel):
     text: str
 
 
+class AdmittedStreamingResponse(StreamingResponse):
+    def __init__(
+        self,
+        content: AsyncIterator[str],
+        admission: AdmissionController,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(
+            content,
+            **kwargs,
+        )
+        self.admission = admission
+
+    async def __call__(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        try:
+            await self.admission.acquire()
+        except ServiceOverloaded as e:
+            response = JSONResponse(
+                status_code=e.status_code,
+                content={"detail": e.detail},
+                headers={"Retry-After": str(int(e.retry_after))},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.admission.release()
+
+
 app = FastAPI(title="Recipe-AI Report API")
 
 API_KEY = os.getenv("API_KEY", "")
@@ -38,39 +78,124 @@ def _auth(authorization: str = Header(default="")) -> None:
         )
 
 
-_app_state: Dict[str, Any] = {"manager": None}
+_app_state: Dict[str, Any] = {
+    "manager": None,
+    "admission": None,
+}
+
+
+def _get_payload(body: ReportIn) -> Union[str, Dict[str, Any]]:
+    if body.summary is not None:
+        return body.summary
+    if body.recommendations is not None:
+        return body.recommendations
+    raise HTTPException(
+        status_code=422,
+        detail="Either recommendations or summary is required.",
+    )
+
+
+def _generate_report(recommendations: Union[str, Dict[str, Any]]) -> str:
+    if hasattr(_app_state["manager"], "generate"):
+        text = _app_state["manager"].generate(recommendations=recommendations)
+    else:
+        if (
+            not hasattr(_app_state["manager"], "generator")
+            or _app_state["manager"].generator is None
+        ):
+            raise RuntimeError("No report/generator available on manager.")
+        text = _app_state["manager"].generator(recommendations=recommendations)
+    return text
 
 
 @app.get("/healthz")
-def healthz() -> Dict[str, str]:
+async def healthz() -> Dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+)
+async def metrics() -> str:
+    text = ""
+    if _app_state["admission"] is not None:
+        text += render_gauges(
+            prefix="report_admission",
+            values=_app_state["admission"].get_stats(),
+        )
+    if _app_state["manager"] is not None:
+        cache_stats = _app_state["manager"].get_stats()["report_cache"]
+        if cache_stats is not None:
+            text += render_gauges(
+                prefix="report_cache",
+                values=cache_stats,
+            )
+    return text
+
+
 @app.post(
     "/report",
     response_model=ReportOut,
 )
-def report_api(body: ReportIn, _=Depends(_auth)) -> ReportOut:
+async def report_api(body: ReportIn, _=Depends(_auth)) -> ReportOut:
     if _app_state["manager"] is None:
         raise HTTPException(
             status_code=500,
             detail="Manager not initialized.",
         )
+    payload = _get_payload(body)
     try:
-        if hasattr(_app_state["manager"], "report"):
-            text = _app_state["manager"].report(recommendations=body.recommendations)
-        else:
-            if (
-                not hasattr(_app_state["manager"], "generator")
-                or _app_state["manager"].generator is None
-            ):
-                raise RuntimeError("No report/generator available on manager.")
-            text = _app_state["manager"].generator(recommendations=body.recommendations)
+        text = await _app_state["admission"].run(
+            _generate_report,
+            recommendations=payload,
+        )
         return {"text": text}
+    except ServiceOverloaded as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail,
+            headers={"Retry-After": str(int(e.retry_after))},
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/report/stream")
+async def report_stream_api(body: ReportIn, _=Depends(_auth)) -> StreamingResponse:
+    if _app_state["manager"] is None:
+        raise HTTPException(
+            status_code=500,
+            detail="Manager not initialized.",
+        )
+    payload = _get_payload(body)
+    admission = _app_state["admission"]
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            chunks = _app_state["manager"].stream(
+                recommendations=payload,
+            )
+            async for chunk in admission.iterate(chunks):
+                data = json.dumps({"text": chunk}, ensure_ascii=False)
+                yield f"data: {data}\n\n"
+        except Exception as e:
+            data = json.dumps({"detail": str(e)}, ensure_ascii=False)
+            yield f"event: error\ndata: {data}\n\n"
+        else:
+            yield "event: done\ndata: {}\n\n"
+
+    return AdmittedStreamingResponse(
+        events(),
+        admission=admission,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @hydra.main(
     config_path="../configs",
     config_name="main.yaml",
@@ -81,14 +206,22 @@ def main(
     setup = SetUp(config)
     manager = setup.get_manager(manager_type="report")
     _app_state["manager"] = manager
-
-    uvicorn.run(
-        app,
-        host=config.server.host,
-        port=config.server.report_port,
-        workers=1,
-        log_level="info",
+    admission = AdmissionController(
+        name="report",
+        **config.admission.report,
     )
+    _app_state["admission"] = admission
+
+    try:
+        uvicorn.run(
+            app,
+            host=config.server.host,
+            port=config.server.report_port,
+            workers=1,
+            log_level="info",
+        )
+    finally:
+        admission.shutdown()
 
 
 if __name__ == "__main__":
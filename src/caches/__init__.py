@@ -0,0 +1,11 @@
+from .lru_cache import LRUCache
+from .sqlite_cache import SqliteCache
+from .tiered_cache import TieredCache
+from .embedding_cache import EmbeddingCache
+
+__all__ = [
+    "LRUCache",
+    "SqliteCache",
+    "TieredCache",
+    "EmbeddingCache",
+]
@@ -0,0 +1,101 @@
+from typing import Dict, Any, Optional
+import threading
+
+import numpy as np
+
+from .lru_cache import LRUCache
+from ..databases import EmbeddingStore
+
+
+class EmbeddingCache:
+    def __init__(
+        self,
+        max_size: int,
+        ttl: Optional[float],
+        path: Optional[str],
+        max_disk_size: Optional[int],
+        dim: int,
+        model_id: str,
+    ) -> None:
+        self.memory = LRUCache(
+            max_size=max_size,
+            ttl=ttl,
+        )
+        self.ttl = ttl
+        self.max_disk_size = max_disk_size
+
+        self.disk: Optional[EmbeddingStore] = None
+        if path is not None:
+            self.disk = EmbeddingStore(
+                store_path=path,
+                dim=dim,
+                model_id=model_id,
+            )
+            self.disk.compact(
+                max_size=self.max_disk_size,
+                ttl=self.ttl,
+            )
+        self.lock = threading.Lock()
+
+        self.disk_hits = 0
+        self.disk_evictions = 0
+
+    def get(
+        self,
+        key: str,
+    ) -> Optional[np.ndarray]:
+        embedding = self.memory.get(key)
+        if embedding is not None or self.disk is None:
+            return embedding
+
+        with self.lock:
+            if key not in self.disk or self.disk.is_expired(
+                key=key,
+                ttl=self.ttl,
+            ):
+                return None
+            embedding = self.disk.get(key)
+            self.disk_hits += 1
+        self.memory.set(
+            key=key,
+            value=embedding,
+        )
+        return embedding
+
+    def set(
+        self,
+        key: str,
+        embedding: np.ndarray,
+    ) -> None:
+        self.memory.set(
+            key=key,
+            value=embedding,
+        )
+        if self.disk is None:
+            return
+
+        with self.lock:
+            self.disk.put_many(
+                keys=[key],
+                vectors=embedding.reshape(1, -1),
+                sync=False,
+            )
+            if self.max_disk_size is not None and len(self.disk) > int(
+                self.max_disk_size * 1.1
+            ):
+                self.disk_evictions += self.disk.compact(
+                    max_size=self.max_disk_size,
+                    ttl=self.ttl,
+                )
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.memory.get_stats()
+        stats["disk_hits"] = self.disk_hits
+        stats["disk_evictions"] = self.disk_evictions
+        stats["disk_size"] = len(self.disk) if self.disk is not None else 0
+        stats["misses"] -= self.disk_hits
+        requests = stats["hits"] + self.disk_hits + stats["misses"]
+        stats["hit_rate"] = (
+            (stats["hits"] + self.disk_hits) / requests if requests else 0.0
+        )
+        return stats
@@ -0,0 +1,71 @@
+from typing import Dict, Any, Hashable, Optional, Tuple
+from collections import OrderedDict
+import threading
+import time
+
+
+class LRUCache:
+    def __init__(
+        self,
+        max_size: int,
+        ttl: Optional[float],
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(
+        self,
+        key: Hashable,
+    ) -> Optional[Any]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if self.ttl is None or time.monotonic() - created_at <= self.ttl:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return None
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+    ) -> None:
+        if self.max_size <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (value, time.monotonic())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        requests = self.hits + self.misses
+        stats = {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / requests if requests else 0.0,
+        }
+        return stats
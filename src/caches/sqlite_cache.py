@@ -0,0 +1,112 @@
+from typing import Dict, List, Any, Optional
+import os
+import json
+import time
+import sqlite3
+import threading
+
+EVICT_INTERVAL = 10000
+
+
+class SqliteCache:
+    def __init__(
+        self,
+        path: str,
+        max_size: Optional[int],
+        ttl: Optional[float],
+    ) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(
+                directory,
+                exist_ok=True,
+            )
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS cache_created_at ON cache (created_at)"
+        )
+        self.connection.commit()
+
+        self.evictions = 0
+        self.size = 0
+        self.writes = 0
+        self.evict()
+
+    def __len__(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def get_many(
+        self,
+        keys: List[str],
+    ) -> Dict[str, Any]:
+        values = {}
+        now = time.time()
+        with self.lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start : start + 500]
+                rows = self.connection.execute(
+                    f"SELECT key, value, created_at FROM cache WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, value, created_at in rows:
+                    if self.ttl is None or now - created_at <= self.ttl:
+                        values[key] = json.loads(value)
+        return values
+
+    def set_many(
+        self,
+        values: Dict[str, Any],
+    ) -> None:
+        if not values:
+            return
+        now = time.time()
+        with self.lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, created_at) VALUES (?, ?, ?)",
+                [(key, json.dumps(value), now) for key, value in values.items()],
+            )
+            self.connection.commit()
+            self.size += len(values)
+            self.writes += len(values)
+            is_full = self.max_size is not None and self.size > int(self.max_size * 1.1)
+            is_due = self.writes >= EVICT_INTERVAL and (
+                self.max_size is not None or self.ttl is not None
+            )
+        if is_full or is_due:
+            self.evict()
+
+    def evict(self) -> None:
+        with self.lock:
+            self.writes = 0
+            if self.ttl is not None:
+                cursor = self.connection.execute(
+                    "DELETE FROM cache WHERE created_at < ?",
+                    (time.time() - self.ttl,),
+                )
+                self.evictions += cursor.rowcount
+            if self.max_size is not None:
+                size = self.connection.execute("SELECT COUNT(*) FROM cache").fetchone()[
+                    0
+                ]
+                if size > self.max_size:
+                    cursor = self.connection.execute(
+                        "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY created_at LIMIT ?)",
+                        (size - self.max_size,),
+                    )
+                    self.evictions += cursor.rowcount
+                    size = self.max_size
+                self.size = size
+            self.connection.commit()
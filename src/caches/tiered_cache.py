@@ -0,0 +1,87 @@
+from typing import Dict, List, Any, Optional
+
+from .lru_cache import LRUCache
+from .sqlite_cache import SqliteCache
+
+
+class TieredCache:
+    def __init__(
+        self,
+        max_size: int,
+        ttl: Optional[float],
+        path: Optional[str],
+        max_disk_size: Optional[int],
+    ) -> None:
+        self.memory = LRUCache(
+            max_size=max_size,
+            ttl=ttl,
+        )
+        self.disk: Optional[SqliteCache] = None
+        if path is not None:
+            self.disk = SqliteCache(
+                path=path,
+                max_size=max_disk_size,
+                ttl=ttl,
+            )
+        self.disk_hits = 0
+
+    def get(
+        self,
+        key: str,
+    ) -> Optional[Any]:
+        return self.get_many(keys=[key]).get(key)
+
+    def get_many(
+        self,
+        keys: List[str],
+    ) -> Dict[str, Any]:
+        values = {}
+        missing = []
+        for key in keys:
+            value = self.memory.get(key)
+            if value is None:
+                missing.append(key)
+            else:
+                values[key] = value
+
+        if missing and self.disk is not None:
+            disk_values = self.disk.get_many(keys=missing)
+            self.disk_hits += len(disk_values)
+            for key, value in disk_values.items():
+                self.memory.set(
+                    key=key,
+                    value=value,
+                )
+            values.update(disk_values)
+        return values
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+    ) -> None:
+        self.set_many(values={key: value})
+
+    def set_many(
+        self,
+        values: Dict[str, Any],
+    ) -> None:
+        for key, value in values.items():
+            self.memory.set(
+                key=key,
+                value=value,
+            )
+        if self.disk is not None:
+            self.disk.set_many(values=values)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.memory.get_stats()
+        stats["disk_hits"] = self.disk_hits
+        stats["disk_evictions"] = self.disk.evictions if self.disk is not None else 0
+        stats["disk_size"] = len(self.disk) if self.disk is not None else 0
+        stats["misses"] -= self.disk_hits
+        requests = stats["hits"] + self.disk_hits + stats["misses"]
+        stats["hit_rate"] = (
+            (stats["hits"] + self.disk_hits) / requests if requests else 0.0
+        )
+        return stats
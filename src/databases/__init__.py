@@ -1,5 +1,17 @@
 from .vector_store import FaissIndex
+from .item_store import ItemStore
+from .embedding_store import EmbeddingStore
+from .document_tokens import DocumentTokens
+from .lexical_index import LexicalIndex
+from .neighbor_table import NeighborTable
+from .index_generation import IndexGeneration
 
 __all__ = [
     "FaissIndex",
+    "ItemStore",
+    "EmbeddingStore",
+    "DocumentTokens",
+    "LexicalIndex",
+    "NeighborTable",
+    "IndexGeneration",
 ]
@@ -0,0 +1,113 @@
+from typing import List, Optional
+import os
+import json
+
+import numpy as np
+
+
+class DocumentTokens:
+    def __init__(
+        self,
+        tokens_path: str,
+        offsets_path: str,
+        meta_path: str,
+    ) -> None:
+        self.tokens_path = tokens_path
+        self.offsets_path = offsets_path
+        self.meta_path = meta_path
+        self.tokenizer_id: Optional[str] = None
+        self.version: Optional[str] = None
+        self.tokens: Optional[np.ndarray] = None
+        self.offsets: Optional[np.ndarray] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.tokens is not None
+
+    def write(
+        self,
+        token_ids: List[List[int]],
+        tokenizer_id: str,
+        version: str,
+    ) -> None:
+        offsets = np.zeros(
+            len(token_ids) + 1,
+            dtype=np.int64,
+        )
+        np.cumsum(
+            [len(ids) for ids in token_ids],
+            out=offsets[1:],
+        )
+        tokens = np.fromiter(
+            (token for ids in token_ids for token in ids),
+            dtype=np.int32,
+            count=int(offsets[-1]),
+        )
+        for path, array in (
+            (self.tokens_path, tokens),
+            (self.offsets_path, offsets),
+        ):
+            tmp_path = f"{path}.tmp.npy"
+            np.save(tmp_path, array)
+            os.replace(
+                tmp_path,
+                path,
+            )
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "version": version,
+                    "tokenizer_id": tokenizer_id,
+                    "num_rows": len(token_ids),
+                },
+                f,
+            )
+        os.replace(
+            tmp_path,
+            self.meta_path,
+        )
+
+    def load(
+        self,
+        num_rows: int,
+        version: Optional[str],
+    ) -> bool:
+        self.tokens = None
+        self.offsets = None
+        self.tokenizer_id = None
+        self.version = None
+        if not all(
+            os.path.exists(path)
+            for path in (self.tokens_path, self.offsets_path, self.meta_path)
+        ):
+            return False
+
+        with open(self.meta_path, "r") as f:
+            meta = json.load(f)
+        if version is not None and meta.get("version") != version:
+            return False
+        if meta["num_rows"] != num_rows:
+            return False
+        self.tokenizer_id = meta["tokenizer_id"]
+        self.version = version
+
+        self.tokens = np.load(
+            self.tokens_path,
+            mmap_mode="r",
+        )
+        self.offsets = np.load(self.offsets_path)
+        return True
+
+    def get(
+        self,
+        row_ids: List[int],
+        tokenizer_id: str,
+    ) -> Optional[List[List[int]]]:
+        if self.tokens is None or self.tokenizer_id != tokenizer_id:
+            return None
+        token_ids = [
+            self.tokens[self.offsets[row_id] : self.offsets[row_id + 1]].tolist()
+            for row_id in row_ids
+        ]
+        return token_ids
@@ -0,0 +1,325 @@
+from typing import Dict, List, Optional, Iterator
+from contextlib import contextmanager
+import os
+import json
+import time
+import fcntl
+import hashlib
+
+import numpy as np
+
+
+class EmbeddingStore:
+    def __init__(
+        self,
+        store_path: str,
+        dim: int,
+        model_id: str,
+    ) -> None:
+        self.store_path = store_path
+        self.vectors_path = os.path.join(
+            self.store_path,
+            "vectors.f32",
+        )
+        self.keys_path = os.path.join(
+            self.store_path,
+            "keys.tsv",
+        )
+        self.meta_path = os.path.join(
+            self.store_path,
+            "meta.json",
+        )
+        self.lock_path = os.path.join(
+            self.store_path,
+            "store.lock",
+        )
+
+        self.dim = dim
+        self.model_id = model_id
+
+        self.keys: Dict[str, int] = {}
+        self.timestamps: List[float] = []
+        self.vectors: Optional[np.memmap] = None
+        self.keys_inode: Optional[int] = None
+        self.keys_offset = 0
+        self.load()
+
+    @staticmethod
+    def get_key(
+        text: str,
+    ) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(
+        self,
+        key: str,
+    ) -> bool:
+        return key in self.keys
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        with open(self.lock_path, "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def load(self) -> None:
+        os.makedirs(
+            self.store_path,
+            exist_ok=True,
+        )
+
+        meta = {
+            "model_id": self.model_id,
+            "dim": self.dim,
+        }
+        with self.locked():
+            if os.path.exists(self.meta_path):
+                with open(self.meta_path, "r") as f:
+                    stored_meta = json.load(f)
+                if stored_meta != meta:
+                    raise ValueError(
+                        f"Embedding store at {self.store_path} was built with {stored_meta}, expected {meta}."
+                    )
+            else:
+                with open(self.meta_path, "w") as f:
+                    json.dump(meta, f)
+            self._read()
+
+    def refresh(self) -> None:
+        if not os.path.exists(self.keys_path):
+            self._read()
+            return
+        stat = os.stat(self.keys_path)
+        if stat.st_ino != self.keys_inode or stat.st_size < self.keys_offset:
+            self._read()
+            return
+        if stat.st_size > self.keys_offset:
+            with open(self.keys_path, "rb") as f:
+                f.seek(self.keys_offset)
+                tail = f.read()
+            lines = [line.split("\t") for line in tail.decode("utf-8").splitlines()]
+            if not tail.endswith(b"\n") or any(
+                len(line) != 2 or len(line[0]) != 40 for line in lines
+            ):
+                self._read()
+                return
+            for key, timestamp in lines:
+                self.keys[key] = len(self.timestamps)
+                self.timestamps.append(float(timestamp))
+            self.keys_offset += len(tail)
+            self._open_vectors()
+
+        row_size = self.dim * np.dtype(np.float32).itemsize
+        num_vectors = (
+            os.path.getsize(self.vectors_path) // row_size
+            if os.path.exists(self.vectors_path)
+            else 0
+        )
+        if num_vectors != len(self.timestamps):
+            self._read()
+
+    def get_rows(
+        self,
+        keys: List[str],
+    ) -> np.ndarray:
+        rows = np.fromiter(
+            (self.keys.get(key, -1) for key in keys),
+            dtype=np.int64,
+            count=len(keys),
+        )
+        return rows
+
+    def get(
+        self,
+        key: str,
+    ) -> Optional[np.ndarray]:
+        row = self.keys.get(key)
+        if row is None:
+            return None
+        return np.array(
+            self.vectors[row],
+            dtype=np.float32,
+        )
+
+    def is_expired(
+        self,
+        key: str,
+        ttl: Optional[float],
+    ) -> bool:
+        if ttl is None:
+            return False
+        return time.time() - self.timestamps[self.keys[key]] > ttl
+
+    def put_many(
+        self,
+        keys: List[str],
+        vectors: np.ndarray,
+        sync: bool = True,
+    ) -> None:
+        with self.locked():
+            self.refresh()
+            self._append(
+                keys=keys,
+                vectors=vectors,
+                sync=sync,
+            )
+
+    def _append(
+        self,
+        keys: List[str],
+        vectors: np.ndarray,
+        sync: bool,
+    ) -> None:
+        new_keys = []
+        new_rows = []
+        seen = set()
+        for i, key in enumerate(keys):
+            if key in self.keys or key in seen:
+                continue
+            seen.add(key)
+            new_keys.append(key)
+            new_rows.append(i)
+        if not new_keys:
+            return
+
+        new_vectors = np.ascontiguousarray(
+            vectors[new_rows],
+            dtype=np.float32,
+        )
+        with open(self.vectors_path, "ab") as f:
+            f.write(new_vectors.tobytes())
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+
+        timestamp = time.time()
+        with open(self.keys_path, "ab") as f:
+            f.write(
+                "".join(f"{key}\t{timestamp}\n" for key in new_keys).encode("utf-8")
+            )
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+            self.keys_offset = f.tell()
+        self.keys_inode = os.stat(self.keys_path).st_ino
+
+        for key in new_keys:
+            self.keys[key] = len(self.timestamps)
+            self.timestamps.append(timestamp)
+        self._open_vectors()
+
+    def compact(
+        self,
+        max_size: Optional[int],
+        ttl: Optional[float],
+    ) -> int:
+        with self.locked():
+            self.refresh()
+            num_evicted = self._compact(
+                max_size=max_size,
+                ttl=ttl,
+            )
+        return num_evicted
+
+    def _compact(
+        self,
+        max_size: Optional[int],
+        ttl: Optional[float],
+    ) -> int:
+        rows = np.arange(len(self.timestamps))
+        if ttl is not None:
+            timestamps = np.asarray(
+                self.timestamps,
+                dtype=np.float64,
+            )
+            rows = rows[time.time() - timestamps[rows] <= ttl]
+        if max_size is not None and len(rows) > max_size:
+            rows = rows[len(rows) - max_size :]
+        num_evicted = len(self.timestamps) - len(rows)
+        if not num_evicted:
+            return 0
+
+        row_keys = list(self.keys.keys())
+        lines = [[row_keys[row], str(self.timestamps[row])] for row in rows]
+        tmp_path = f"{self.vectors_path}.tmp"
+        if len(rows):
+            np.ascontiguousarray(self.vectors[rows]).tofile(tmp_path)
+        else:
+            open(tmp_path, "wb").close()
+        self.vectors = None
+
+        self._rewrite_keys(lines=[])
+        os.replace(
+            tmp_path,
+            self.vectors_path,
+        )
+        self._rewrite_keys(lines=lines)
+
+        self.keys = {key: row for row, (key, _) in enumerate(lines)}
+        self.timestamps = [float(timestamp) for _, timestamp in lines]
+        self._open_vectors()
+        return num_evicted
+
+    def _read(self) -> None:
+        raw_lines = []
+        if os.path.exists(self.keys_path):
+            with open(self.keys_path, "r") as f:
+                raw_lines = [line.rstrip("\n").split("\t") for line in f]
+        lines = []
+        for line in raw_lines:
+            if len(line) != 2 or len(line[0]) != 40:
+                break
+            lines.append(line)
+        row_size = self.dim * np.dtype(np.float32).itemsize
+        num_vectors = 0
+        if os.path.exists(self.vectors_path):
+            num_vectors = os.path.getsize(self.vectors_path) // row_size
+
+        num_rows = min(len(lines), num_vectors)
+        lines = lines[:num_rows]
+        if num_rows < len(raw_lines) or not os.path.exists(self.keys_path):
+            self._rewrite_keys(lines=lines)
+        if os.path.exists(self.vectors_path) and (
+            os.path.getsize(self.vectors_path) != num_rows * row_size
+        ):
+            with open(self.vectors_path, "r+b") as f:
+                f.truncate(num_rows * row_size)
+
+        self.keys = {key: row for row, (key, _) in enumerate(lines)}
+        self.timestamps = [float(timestamp) for _, timestamp in lines]
+        stat = os.stat(self.keys_path)
+        self.keys_inode = stat.st_ino
+        self.keys_offset = stat.st_size
+        self._open_vectors()
+
+    def _open_vectors(self) -> None:
+        if not self.keys:
+            self.vectors = None
+            return
+        self.vectors = np.memmap(
+            self.vectors_path,
+            dtype=np.float32,
+            mode="r",
+            shape=(len(self.keys), self.dim),
+        )
+
+    def _rewrite_keys(
+        self,
+        lines: List[List[str]],
+    ) -> None:
+        tmp_path = f"{self.keys_path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.writelines(f"{key}\t{timestamp}\n" for key, timestamp in lines)
+        os.replace(
+            tmp_path,
+            self.keys_path,
+        )
+        stat = os.stat(self.keys_path)
+        self.keys_inode = stat.st_ino
+        self.keys_offset = stat.st_size
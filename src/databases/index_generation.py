@@ -0,0 +1,38 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import faiss
+
+from .item_store import ItemStore
+from .document_tokens import DocumentTokens
+from .lexical_index import LexicalIndex
+from .neighbor_table import NeighborTable
+
+
+class IndexGeneration:
+    def __init__(
+        self,
+        index: faiss.Index,
+        items: ItemStore,
+        document_tokens: DocumentTokens,
+        lexical: LexicalIndex,
+        neighbors: NeighborTable,
+        version: str,
+        path: str,
+        indices_path: str,
+    ) -> None:
+        self.index = index
+        self.items = items
+        self.document_tokens = document_tokens
+        self.lexical = lexical
+        self.neighbors = neighbors
+        self.version = version
+        self.path = path
+        self.indices_path = indices_path
+
+        self.lab_rows: Dict[str, int] = {}
+        self.category_rows: Dict[str, np.ndarray] = {}
+        self.category_selectors: Dict[str, faiss.IDSelector] = {}
+        self.categories: List[str] = []
+        self.loaded_at: Optional[float] = None
@@ -0,0 +1,79 @@
+from typing import Dict, List, Any, Optional
+import os
+
+import numpy as np
+import pandas as pd
+
+import pyarrow as pa
+
+
+class ItemStore:
+    def __init__(
+        self,
+        store_path: str,
+        columns: List[str],
+    ) -> None:
+        self.store_path = store_path
+        self.columns = list(columns)
+        self.table: Optional[pa.Table] = None
+
+    def __len__(self) -> int:
+        if self.table is None:
+            return 0
+        return self.table.num_rows
+
+    @staticmethod
+    def write(
+        df: pd.DataFrame,
+        store_path: str,
+    ) -> None:
+        table = pa.Table.from_pandas(
+            df,
+            preserve_index=False,
+        )
+        tmp_path = f"{store_path}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(
+            tmp_path,
+            store_path,
+        )
+
+    def load(self) -> None:
+        if not os.path.exists(self.store_path):
+            raise FileNotFoundError(f"Missing items: {self.store_path}")
+
+        source = pa.memory_map(
+            self.store_path,
+            "r",
+        )
+        table = pa.ipc.open_file(source).read_all()
+        self.table = table.select(self.columns)
+
+    def column(
+        self,
+        column_name: str,
+    ) -> pd.Series:
+        series = self.table.column(column_name).to_pandas()
+        return series
+
+    def get_value(
+        self,
+        row_id: int,
+        column_name: str,
+    ) -> Any:
+        value = self.table.column(column_name)[int(row_id)].as_py()
+        return value
+
+    def take(
+        self,
+        row_ids: np.ndarray,
+    ) -> List[Dict[str, Any]]:
+        rows = self.table.take(
+            pa.array(
+                row_ids,
+                type=pa.int64(),
+            )
+        ).to_pylist()
+        return rows
@@ -0,0 +1,170 @@
+from typing import Dict, List, Any, Optional, Tuple
+from collections import Counter
+import os
+
+import numpy as np
+
+
+class LexicalIndex:
+    def __init__(
+        self,
+        index_path: str,
+        k1: float,
+        b: float,
+    ) -> None:
+        self.index_path = index_path
+        self.k1 = k1
+        self.b = b
+
+        self.term_ids: Dict[str, int] = {}
+        self.offsets: Optional[np.ndarray] = None
+        self.doc_ids: Optional[np.ndarray] = None
+        self.weights: Optional[np.ndarray] = None
+        self.num_docs = 0
+        self.version: Optional[str] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.offsets is not None
+
+    @staticmethod
+    def tokenize(
+        text: Any,
+    ) -> List[str]:
+        if not isinstance(text, str):
+            return []
+        terms = [" ".join(part.split()).lower() for part in text.split("|")]
+        return [term for term in terms if term]
+
+    def build(
+        self,
+        documents: List[str],
+    ) -> None:
+        term_ids: Dict[str, int] = {}
+        posting_terms = []
+        posting_docs = []
+        posting_freqs = []
+        doc_lengths = np.zeros(
+            len(documents),
+            dtype=np.float32,
+        )
+        for doc_id, document in enumerate(documents):
+            counts = Counter(self.tokenize(document))
+            for term, freq in counts.items():
+                posting_terms.append(term_ids.setdefault(term, len(term_ids)))
+                posting_docs.append(doc_id)
+                posting_freqs.append(freq)
+            doc_lengths[doc_id] = sum(counts.values())
+
+        posting_terms = np.asarray(posting_terms, dtype=np.int64)
+        posting_docs = np.asarray(posting_docs, dtype=np.int64)
+        posting_freqs = np.asarray(posting_freqs, dtype=np.float32)
+
+        num_docs = len(documents)
+        doc_freqs = np.bincount(
+            posting_terms,
+            minlength=len(term_ids),
+        )
+        idf = np.log1p((num_docs - doc_freqs + 0.5) / (doc_freqs + 0.5))
+        avg_length = max(float(doc_lengths.mean()) if num_docs else 0.0, 1e-9)
+        norm = self.k1 * (1 - self.b + self.b * doc_lengths[posting_docs] / avg_length)
+        weights = (
+            idf[posting_terms] * posting_freqs * (self.k1 + 1) / (posting_freqs + norm)
+        )
+
+        order = np.lexsort((posting_docs, posting_terms))
+        self.term_ids = term_ids
+        self.offsets = np.zeros(
+            len(term_ids) + 1,
+            dtype=np.int64,
+        )
+        np.cumsum(
+            doc_freqs,
+            out=self.offsets[1:],
+        )
+        self.doc_ids = posting_docs[order].astype(np.int32)
+        self.weights = weights[order].astype(np.float32)
+        self.num_docs = num_docs
+
+    def save(
+        self,
+        version: str,
+    ) -> None:
+        terms = np.array(
+            sorted(self.term_ids, key=self.term_ids.get),
+            dtype=np.str_,
+        )
+        tmp_path = f"{self.index_path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            terms=terms,
+            offsets=self.offsets,
+            doc_ids=self.doc_ids,
+            weights=self.weights,
+            num_docs=np.int64(self.num_docs),
+            version=np.str_(version),
+        )
+        os.replace(
+            tmp_path,
+            self.index_path,
+        )
+        self.version = version
+
+    def load(
+        self,
+        num_rows: int,
+        version: Optional[str],
+    ) -> bool:
+        self.offsets = None
+        self.version = None
+        if not os.path.exists(self.index_path):
+            return False
+
+        with np.load(self.index_path) as data:
+            num_docs = int(data["num_docs"])
+            if version is not None and (
+                "version" not in data or str(data["version"]) != version
+            ):
+                return False
+            if num_docs != num_rows:
+                return False
+            self.term_ids = {term: i for i, term in enumerate(data["terms"].tolist())}
+            self.offsets = data["offsets"]
+            self.doc_ids = data["doc_ids"]
+            self.weights = data["weights"]
+            self.num_docs = num_docs
+        self.version = version
+        return True
+
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        rows: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        scores = np.zeros(
+            self.num_docs,
+            dtype=np.float32,
+        )
+        for term in set(self.tokenize(query)):
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                continue
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            scores[self.doc_ids[start:end]] += self.weights[start:end]
+
+        if rows is None:
+            candidate_rows = np.flatnonzero(scores > 0)
+        else:
+            candidate_rows = rows[scores[rows] > 0]
+        if not len(candidate_rows):
+            return (
+                np.empty(0, dtype=np.int64),
+                np.empty(0, dtype=np.float32),
+            )
+
+        candidate_scores = scores[candidate_rows]
+        k = min(top_k, len(candidate_rows))
+        top = np.argpartition(-candidate_scores, k - 1)[:k]
+        top = top[np.argsort(-candidate_scores[top], kind="stable")]
+        return candidate_rows[top].astype(np.int64), candidate_scores[top]
@@ -0,0 +1,240 @@
+from typing import Dict, List, Optional, Tuple
+import os
+import json
+
+import numpy as np
+
+
+class NeighborTable:
+    def __init__(
+        self,
+        members_path: str,
+        rows_path: str,
+        scores_path: str,
+        counts_path: str,
+        meta_path: str,
+    ) -> None:
+        self.members_path = members_path
+        self.rows_path = rows_path
+        self.scores_path = scores_path
+        self.counts_path = counts_path
+        self.meta_path = meta_path
+
+        self.members: Optional[np.ndarray] = None
+        self.rows: Optional[np.ndarray] = None
+        self.scores: Optional[np.ndarray] = None
+        self.counts: Optional[np.ndarray] = None
+        self.scopes: Dict[str, int] = {}
+        self.scope_offsets: List[int] = [0]
+        self.reranker_id: Optional[str] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.rows is not None
+
+    def create(
+        self,
+        row_ids: np.ndarray,
+        category_rows: Dict[str, np.ndarray],
+        top_n: int,
+    ) -> None:
+        row_ids = np.unique(row_ids)
+        scope_members = [row_ids]
+        self.scopes = {"": 0}
+        for category, rows in category_rows.items():
+            self.scopes[str(category)] = len(self.scopes)
+            scope_members.append(np.intersect1d(rows, row_ids))
+        self.scope_offsets = np.cumsum(
+            [0] + [len(members) for members in scope_members]
+        ).tolist()
+        num_entries = self.scope_offsets[-1]
+
+        self.members = np.lib.format.open_memmap(
+            f"{self.members_path}.tmp.npy",
+            mode="w+",
+            dtype=np.int32,
+            shape=(num_entries,),
+        )
+        self.members[:] = np.concatenate(scope_members)
+        self.rows = np.lib.format.open_memmap(
+            f"{self.rows_path}.tmp.npy",
+            mode="w+",
+            dtype=np.int32,
+            shape=(num_entries, top_n),
+        )
+        self.rows[:] = -1
+        self.scores = np.lib.format.open_memmap(
+            f"{self.scores_path}.tmp.npy",
+            mode="w+",
+            dtype=np.float32,
+            shape=(num_entries, top_n),
+        )
+        self.scores[:] = np.nan
+        self.counts = np.lib.format.open_memmap(
+            f"{self.counts_path}.tmp.npy",
+            mode="w+",
+            dtype=np.int16,
+            shape=(num_entries,),
+        )
+        self.counts[:] = -1
+
+    def get_members(
+        self,
+        category_value: Optional[str],
+    ) -> np.ndarray:
+        scope = self.scopes.get(self.get_scope(category_value))
+        if scope is None:
+            return np.empty(0, dtype=np.int32)
+        return np.asarray(
+            self.members[self.scope_offsets[scope] : self.scope_offsets[scope + 1]]
+        )
+
+    def get_entry(
+        self,
+        row_id: int,
+        category_value: Optional[str],
+    ) -> Optional[int]:
+        scope = self.scopes.get(self.get_scope(category_value))
+        if scope is None:
+            return None
+        start, end = self.scope_offsets[scope], self.scope_offsets[scope + 1]
+        position = start + int(
+            np.searchsorted(
+                self.members[start:end],
+                row_id,
+            )
+        )
+        if position >= end or self.members[position] != row_id:
+            return None
+        return position
+
+    def set(
+        self,
+        row_id: int,
+        category_value: Optional[str],
+        row_ids: List[int],
+        scores: List[float],
+    ) -> None:
+        entry = self.get_entry(
+            row_id=row_id,
+            category_value=category_value,
+        )
+        if entry is None:
+            raise KeyError(f"Row {row_id} is not in scope {category_value!r}.")
+        count = min(len(row_ids), self.rows.shape[1])
+        self.rows[entry, :count] = row_ids[:count]
+        self.scores[entry, :count] = scores[:count]
+        self.counts[entry] = count
+
+    def commit(
+        self,
+        version: str,
+        reranker_id: str,
+    ) -> None:
+        for array, path in (
+            (self.members, self.members_path),
+            (self.rows, self.rows_path),
+            (self.scores, self.scores_path),
+            (self.counts, self.counts_path),
+        ):
+            array.flush()
+            os.replace(
+                f"{path}.tmp.npy",
+                path,
+            )
+        scopes = sorted(self.scopes, key=self.scopes.get)
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "version": version,
+                    "reranker_id": reranker_id,
+                    "scopes": scopes,
+                    "scope_offsets": self.scope_offsets,
+                    "top_n": int(self.rows.shape[1]),
+                },
+                f,
+            )
+        os.replace(
+            tmp_path,
+            self.meta_path,
+        )
+        self.reranker_id = reranker_id
+
+    def load(
+        self,
+        version: str,
+    ) -> bool:
+        self.members = None
+        self.rows = None
+        self.scores = None
+        self.counts = None
+        self.scopes = {}
+        self.scope_offsets = [0]
+        self.reranker_id = None
+        if not all(
+            os.path.exists(path)
+            for path in (
+                self.members_path,
+                self.rows_path,
+                self.scores_path,
+                self.counts_path,
+                self.meta_path,
+            )
+        ):
+            return False
+
+        with open(self.meta_path, "r") as f:
+            meta = json.load(f)
+        if meta["version"] != version:
+            return False
+
+        self.members = np.load(
+            self.members_path,
+            mmap_mode="r",
+        )
+        self.rows = np.load(
+            self.rows_path,
+            mmap_mode="r",
+        )
+        self.scores = np.load(
+            self.scores_path,
+            mmap_mode="r",
+        )
+        self.counts = np.load(
+            self.counts_path,
+            mmap_mode="r",
+        )
+        self.scopes = {scope: i for i, scope in enumerate(meta["scopes"])}
+        self.scope_offsets = meta["scope_offsets"]
+        self.reranker_id = meta["reranker_id"]
+        return True
+
+    def get(
+        self,
+        row_id: int,
+        category_value: Optional[str],
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if self.rows is None:
+            return None
+        entry = self.get_entry(
+            row_id=row_id,
+            category_value=category_value,
+        )
+        if entry is None:
+            return None
+        count = int(self.counts[entry])
+        if count < 0:
+            return None
+        return (
+            np.asarray(self.rows[entry, :count], dtype=np.int64),
+            np.asarray(self.scores[entry, :count]),
+        )
+
+    @staticmethod
+    def get_scope(
+        category_value: Optional[str],
+    ) -> str:
+        if category_value is None:
+            return ""
+        return str(category_value)
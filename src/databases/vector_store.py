@@ -1,11 +1,26 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple, Iterator
+from contextlib import contextmanager
 import os
+import math
+import json
+import shutil
+import threading
+import time
+import uuid
 
 import numpy as np
 import pandas as pd
 
 import faiss
 
+from .item_store import ItemStore
+from .document_tokens import DocumentTokens
+from .lexical_index import LexicalIndex
+from .neighbor_table import NeighborTable
+from .index_generation import IndexGeneration
+
+LEGACY_VERSION = "legacy"
+
 
 class FaissIndex:
     def __init__(
@@ -13,28 +28,232 @@ class FaissIndex:
         data_path: str,
         indices_name: str,
         items_name: str,
+        item_columns: List[str],
         dim: int,
+        index_factory: str,
+        nlist: int,
+        nprobe: int,
+        hnsw_m: int,
+        ef_construction: int,
+        ef_search: int,
+        pq_m: int,
+        exact_search_max_rows: int,
+        bm25_k1: float,
+        bm25_b: float,
         retrieval_top_k: int,
+        lab_id_column_name: str,
+        category_column_name: str,
+        row_id_column_name: str,
         distance_column_name: str,
+        lexical_score_column_name: str,
     ) -> None:
         self.data_path = data_path
         self.indices_name = indices_name
         self.items_name = items_name
-        self.indices_path = os.path.join(
-            self.data_path,
-            self.indices_name,
-        )
         self.items_path = os.path.join(
             self.data_path,
             self.items_name,
         )
+        indices_base_path = os.path.join(
+            self.data_path,
+            os.path.splitext(self.indices_name)[0],
+        )
+        self.generations_path = f"{indices_base_path}.generations"
+        self.manifest_path = f"{indices_base_path}.manifest.json"
+        self.item_columns = list(item_columns)
+        self.bm25_k1 = bm25_k1
+        self.bm25_b = bm25_b
 
         self.dim = dim
-        self.index = faiss.IndexFlatIP(dim)
-        self.df = pd.read_csv(self.items_path)
+        self.index_factory = index_factory.format(
+            nlist=nlist,
+            hnsw_m=hnsw_m,
+            pq_m=pq_m,
+        )
+        self.nprobe = nprobe
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.exact_search_max_rows = exact_search_max_rows
+        index = faiss.index_factory(
+            self.dim,
+            self.index_factory,
+            faiss.METRIC_INNER_PRODUCT,
+        )
+        self.configure(index=index)
+        self.active = self.create_generation(
+            index=index,
+            version=self.get_new_version(),
+        )
+        self.local = threading.local()
 
         self.retrieval_top_k = retrieval_top_k
+        self.lab_id_column_name = lab_id_column_name
+        self.category_column_name = category_column_name
+        self.row_id_column_name = row_id_column_name
         self.distance_column_name = distance_column_name
+        self.lexical_score_column_name = lexical_score_column_name
+
+        self.reload_lock = threading.Lock()
+        self.reload_thread: Optional[threading.Thread] = None
+        self.reload_error: Optional[str] = None
+        self.failed_version: Optional[str] = None
+        self.reloads = 0
+        self.watch_thread: Optional[threading.Thread] = None
+        self.watch_stop = threading.Event()
+
+    @property
+    def generation(self) -> IndexGeneration:
+        generation = getattr(self.local, "generation", None)
+        if generation is None:
+            generation = self.active
+        return generation
+
+    @property
+    def index(self) -> faiss.Index:
+        return self.generation.index
+
+    @property
+    def items(self) -> ItemStore:
+        return self.generation.items
+
+    @property
+    def document_tokens(self) -> DocumentTokens:
+        return self.generation.document_tokens
+
+    @property
+    def lexical(self) -> LexicalIndex:
+        return self.generation.lexical
+
+    @property
+    def neighbors(self) -> NeighborTable:
+        return self.generation.neighbors
+
+    @property
+    def lab_rows(self) -> Dict[str, int]:
+        return self.generation.lab_rows
+
+    @property
+    def category_rows(self) -> Dict[str, np.ndarray]:
+        return self.generation.category_rows
+
+    @property
+    def category_selectors(self) -> Dict[str, faiss.IDSelector]:
+        return self.generation.category_selectors
+
+    @property
+    def categories(self) -> List[str]:
+        return self.generation.categories
+
+    @property
+    def version(self) -> Optional[str]:
+        return self.generation.version
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.active.loaded_at is not None
+
+    @contextmanager
+    def pinned(self) -> Iterator[IndexGeneration]:
+        generation = getattr(self.local, "generation", None)
+        if generation is not None:
+            yield generation
+            return
+
+        generation = self.active
+        self.local.generation = generation
+        try:
+            yield generation
+        finally:
+            self.local.generation = None
+
+    def create_generation(
+        self,
+        index: faiss.Index,
+        version: str,
+    ) -> IndexGeneration:
+        path = os.path.join(
+            self.generations_path,
+            version,
+        )
+        generation = self.get_generation(
+            index=index,
+            version=version,
+            path=path,
+            store_path=os.path.join(
+                path,
+                f"{os.path.splitext(self.items_name)[0]}.arrow",
+            ),
+        )
+        return generation
+
+    def create_legacy_generation(
+        self,
+        index: faiss.Index,
+    ) -> IndexGeneration:
+        generation = self.get_generation(
+            index=index,
+            version=LEGACY_VERSION,
+            path=self.data_path,
+            store_path=f"{os.path.splitext(self.items_path)[0]}.arrow",
+        )
+        return generation
+
+    def get_generation(
+        self,
+        index: faiss.Index,
+        version: str,
+        path: str,
+        store_path: str,
+    ) -> IndexGeneration:
+        base_path = os.path.join(
+            path,
+            os.path.splitext(self.indices_name)[0],
+        )
+        generation = IndexGeneration(
+            index=index,
+            items=ItemStore(
+                store_path=store_path,
+                columns=self.item_columns,
+            ),
+            document_tokens=DocumentTokens(
+                tokens_path=f"{base_path}.doc_tokens.npy",
+                offsets_path=f"{base_path}.doc_offsets.npy",
+                meta_path=f"{base_path}.doc_tokens.json",
+            ),
+            lexical=LexicalIndex(
+                index_path=f"{base_path}.lexical.npz",
+                k1=self.bm25_k1,
+                b=self.bm25_b,
+            ),
+            neighbors=NeighborTable(
+                members_path=f"{base_path}.neighbors.members.npy",
+                rows_path=f"{base_path}.neighbors.rows.npy",
+                scores_path=f"{base_path}.neighbors.scores.npy",
+                counts_path=f"{base_path}.neighbors.counts.npy",
+                meta_path=f"{base_path}.neighbors.json",
+            ),
+            version=version,
+            path=path,
+            indices_path=os.path.join(
+                path,
+                self.indices_name,
+            ),
+        )
+        return generation
+
+    @staticmethod
+    def get_new_version() -> str:
+        return f"{time.strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+    @property
+    def is_trained(self) -> bool:
+        return self.index.is_trained
+
+    def train(
+        self,
+        embedded: np.ndarray,
+    ) -> None:
+        self.index.train(embedded)
 
     def add(
         self,
@@ -42,45 +261,562 @@ class FaissIndex:
     ) -> None:
         self.index.add(embedded)
 
+    def configure(
+        self,
+        index: faiss.Index,
+    ) -> None:
+        ivf = faiss.try_extract_index_ivf(index)
+        if ivf is not None:
+            ivf.nprobe = self.nprobe
+            ivf.make_direct_map()
+
+        hnsw = self.get_hnsw(index=index)
+        if hnsw is not None:
+            hnsw.hnsw.efConstruction = self.ef_construction
+            hnsw.hnsw.efSearch = self.ef_search
+
+    def get_hnsw(
+        self,
+        index: faiss.Index,
+    ) -> Optional[faiss.IndexHNSW]:
+        if isinstance(index, faiss.IndexPreTransform):
+            index = faiss.downcast_index(index.index)
+        if isinstance(index, faiss.IndexHNSW):
+            return index
+        return None
+
+    def get_search_parameters(
+        self,
+        selector: faiss.IDSelector,
+        num_rows: int,
+    ) -> faiss.SearchParameters:
+        selectivity = num_rows / max(self.index.ntotal, 1)
+        ivf = faiss.try_extract_index_ivf(self.index)
+        if ivf is not None:
+            return faiss.SearchParametersIVF(
+                sel=selector,
+                nprobe=min(
+                    ivf.nlist,
+                    math.ceil(self.nprobe / selectivity),
+                ),
+            )
+        if self.get_hnsw(index=self.index) is not None:
+            return faiss.SearchParametersHNSW(
+                sel=selector,
+                efSearch=max(
+                    self.ef_search,
+                    min(
+                        self.index.ntotal,
+                        math.ceil(self.retrieval_top_k / selectivity),
+                    ),
+                ),
+            )
+        return faiss.SearchParameters(sel=selector)
+
     def search(
         self,
         query_embedding: np.ndarray,
+        category_value: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        if query_embedding.ndim == 1:
-            query_embedding = query_embedding.reshape(1, -1).astype(np.float32)
-        elif query_embedding.ndim == 2:
-            query_embedding = query_embedding.astype(np.float32)
+        if query_embedding.ndim > 2 or (
+            query_embedding.ndim == 2 and len(query_embedding) != 1
+        ):
+            raise ValueError(
+                "query_embedding must be a single 1D or 2D row, use search_batch for many queries"
+            )
+
+        candidates = self.search_batch(
+            query_embeddings=query_embedding.reshape(1, -1),
+            category_value=category_value,
+        )[0]
+        return candidates
+
+    def search_batch(
+        self,
+        query_embeddings: np.ndarray,
+        category_value: Optional[str] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        if query_embeddings.ndim != 2:
+            raise ValueError("query_embeddings must be 2D array")
+        query_embeddings = np.ascontiguousarray(
+            query_embeddings,
+            dtype=np.float32,
+        )
+
+        if category_value is None:
+            distances, indices = self.index.search(
+                query_embeddings,
+                k=self.retrieval_top_k,
+            )
         else:
-            raise ValueError("query_embedding must be 1D or 2D array")
+            rows = self.category_rows.get(str(category_value))
+            if rows is None:
+                return [[] for _ in range(len(query_embeddings))]
+            if len(rows) <= self.exact_search_max_rows:
+                distances, indices = self.search_rows(
+                    query_embedding=query_embeddings,
+                    rows=rows,
+                )
+            else:
+                try:
+                    distances, indices = self.index.search(
+                        query_embeddings,
+                        k=self.retrieval_top_k,
+                        params=self.get_search_parameters(
+                            selector=self.category_selectors[str(category_value)],
+                            num_rows=len(rows),
+                        ),
+                    )
+                except RuntimeError:
+                    distances, indices = self.search_rows(
+                        query_embedding=query_embeddings,
+                        rows=rows,
+                    )
+                short = (indices >= 0).sum(axis=1) < min(
+                    self.retrieval_top_k,
+                    len(rows),
+                )
+                if short.any():
+                    (
+                        distances[short],
+                        indices[short],
+                    ) = self.search_rows(
+                        query_embedding=query_embeddings[short],
+                        rows=rows,
+                    )
 
-        distances, indices = self.index.search(
-            query_embedding,
-            k=self.retrieval_top_k,
+        candidates = self.get_candidates(
+            indices=indices,
+            distances=distances,
         )
+        return candidates
+
+    def search_lexical(
+        self,
+        query: str,
+        category_value: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        if not self.lexical.is_loaded:
+            raise RuntimeError(f"Missing lexical index: {self.lexical.index_path}")
+
+        rows = None
+        if category_value is not None:
+            rows = self.category_rows.get(str(category_value))
+            if rows is None:
+                return []
 
-        candidates = []
-        for idx, distance in zip(indices[0], distances[0]):
-            row = self.df.iloc[idx].to_dict()
-            row[self.distance_column_name] = float(distance)
-            candidates.append(row)
+        row_ids, scores = self.lexical.search(
+            query=query,
+            top_k=self.retrieval_top_k,
+            rows=rows,
+        )
+        candidates = self.get_candidates(
+            indices=row_ids.reshape(1, -1),
+            distances=scores.reshape(1, -1),
+            score_column_name=self.lexical_score_column_name,
+        )[0]
+        return candidates
+
+    def get_candidates(
+        self,
+        indices: np.ndarray,
+        distances: np.ndarray,
+        score_column_name: Optional[str] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        if score_column_name is None:
+            score_column_name = self.distance_column_name
+
+        valid = indices >= 0
+        row_ids = indices[valid]
+        rows = self.items.take(row_ids)
+        for row, row_id, distance in zip(
+            rows,
+            row_ids.tolist(),
+            distances[valid].tolist(),
+        ):
+            row[self.row_id_column_name] = row_id
+            row[score_column_name] = distance
+
+        boundaries = np.cumsum(valid.sum(axis=1)).tolist()
+        candidates = [
+            rows[start:end] for start, end in zip([0] + boundaries[:-1], boundaries)
+        ]
         return candidates
 
+    def get_neighbors(
+        self,
+        row_id: int,
+        category_value: Optional[str],
+        score_column_name: str,
+    ) -> Optional[List[Dict[str, Any]]]:
+        neighbors = self.neighbors.get(
+            row_id=row_id,
+            category_value=category_value,
+        )
+        if neighbors is None:
+            return None
+
+        row_ids, scores = neighbors
+        candidates = self.get_candidates(
+            indices=row_ids[None, :],
+            distances=scores[None, :],
+            score_column_name=score_column_name,
+        )[0]
+        return candidates
+
+    def search_rows(
+        self,
+        query_embedding: np.ndarray,
+        rows: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        vectors = self.index.reconstruct_batch(rows)
+        scores = query_embedding @ vectors.T
+        k = min(self.retrieval_top_k, len(rows))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+
+        distances = np.full(
+            (len(query_embedding), self.retrieval_top_k),
+            -np.inf,
+            dtype=np.float32,
+        )
+        indices = np.full(
+            (len(query_embedding), self.retrieval_top_k),
+            -1,
+            dtype=np.int64,
+        )
+        distances[:, :k] = np.take_along_axis(top_scores, order, axis=1)
+        indices[:, :k] = rows[top]
+        return distances, indices
+
     def save(self) -> None:
+        generation = self.generation
         os.makedirs(
-            self.data_path,
+            generation.path,
             exist_ok=True,
         )
 
+        tmp_path = f"{generation.indices_path}.tmp"
         faiss.write_index(
-            self.index,
-            self.indices_path,
+            generation.index,
+            tmp_path,
+        )
+        os.replace(
+            tmp_path,
+            generation.indices_path,
+        )
+
+    def import_items(self) -> None:
+        df = pd.read_csv(
+            self.items_path,
+            usecols=self.item_columns,
+        )
+        os.makedirs(
+            self.generation.path,
+            exist_ok=True,
+        )
+        ItemStore.write(
+            df=df[self.item_columns],
+            store_path=self.items.store_path,
         )
+        self.items.load()
 
-    def load(self) -> None:
-        if not os.path.exists(self.indices_path):
-            raise FileNotFoundError(f"Missing indices: {self.indices_path}")
-        if not os.path.exists(self.items_path):
-            raise FileNotFoundError(f"Missing items: {self.items_path}")
+    def publish(
+        self,
+        keep_generations: int,
+    ) -> None:
+        generation = self.generation
+        if not os.path.exists(generation.indices_path):
+            raise FileNotFoundError(
+                f"Save the index before publishing: {generation.indices_path}"
+            )
+        if generation.index.ntotal != len(generation.items):
+            raise ValueError(
+                f"Index has {generation.index.ntotal} vectors but {len(generation.items)} items."
+            )
+
+        history = [
+            version for version in self.read_history() if version != generation.version
+        ]
+        history.append(generation.version)
+        keep_generations = max(keep_generations, 1)
+
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "version": generation.version,
+                    "num_rows": len(generation.items),
+                    "published_at": time.time(),
+                    "history": history[-keep_generations:],
+                },
+                f,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(
+            tmp_path,
+            self.manifest_path,
+        )
+        self.remove_generations(versions=history[:-keep_generations])
+
+    def remove_generations(
+        self,
+        versions: List[str],
+    ) -> None:
+        for version in versions:
+            shutil.rmtree(
+                os.path.join(
+                    self.generations_path,
+                    version,
+                ),
+                ignore_errors=True,
+            )
+
+    def read_manifest(self) -> Dict[str, Any]:
+        with open(self.manifest_path, "r") as f:
+            manifest = json.load(f)
+        return manifest
 
-        index = faiss.read_index(self.indices_path)
-        self.index = index
+    def read_history(self) -> List[str]:
+        if not os.path.exists(self.manifest_path):
+            return []
+        manifest = self.read_manifest()
+        return manifest.get("history", [manifest["version"]])
+
+    def get_staged_versions(self) -> List[str]:
+        if not os.path.isdir(self.generations_path):
+            return []
+        history = set(self.read_history())
+        versions = sorted(
+            version
+            for version in os.listdir(self.generations_path)
+            if version not in history
+            and os.path.exists(
+                os.path.join(
+                    self.generations_path,
+                    version,
+                    self.indices_name,
+                )
+            )
+        )
+        return versions
+
+    def load(
+        self,
+        version: Optional[str] = None,
+    ) -> None:
+        self.active = self.load_generation(version=version)
+
+    def load_generation(
+        self,
+        version: Optional[str] = None,
+    ) -> IndexGeneration:
+        if version is not None:
+            generation = self.create_generation(
+                index=None,
+                version=version,
+            )
+            if not os.path.exists(generation.indices_path):
+                raise FileNotFoundError(
+                    f"Missing index generation: {generation.indices_path}"
+                )
+            expected_rows = None
+            file_version = version
+        elif os.path.exists(self.manifest_path):
+            manifest = self.read_manifest()
+            generation = self.create_generation(
+                index=None,
+                version=manifest["version"],
+            )
+            expected_rows = manifest["num_rows"]
+            file_version = generation.version
+        else:
+            generation = self.create_legacy_generation(index=None)
+            if not os.path.exists(generation.indices_path):
+                raise FileNotFoundError(
+                    f"Missing index manifest: {self.manifest_path}, run set_vector_store.py"
+                )
+            expected_rows = None
+            file_version = None
+
+        version = generation.version
+        generation.index = faiss.read_index(generation.indices_path)
+        self.configure(index=generation.index)
+        generation.items.load()
+        num_rows = len(generation.items)
+        if generation.index.ntotal != num_rows or expected_rows not in (
+            None,
+            num_rows,
+        ):
+            raise ValueError(
+                f"Generation {version} is inconsistent: {generation.index.ntotal} vectors, {num_rows} items, manifest {expected_rows}."
+            )
+        generation.document_tokens.load(
+            num_rows=num_rows,
+            version=file_version,
+        )
+        generation.lexical.load(
+            num_rows=num_rows,
+            version=file_version,
+        )
+
+        lab_ids = generation.items.column(self.lab_id_column_name).astype(str)
+        rows = np.flatnonzero(~lab_ids.duplicated().to_numpy())
+        generation.lab_rows = dict(
+            zip(
+                lab_ids.iloc[rows].tolist(),
+                rows.tolist(),
+            )
+        )
+
+        categories = generation.items.column(self.category_column_name)
+        generation.categories = sorted(
+            categories.dropna().astype(str).unique().tolist()
+        )
+        is_valid = categories.notna().to_numpy()
+        row_ids = np.flatnonzero(is_valid)
+        categories = categories[is_valid].astype(str).to_numpy()
+        order = np.argsort(
+            categories,
+            kind="stable",
+        )
+        values, starts = np.unique(
+            categories[order],
+            return_index=True,
+        )
+        generation.category_rows = {
+            value: row_ids[rows].astype(np.int64)
+            for value, rows in zip(values.tolist(), np.split(order, starts[1:]))
+        }
+        generation.category_selectors = {
+            value: faiss.IDSelectorBatch(rows)
+            for value, rows in generation.category_rows.items()
+        }
+        generation.neighbors.load(version=version)
+        generation.loaded_at = time.time()
+        return generation
+
+    @property
+    def is_reloading(self) -> bool:
+        return self.reload_thread is not None and self.reload_thread.is_alive()
+
+    def reload(
+        self,
+        force: bool = False,
+        wait: bool = False,
+    ) -> bool:
+        with self.reload_lock:
+            if self.is_reloading:
+                return False
+            if not force:
+                try:
+                    version = self.get_version()
+                except OSError:
+                    return False
+                if version in (self.active.version, self.failed_version):
+                    return False
+
+            self.reload_thread = threading.Thread(
+                target=self.run_reload,
+                name="index-reload",
+                daemon=True,
+            )
+            self.reload_thread.start()
+            reload_thread = self.reload_thread
+
+        if wait:
+            reload_thread.join()
+        return True
+
+    def run_reload(self) -> None:
+        start_time = time.perf_counter()
+        try:
+            generation = self.load_generation()
+        except Exception as e:
+            self.reload_error = f"{type(e).__name__}: {e}"
+            try:
+                self.failed_version = self.get_version()
+            except OSError:
+                self.failed_version = None
+            print(f"Index reload failed, keeping {self.active.version}: {e}")
+            return
+
+        previous_version = self.active.version
+        self.active = generation
+        self.reload_error = None
+        self.failed_version = None
+        self.reloads += 1
+        elapsed = time.perf_counter() - start_time
+        print(
+            f"Swapped index generation {previous_version} -> {generation.version} ({elapsed:.1f}s)"
+        )
+
+    def watch(
+        self,
+        interval: float,
+    ) -> None:
+        if self.watch_thread is not None:
+            return
+
+        def poll() -> None:
+            while not self.watch_stop.wait(interval):
+                self.reload()
+
+        self.watch_stop.clear()
+        self.watch_thread = threading.Thread(
+            target=poll,
+            name="index-watch",
+            daemon=True,
+        )
+        self.watch_thread.start()
+
+    def stop_watch(self) -> None:
+        if self.watch_thread is None:
+            return
+        self.watch_stop.set()
+        self.watch_thread.join()
+        self.watch_thread = None
+
+    def get_status(self) -> Dict[str, Any]:
+        generation = self.active
+        status = {
+            "version": generation.version,
+            "loaded_at": generation.loaded_at,
+            "num_rows": len(generation.items),
+            "neighbor_table": generation.neighbors.is_loaded,
+            "reloading": self.is_reloading,
+            "reloads": self.reloads,
+            "reload_error": self.reload_error,
+            "watching": self.watch_thread is not None,
+        }
+        return status
+
+    def get_version(self) -> str:
+        return self.read_manifest()["version"]
+
+    def get_row_id(
+        self,
+        lab_id: str,
+    ) -> Optional[int]:
+        return self.lab_rows.get(str(lab_id))
+
+    def get_document_tokens(
+        self,
+        row_ids: List[int],
+        tokenizer_id: str,
+    ) -> Optional[List[List[int]]]:
+        document_tokens = self.document_tokens.get(
+            row_ids=row_ids,
+            tokenizer_id=tokenizer_id,
+        )
+        return document_tokens
+
+    def get_vector(
+        self,
+        row_id: int,
+    ) -> np.ndarray:
+        vector = self.index.reconstruct(int(row_id))
+        return vector
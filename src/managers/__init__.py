@@ -1,7 +1,9 @@
 from .recommend_manager import RecommendationManager
 from .report_manager import ReportManager
+from .html_renderer import HtmlTableRenderer
 
 __all__ = [
     "RecommendationManager",
     "ReportManager",
+    "HtmlTableRenderer",
 ]
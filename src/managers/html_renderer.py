@@ -0,0 +1,68 @@
+from typing import Dict, List, Any, Callable, Tuple
+
+from ..caches import LRUCache
+
+
+class HtmlTableRenderer:
+    def __init__(
+        self,
+        cache_size: int,
+    ) -> None:
+        self.fragments = LRUCache(
+            max_size=cache_size,
+            ttl=None,
+        )
+
+    def get_fragment(
+        self,
+        key: Tuple[Any, ...],
+        render: Callable[[], Tuple[bool, str]],
+    ) -> Tuple[bool, str]:
+        fragment = self.fragments.get(key)
+        if fragment is None:
+            fragment = render()
+            self.fragments.set(
+                key=key,
+                value=fragment,
+            )
+        return fragment
+
+    @staticmethod
+    def render_table(
+        columns: List[str],
+        rows: List[List[str]],
+        table_id: str,
+    ) -> str:
+        cell_ids = ", ".join(
+            f"#{table_id}_row{i}_col{j}"
+            for i in range(len(rows))
+            for j in range(len(columns))
+        )
+        parts = [
+            '<style type="text/css">\n',
+            f"#{table_id} th {{\n  text-align: left;\n}}\n",
+            f"#{table_id} td {{\n  text-align: left;\n}}\n",
+        ]
+        if cell_ids:
+            parts.append(f"{cell_ids} {{\n  text-align: left;\n}}\n")
+        parts.append("</style>\n")
+        parts.append(f'<table id="{table_id}">\n')
+        parts.append("  <thead>\n    <tr>\n")
+        for j, column in enumerate(columns):
+            parts.append(
+                f'      <th id="{table_id}_level0_col{j}" class="col_heading level0 col{j}" >{column}</th>\n'
+            )
+        parts.append("    </tr>\n  </thead>\n  <tbody>\n")
+        for i, row in enumerate(rows):
+            parts.append("    <tr>\n")
+            for j, value in enumerate(row):
+                parts.append(
+                    f'      <td id="{table_id}_row{i}_col{j}" class="data row{i} col{j}" >{value}</td>\n'
+                )
+            parts.append("    </tr>\n")
+        parts.append("  </tbody>\n</table>\n")
+        table = "".join(parts)
+        return table
+
+    def get_stats(self) -> Dict[str, Any]:
+        return self.fragments.get_stats()
@@ -1,50 +1,206 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from collections import Counter
 
+import numpy as np
 import pandas as pd
 
-from ..models import VllmEmbedding, VllmReranker
-from ..databases import FaissIndex
+from ..models import BaseEmbedding, BaseReranker
+from ..databases import FaissIndex, LexicalIndex
+from ..caches import LRUCache
+from .html_renderer import HtmlTableRenderer
 
 
 class RecommendationManager:
     def __init__(
         self,
-        embedding: VllmEmbedding,
-        reranker: VllmReranker,
+        embedding: BaseEmbedding,
+        reranker: BaseReranker,
         index: FaissIndex,
         lab_id_column_name: str,
         category_column_name: str,
         category_name_column_name: str,
         target_column_name: str,
         amount_column_name: str,
+        row_id_column_name: str,
         score_column_name: str,
         rerank_top_k: int,
         input_mode: Dict[str, int],
         is_table: bool,
+        retrieval: Dict[str, Any],
+        cascade: Dict[str, Any],
+        summary: Dict[str, Any],
+        render_cache_size: int,
+        use_neighbor_table: bool,
+        result_cache_size: int,
+        result_cache_ttl: Optional[float],
     ) -> None:
         self.embedding = embedding
         self.reranker = reranker
 
         self.index = index
-        self.index.load()
+        if not self.index.is_loaded:
+            self.index.load()
 
         self.lab_id_column_name = lab_id_column_name
         self.category_column_name = category_column_name
         self.category_name_column_name = category_name_column_name
         self.target_column_name = target_column_name
         self.amount_column_name = amount_column_name
+        self.row_id_column_name = row_id_column_name
         self.score_column_name = score_column_name
 
         self.rerank_top_k = rerank_top_k
         self.input_mode = input_mode
         self.is_table = is_table
+        self.retrieval = retrieval
+        self.cascade = cascade
+        self.summary = summary
+        self.renderer = HtmlTableRenderer(cache_size=render_cache_size)
+        self.use_neighbor_table = use_neighbor_table
+        self.results = LRUCache(
+            max_size=result_cache_size,
+            ttl=result_cache_ttl,
+        )
+
+        self.cascade_stats = {
+            "requests": 0,
+            "retrieved": 0,
+            "pruned_by_prefilter": 0,
+            "pruned_by_early_stop": 0,
+            "reranked": 0,
+        }
+        self.last_cascade_stats: Optional[Dict[str, int]] = None
+        self.neighbor_stats = {
+            "hits": 0,
+            "misses": 0,
+        }
 
     def retrieve(
         self,
         query: str,
+        query_embedding: Optional[np.ndarray] = None,
+        category_value: Optional[str] = None,
+        mode: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
-        query_embedding = self.embedding(query=query)
-        candidates = self.index.search(query_embedding=query_embedding)
+        candidates = self.retrieve_batch(
+            queries=[query],
+            query_embeddings=[query_embedding],
+            category_values=[category_value],
+            mode=mode,
+        )[0]
+        return candidates
+
+    def retrieve_batch(
+        self,
+        queries: List[str],
+        query_embeddings: List[Optional[np.ndarray]],
+        category_values: List[Optional[str]],
+        mode: Optional[str] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        if mode is None:
+            mode = self.retrieval.mode
+        if mode not in {"dense", "hybrid", "lexical"}:
+            raise ValueError(
+                f"Invalid retrieval mode: {mode}. Use dense, hybrid or lexical."
+            )
+
+        if mode == "lexical":
+            return self.search_lexical_batch(
+                queries=queries,
+                category_values=category_values,
+            )
+
+        query_embeddings = list(query_embeddings)
+        missing = [
+            i for i, embedding in enumerate(query_embeddings) if embedding is None
+        ]
+        if missing:
+            try:
+                embeddings = self.embedding.embed_many(
+                    queries=[queries[i] for i in missing],
+                )
+            except Exception:
+                if mode != "hybrid":
+                    raise
+                return self.search_lexical_batch(
+                    queries=queries,
+                    category_values=category_values,
+                )
+            for i, embedding in zip(missing, embeddings):
+                query_embeddings[i] = embedding
+
+        groups: Dict[Optional[str], List[int]] = {}
+        for i, category_value in enumerate(category_values):
+            groups.setdefault(category_value, []).append(i)
+        dense_candidates: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        for category_value, positions in groups.items():
+            batch_candidates = self.index.search_batch(
+                query_embeddings=np.stack([query_embeddings[i] for i in positions]),
+                category_value=category_value,
+            )
+            for i, candidates in zip(positions, batch_candidates):
+                dense_candidates[i] = candidates
+        if mode == "dense" or not self.index.lexical.is_loaded:
+            return dense_candidates
+
+        lexical_candidates = self.search_lexical_batch(
+            queries=queries,
+            category_values=category_values,
+        )
+        fused_candidates = [
+            self.fuse(
+                ranked_lists=[
+                    candidates,
+                    lexical,
+                ],
+            )
+            for candidates, lexical in zip(dense_candidates, lexical_candidates)
+        ]
+        return fused_candidates
+
+    def search_lexical_batch(
+        self,
+        queries: List[str],
+        category_values: List[Optional[str]],
+    ) -> List[List[Dict[str, Any]]]:
+        lexical_candidates = [
+            self.index.search_lexical(
+                query=query,
+                category_value=category_value,
+            )
+            for query, category_value in zip(queries, category_values)
+        ]
+        return lexical_candidates
+
+    def fuse(
+        self,
+        ranked_lists: List[List[Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        fused: Dict[int, Dict[str, Any]] = {}
+        fused_scores: Dict[int, float] = {}
+        for ranked_list in ranked_lists:
+            for rank, candidate in enumerate(ranked_list):
+                row_id = candidate[self.row_id_column_name]
+                fused_scores[row_id] = fused_scores.get(row_id, 0.0) + 1.0 / (
+                    self.retrieval.rrf_k + rank + 1
+                )
+                if row_id in fused:
+                    fused[row_id].update(
+                        {
+                            key: value
+                            for key, value in candidate.items()
+                            if key not in fused[row_id]
+                        }
+                    )
+                else:
+                    fused[row_id] = candidate
+
+        row_ids = sorted(
+            fused_scores,
+            key=fused_scores.get,
+            reverse=True,
+        )[: self.index.retrieval_top_k]
+        candidates = [fused[row_id] for row_id in row_ids]
         return candidates
 
     def rerank(
@@ -53,27 +209,90 @@ class RecommendationManager:
         candidates: List[Dict[str, Any]],
         category_value: Optional[str],
     ) -> Optional[List[Dict[str, Any]]]:
-        if category_value is not None:
-            candidates = [
-                candidate
-                for candidate in candidates
-                if candidate.get(self.category_column_name) == category_value
-            ]
-
+        candidates = self.filter_category(
+            candidates=candidates,
+            category_value=category_value,
+        )
         if not candidates:
             return None
 
-        target_candidates = [
-            candidate[self.target_column_name] for candidate in candidates
+        if self.cascade.enabled:
+            candidates = self.cascade_rerank(
+                query=query,
+                candidates=candidates,
+            )
+        else:
+            self.score_candidates(
+                query=query,
+                candidates=candidates,
+            )
+
+        reranked_candidates = self.select_top_k(candidates=candidates)
+        return reranked_candidates
+
+    def rerank_batch(
+        self,
+        queries: List[str],
+        candidates_list: List[List[Dict[str, Any]]],
+        category_values: List[Optional[str]],
+    ) -> List[Optional[List[Dict[str, Any]]]]:
+        candidates_list = [
+            self.filter_category(
+                candidates=candidates,
+                category_value=category_value,
+            )
+            for candidates, category_value in zip(candidates_list, category_values)
         ]
-        scores = self.reranker(
-            query=query,
-            candidates=target_candidates,
+        if self.cascade.enabled:
+            pruned_list = []
+            for query, candidates in zip(queries, candidates_list):
+                pruned = (
+                    self.prefilter(
+                        query=query,
+                        candidates=candidates,
+                    )
+                    if candidates
+                    else []
+                )
+                self.record_cascade_stats(
+                    stats={
+                        "retrieved": len(candidates),
+                        "pruned_by_prefilter": len(candidates) - len(pruned),
+                        "pruned_by_early_stop": 0,
+                        "reranked": len(pruned),
+                    },
+                )
+                pruned_list.append(pruned)
+            candidates_list = pruned_list
+
+        self.score_candidates_batch(
+            queries=queries,
+            candidates_list=candidates_list,
         )
+        reranked_candidates_list = [
+            self.select_top_k(candidates=candidates) if candidates else None
+            for candidates in candidates_list
+        ]
+        return reranked_candidates_list
 
-        for candidate, score in zip(candidates, scores):
-            candidate[self.score_column_name] = float(score)
+    def filter_category(
+        self,
+        candidates: List[Dict[str, Any]],
+        category_value: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        if category_value is None:
+            return candidates
+        candidates = [
+            candidate
+            for candidate in candidates
+            if str(candidate.get(self.category_column_name)) == str(category_value)
+        ]
+        return candidates
 
+    def select_top_k(
+        self,
+        candidates: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
         candidates.sort(
             key=lambda x: x[self.score_column_name],
             reverse=True,
@@ -81,27 +300,230 @@ class RecommendationManager:
         reranked_candidates = candidates[: self.rerank_top_k]
         return reranked_candidates
 
-    def retrieve_and_rerank(
+    def score_candidates(
+        self,
+        query: str,
+        candidates: List[Dict[str, Any]],
+    ) -> None:
+        self.score_candidates_batch(
+            queries=[query],
+            candidates_list=[candidates],
+        )
+
+    def score_candidates_batch(
+        self,
+        queries: List[str],
+        candidates_list: List[List[Dict[str, Any]]],
+    ) -> None:
+        pairs = [
+            (query, candidate[self.target_column_name])
+            for query, candidates in zip(queries, candidates_list)
+            for candidate in candidates
+        ]
+        if not pairs:
+            return
+
+        doc_tokens = self.index.get_document_tokens(
+            row_ids=[
+                candidate[self.row_id_column_name]
+                for candidates in candidates_list
+                for candidate in candidates
+            ],
+            tokenizer_id=self.reranker.model_id,
+        )
+        scores = self.reranker.get_pair_scores(
+            pairs=pairs,
+            doc_tokens=doc_tokens,
+        )
+
+        scores = iter(scores)
+        for candidates in candidates_list:
+            for candidate in candidates:
+                candidate[self.score_column_name] = float(next(scores))
+
+    def prefilter(
+        self,
+        query: str,
+        candidates: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        distances = np.array(
+            [
+                candidate.get(self.index.distance_column_name)
+                for candidate in candidates
+            ],
+            dtype=np.float32,
+        )
+        has_distances = not np.all(np.isnan(distances))
+        query_ingredients = set(LexicalIndex.tokenize(query))
+        overlaps = np.array(
+            [
+                len(
+                    query_ingredients.intersection(
+                        LexicalIndex.tokenize(candidate[self.target_column_name])
+                    )
+                )
+                / max(len(query_ingredients), 1)
+                for candidate in candidates
+            ],
+            dtype=np.float32,
+        )
+        cheap_scores = self.cascade.overlap_weight * overlaps
+        if has_distances:
+            cheap_scores += np.nan_to_num(
+                distances,
+                nan=np.nanmin(distances),
+            )
+
+        order = np.argsort(-cheap_scores, kind="stable")
+        keep = np.ones(len(candidates), dtype=bool)
+        if has_distances:
+            keep = ~(distances < np.nanmax(distances) - self.cascade.max_distance_gap)
+        keep[order[: self.rerank_top_k]] = True
+        order = order[keep[order]][: max(self.cascade.pool_size, self.rerank_top_k)]
+        survivors = [candidates[i] for i in order]
+        return survivors
+
+    def cascade_rerank(
+        self,
+        query: str,
+        candidates: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        num_retrieved = len(candidates)
+        candidates = self.prefilter(
+            query=query,
+            candidates=candidates,
+        )
+        num_prefiltered = len(candidates)
+
+        batch_size = max(self.cascade.batch_size, self.rerank_top_k)
+        scores: List[float] = []
+        num_scored = 0
+        while num_scored < num_prefiltered:
+            batch = candidates[num_scored : num_scored + batch_size]
+            self.score_candidates(
+                query=query,
+                candidates=batch,
+            )
+            scores.extend(candidate[self.score_column_name] for candidate in batch)
+            num_scored += len(batch)
+            batch_size = self.cascade.batch_size
+
+            if self.cascade.stop_score is not None and len(scores) >= self.rerank_top_k:
+                kth_score = sorted(scores, reverse=True)[self.rerank_top_k - 1]
+                if kth_score >= self.cascade.stop_score:
+                    break
+
+        stats = {
+            "retrieved": num_retrieved,
+            "pruned_by_prefilter": num_retrieved - num_prefiltered,
+            "pruned_by_early_stop": num_prefiltered - num_scored,
+            "reranked": num_scored,
+        }
+        self.record_cascade_stats(stats=stats)
+        return candidates[:num_scored]
+
+    def record_cascade_stats(
+        self,
+        stats: Dict[str, int],
+    ) -> None:
+        self.last_cascade_stats = stats
+        self.cascade_stats["requests"] += 1
+        for key, value in stats.items():
+            self.cascade_stats[key] += value
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {
+            "index": self.index.get_status(),
+            "cascade": dict(self.cascade_stats),
+            "last_cascade": self.last_cascade_stats,
+            "embedding_cache": self.embedding.get_cache_stats(),
+            "reranker_cache": self.reranker.get_cache_stats(),
+            "render_cache": self.renderer.get_stats(),
+            "result_cache": self.results.get_stats(),
+            "neighbor_table": {
+                "loaded": self.index.neighbors.is_loaded,
+                **self.neighbor_stats,
+            },
+        }
+        return stats
+
+    def resolve_query(
         self,
         input_value: str,
         input_type: str,
-        category_value: Optional[str],
-    ) -> Optional[List[Dict[str, Any]]]:
+    ) -> Optional[Tuple[str, Optional[np.ndarray]]]:
         if input_type == self.input_mode.lab_id:
-            series = self.index.df[
-                self.index.df[self.lab_id_column_name] == input_value
-            ][self.target_column_name]
-            if series.empty:
+            row_id = self.index.get_row_id(lab_id=input_value)
+            if row_id is None:
                 return None
-            query = series.iloc[0]
+            query = self.index.items.get_value(
+                row_id=row_id,
+                column_name=self.target_column_name,
+            )
+            query_embedding = self.index.get_vector(row_id=row_id)
         elif input_type == self.input_mode.ingredients:
             query = input_value
+            query_embedding = None
         else:
             raise ValueError(
                 f"Invalid input_type. Use {self.input_mode.lab_id} or {self.input_mode.ingredients}."
             )
+        return query, query_embedding
+
+    def get_precomputed(
+        self,
+        input_value: str,
+        category_value: Optional[str],
+    ) -> Optional[List[Dict[str, Any]]]:
+        if (
+            not self.use_neighbor_table
+            or not self.index.neighbors.is_loaded
+            or self.index.neighbors.reranker_id != self.reranker.cache_namespace
+        ):
+            return None
+
+        row_id = self.index.get_row_id(lab_id=input_value)
+        candidates = None
+        if row_id is not None:
+            candidates = self.index.get_neighbors(
+                row_id=row_id,
+                category_value=category_value,
+                score_column_name=self.score_column_name,
+            )
+        if candidates is None:
+            self.neighbor_stats["misses"] += 1
+            return None
+
+        self.neighbor_stats["hits"] += 1
+        return candidates[: self.rerank_top_k]
+
+    def retrieve_and_rerank(
+        self,
+        input_value: str,
+        input_type: str,
+        category_value: Optional[str],
+    ) -> Optional[List[Dict[str, Any]]]:
+        if input_type == self.input_mode.lab_id:
+            precomputed = self.get_precomputed(
+                input_value=input_value,
+                category_value=category_value,
+            )
+            if precomputed is not None:
+                return precomputed or None
+
+        resolved = self.resolve_query(
+            input_value=input_value,
+            input_type=input_type,
+        )
+        if resolved is None:
+            return None
+        query, query_embedding = resolved
 
-        candidates = self.retrieve(query=query)
+        candidates = self.retrieve(
+            query=query,
+            query_embedding=query_embedding,
+            category_value=category_value,
+        )
         if candidates is None:
             return None
 
@@ -115,6 +537,53 @@ class RecommendationManager:
 
         return reranked_candidates
 
+    def retrieve_and_rerank_batch(
+        self,
+        inputs: List[Tuple[str, str, Optional[str]]],
+    ) -> List[Optional[List[Dict[str, Any]]]]:
+        results: List[Optional[List[Dict[str, Any]]]] = [None] * len(inputs)
+        positions = []
+        queries = []
+        query_embeddings = []
+        category_values = []
+        for i, (input_value, input_type, category_value) in enumerate(inputs):
+            if input_type == self.input_mode.lab_id:
+                precomputed = self.get_precomputed(
+                    input_value=input_value,
+                    category_value=category_value,
+                )
+                if precomputed is not None:
+                    results[i] = precomputed or None
+                    continue
+
+            resolved = self.resolve_query(
+                input_value=input_value,
+                input_type=input_type,
+            )
+            if resolved is None:
+                continue
+            positions.append(i)
+            queries.append(resolved[0])
+            query_embeddings.append(resolved[1])
+            category_values.append(category_value)
+
+        if not positions:
+            return results
+
+        candidates_list = self.retrieve_batch(
+            queries=queries,
+            query_embeddings=query_embeddings,
+            category_values=category_values,
+        )
+        reranked_candidates_list = self.rerank_batch(
+            queries=queries,
+            candidates_list=candidates_list,
+            category_values=category_values,
+        )
+        for i, reranked_candidates in zip(positions, reranked_candidates_list):
+            results[i] = reranked_candidates
+        return results
+
     def create_html_tables(
         self,
         reranked_candidates: List[Dict[str, Any]],
@@ -125,51 +594,19 @@ class RecommendationManager:
         html_blocks = []
         for candidate in reranked_candidates:
             lab_id = str(candidate.get(self.lab_id_column_name))
-            ingredients_str = str(candidate.get(self.target_column_name))
-            amounts_str = str(candidate.get(self.amount_column_name))
             score_value = candidate.get(self.score_column_name)
             category_name_str = str(candidate.get(self.category_name_column_name))
 
-            if pd.isna(ingredients_str) or pd.isna(amounts_str):
-                html_blocks.append(
-                    f"<strong>{lab_id}</strong><br/><p>No data available.</p>"
-                )
-                continue
-
-            ingredients = str(ingredients_str).split("|")
-            amounts = str(amounts_str).split("|")
-
-            if len(ingredients) != len(amounts):
-                html_blocks.append(
-                    f"<strong>{lab_id}</strong><br/><p>Error: Mismatch between ingredient and amount counts.</p>"
-                )
-                continue
-
-            table_data: List[Dict[str, Any]] = []
-            for ingredient, amount in zip(ingredients, amounts):
-                try:
-                    amount_str = f"{float(amount):.4f}"
-                except (ValueError, TypeError):
-                    amount_str = str(amount)
-                table_data.append(
-                    {
-                        "성분 명칭": ingredient,
-                        "함량(%)": amount_str,
-                    }
-                )
-
-            table_df = pd.DataFrame(table_data)
-            html_table = (
-                table_df.style.set_properties(**{"text-align": "left"})
-                .set_table_styles(
-                    [
-                        {"selector": "th", "props": [("text-align", "left")]},
-                        {"selector": "td", "props": [("text-align", "left")]},
-                    ]
-                )
-                .hide(axis="index")
-                .to_html()
+            is_table, fragment = self.renderer.get_fragment(
+                key=(
+                    self.index.version,
+                    candidate.get(self.row_id_column_name, lab_id),
+                ),
+                render=lambda: self.render_lab_fragment(candidate),
             )
+            if not is_table:
+                html_blocks.append(fragment)
+                continue
 
             if score_value is None or pd.isna(score_value):
                 score_text = ""
@@ -188,7 +625,7 @@ class RecommendationManager:
             html_block = (
                 f"<strong>{lab_id}{score_text}</strong><br/>"
                 f"<strong>{category_text}</strong><br/>"
-                f"<details><summary>성분표 보기</summary>{html_table}</details>"
+                f"{fragment}"
             )
 
             html_blocks.append(html_block)
@@ -196,17 +633,153 @@ class RecommendationManager:
         html_tables = "\n<br/><br/>\n".join(html_blocks)
         return html_tables
 
-    def recommend(
+    def render_lab_fragment(
         self,
-        input_value: str,
-        input_type: str,
-        category_value: Optional[str],
-    ) -> str:
-        reranked_candidates = self.retrieve_and_rerank(
-            input_value=input_value,
-            input_type=input_type,
-            category_value=category_value,
+        candidate: Dict[str, Any],
+    ) -> Tuple[bool, str]:
+        lab_id = str(candidate.get(self.lab_id_column_name))
+        ingredients_str = str(candidate.get(self.target_column_name))
+        amounts_str = str(candidate.get(self.amount_column_name))
+
+        if pd.isna(ingredients_str) or pd.isna(amounts_str):
+            return False, f"<strong>{lab_id}</strong><br/><p>No data available.</p>"
+
+        ingredients = str(ingredients_str).split("|")
+        amounts = str(amounts_str).split("|")
+
+        if len(ingredients) != len(amounts):
+            return (
+                False,
+                f"<strong>{lab_id}</strong><br/><p>Error: Mismatch between ingredient and amount counts.</p>",
+            )
+
+        rows = []
+        for ingredient, amount in zip(ingredients, amounts):
+            try:
+                amount_str = f"{float(amount):.4f}"
+            except (ValueError, TypeError):
+                amount_str = str(amount)
+            rows.append([ingredient, amount_str])
+
+        html_table = self.renderer.render_table(
+            columns=[
+                "성분 명칭",
+                "함량(%)",
+            ],
+            rows=rows,
+            table_id=f"T_{candidate.get(self.row_id_column_name, lab_id)}",
         )
+        fragment = f"<details><summary>성분표 보기</summary>{html_table}</details>"
+        return True, fragment
+
+    def summarize(
+        self,
+        reranked_candidates: Optional[List[Dict[str, Any]]],
+    ) -> Optional[Dict[str, Any]]:
+        if not reranked_candidates:
+            return None
+
+        labs = []
+        category_counts: Counter = Counter()
+        ingredient_labs: Dict[str, set] = {}
+        ingredient_amounts: Dict[str, List[float]] = {}
+        for candidate in reranked_candidates:
+            lab_id = str(candidate.get(self.lab_id_column_name))
+            category_name = candidate.get(self.category_name_column_name)
+            score = candidate.get(self.score_column_name)
+            labs.append(
+                {
+                    "lab_id": lab_id,
+                    "category": (
+                        None
+                        if pd.isna(category_name)
+                        else str(category_name).replace("|", ", ")
+                    ),
+                    "score": (None if pd.isna(score) else round(float(score), 3)),
+                }
+            )
+            if not pd.isna(category_name):
+                category_counts.update(
+                    name
+                    for name in (part.strip() for part in str(category_name).split("|"))
+                    if name
+                )
+
+            ingredients = self.split_values(candidate.get(self.target_column_name))
+            amounts = self.split_values(candidate.get(self.amount_column_name))
+            if len(amounts) != len(ingredients):
+                amounts = [None] * len(ingredients)
+            for ingredient, amount in zip(ingredients, amounts):
+                ingredient = ingredient.strip()
+                if not ingredient:
+                    continue
+                ingredient_labs.setdefault(ingredient, set()).add(lab_id)
+                amount = self.parse_amount(amount)
+                if amount is not None:
+                    ingredient_amounts.setdefault(ingredient, []).append(amount)
+
+        ingredient_stats = []
+        for name, lab_ids in ingredient_labs.items():
+            amounts = ingredient_amounts.get(name)
+            ingredient_stats.append(
+                {
+                    "name": name,
+                    "count": len(lab_ids),
+                    "min_amount": min(amounts) if amounts else None,
+                    "max_amount": max(amounts) if amounts else None,
+                }
+            )
+        ingredient_stats.sort(
+            key=lambda stats: (
+                -stats["count"],
+                stats["max_amount"] is None,
+                -(stats["max_amount"] or 0.0),
+            )
+        )
+
+        summary = {
+            "num_labs": len(reranked_candidates),
+            "labs": labs,
+            "categories": [
+                {
+                    "name": name,
+                    "count": count,
+                }
+                for name, count in sorted(
+                    category_counts.items(),
+                    key=lambda item: -item[1],
+                )
+            ],
+            "ingredients": ingredient_stats[: self.summary.max_ingredients],
+        }
+        return summary
+
+    @staticmethod
+    def split_values(
+        value: Any,
+    ) -> List[str]:
+        if value is None or pd.isna(value):
+            return [""]
+        return str(value).split("|")
+
+    @staticmethod
+    def parse_amount(
+        amount: Optional[str],
+    ) -> Optional[float]:
+        if amount is None:
+            return None
+        try:
+            amount = float(amount)
+        except ValueError:
+            return None
+        if np.isnan(amount):
+            return None
+        return amount
+
+    def format_recommendation(
+        self,
+        reranked_candidates: Optional[List[Dict[str, Any]]],
+    ) -> str:
         if reranked_candidates is None:
             recommendation = "No matching lab_id found."
             return recommendation
@@ -221,3 +794,139 @@ class RecommendationManager:
             ]
             recommendation = "\n".join(lines)
             return recommendation
+
+    def get_result_key(
+        self,
+        input_value: str,
+        input_type: str,
+        category_value: Optional[str],
+    ) -> Tuple[Any, ...]:
+        key = (
+            self.index.version,
+            self.embedding.model_id,
+            self.reranker.cache_namespace,
+            self.index.neighbors.reranker_id if self.use_neighbor_table else None,
+            input_value,
+            input_type,
+            category_value,
+            self.rerank_top_k,
+            self.is_table,
+        )
+        return key
+
+    def recommend(
+        self,
+        input_value: str,
+        input_type: str,
+        category_value: Optional[str],
+    ) -> str:
+        recommendation, _ = self.recommend_with_candidates(
+            input_value=input_value,
+            input_type=input_type,
+            category_value=category_value,
+        )
+        return recommendation
+
+    def recommend_with_summary(
+        self,
+        input_value: str,
+        input_type: str,
+        category_value: Optional[str],
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        recommendation, reranked_candidates = self.recommend_with_candidates(
+            input_value=input_value,
+            input_type=input_type,
+            category_value=category_value,
+        )
+        return recommendation, self.summarize(reranked_candidates)
+
+    def recommend_with_candidates(
+        self,
+        input_value: str,
+        input_type: str,
+        category_value: Optional[str],
+    ) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
+        with self.index.pinned():
+            key = self.get_result_key(
+                input_value=input_value,
+                input_type=input_type,
+                category_value=category_value,
+            )
+            result = self.results.get(key)
+            if result is not None:
+                return result
+
+            reranked_candidates = self.retrieve_and_rerank(
+                input_value=input_value,
+                input_type=input_type,
+                category_value=category_value,
+            )
+            recommendation = self.format_recommendation(reranked_candidates)
+            result = (recommendation, reranked_candidates)
+            self.results.set(
+                key=key,
+                value=result,
+            )
+            return result
+
+    def recommend_batch(
+        self,
+        inputs: List[Tuple[str, str, Optional[str]]],
+    ) -> List[str]:
+        recommendations = [
+            recommendation
+            for recommendation, _ in self.recommend_batch_with_candidates(inputs=inputs)
+        ]
+        return recommendations
+
+    def recommend_batch_with_summary(
+        self,
+        inputs: List[Tuple[str, str, Optional[str]]],
+    ) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+        results = [
+            (recommendation, self.summarize(reranked_candidates))
+            for recommendation, reranked_candidates in self.recommend_batch_with_candidates(
+                inputs=inputs
+            )
+        ]
+        return results
+
+    def recommend_batch_with_candidates(
+        self,
+        inputs: List[Tuple[str, str, Optional[str]]],
+    ) -> List[Tuple[str, Optional[List[Dict[str, Any]]]]]:
+        with self.index.pinned():
+            results: List[Optional[Tuple[str, Optional[List[Dict[str, Any]]]]]] = [
+                None
+            ] * len(inputs)
+            missing: Dict[Tuple[Any, ...], List[int]] = {}
+            for i, (input_value, input_type, category_value) in enumerate(inputs):
+                key = self.get_result_key(
+                    input_value=input_value,
+                    input_type=input_type,
+                    category_value=category_value,
+                )
+                if key in missing:
+                    missing[key].append(i)
+                    continue
+                results[i] = self.results.get(key)
+                if results[i] is None:
+                    missing[key] = [i]
+
+            if missing:
+                keys = list(missing)
+                reranked_candidates_list = self.retrieve_and_rerank_batch(
+                    inputs=[inputs[missing[key][0]] for key in keys]
+                )
+                for key, reranked_candidates in zip(keys, reranked_candidates_list):
+                    result = (
+                        self.format_recommendation(reranked_candidates),
+                        reranked_candidates,
+                    )
+                    self.results.set(
+                        key=key,
+                        value=result,
+                    )
+                    for i in missing[key]:
+                        results[i] = result
+            return results
@@ -1,16 +1,158 @@
-from ..models import VllmGenerator
+from typing import Dict, List, Any, Optional, Iterator, Tuple, Union
+import os
+import json
+import time
+
+from ..models import BaseGenerator
 
 
 class ReportManager:
     def __init__(
         self,
-        generator: VllmGenerator,
+        generator: BaseGenerator,
     ) -> None:
         self.generator = generator
 
     def generate(
         self,
-        recommendations: str,
+        recommendations: Union[str, Dict[str, Any]],
+        instruction_name: Optional[str] = None,
     ) -> str:
-        report = self.generator(recommendations=recommendations)
+        recommendations, instruction_name = self.prepare(
+            recommendations=recommendations,
+            instruction_name=instruction_name,
+        )
+        report = self.generator(
+            recommendations=recommendations,
+            instruction_name=instruction_name,
+        )
         return report
+
+    def stream(
+        self,
+        recommendations: Union[str, Dict[str, Any]],
+        instruction_name: Optional[str] = None,
+    ) -> Iterator[str]:
+        recommendations, instruction_name = self.prepare(
+            recommendations=recommendations,
+            instruction_name=instruction_name,
+        )
+        yield from self.generator.stream(
+            recommendations=recommendations,
+            instruction_name=instruction_name,
+        )
+
+    def generate_groups(
+        self,
+        payloads: List[str],
+        groups: Dict[Optional[str], List[int]],
+    ) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        for instruction_name, positions in groups.items():
+            for j, report, timing in self.generator.batch(
+                recommendations_list=[payloads[i] for i in positions],
+                instruction_name=instruction_name,
+            ):
+                yield positions[j], report, timing
+
+    def prepare(
+        self,
+        recommendations: Union[str, Dict[str, Any]],
+        instruction_name: Optional[str],
+    ) -> Tuple[str, Optional[str]]:
+        if isinstance(recommendations, str):
+            return recommendations, instruction_name
+        if instruction_name is None:
+            instruction_name = "summary"
+        return self.format_summary(summary=recommendations), instruction_name
+
+    @staticmethod
+    def format_summary(
+        summary: Dict[str, Any],
+    ) -> str:
+        num_labs = summary["num_labs"]
+        labs = "; ".join(
+            f"{lab['lab_id']} [{lab['category'] or '-'}]" for lab in summary["labs"]
+        )
+        categories = ", ".join(
+            f"{category['name']} {category['count']}/{num_labs}"
+            for category in summary["categories"]
+        )
+
+        ingredients = []
+        for ingredient in summary["ingredients"]:
+            min_amount = ingredient["min_amount"]
+            max_amount = ingredient["max_amount"]
+            if min_amount is None:
+                amount_range = "-"
+            elif min_amount == max_amount:
+                amount_range = f"{min_amount:g}%"
+            else:
+                amount_range = f"{min_amount:g}-{max_amount:g}%"
+            ingredients.append(
+                f"{ingredient['name']} {ingredient['count']}/{num_labs} ({amount_range})"
+            )
+
+        lines = [
+            f"labs ({num_labs}): {labs}",
+            f"categories: {categories or '-'}",
+            f"ingredients: {'; '.join(ingredients) or '-'}",
+        ]
+        text = "\n".join(lines)
+        return text
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {
+            "report_cache": self.generator.get_cache_stats(),
+        }
+        return stats
+
+    def generate_many(
+        self,
+        recommendations_list: List[Union[str, Dict[str, Any]]],
+        output_path: str,
+        instruction_name: Optional[str] = None,
+        ids: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(
+                output_dir,
+                exist_ok=True,
+            )
+
+        groups: Dict[Optional[str], List[int]] = {}
+        payloads = []
+        for i, recommendations in enumerate(recommendations_list):
+            payload, payload_instruction_name = self.prepare(
+                recommendations=recommendations,
+                instruction_name=instruction_name,
+            )
+            groups.setdefault(payload_instruction_name, []).append(i)
+            payloads.append(payload)
+
+        start = time.perf_counter()
+        num_tokens = 0
+        with open(output_path, "w", encoding="utf-8") as f:
+            for i, report, timing in self.generate_groups(
+                payloads=payloads,
+                groups=groups,
+            ):
+                record = {
+                    "index": i,
+                    "id": ids[i] if ids is not None else i,
+                    "report": report,
+                    **timing,
+                }
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                num_tokens += timing["num_tokens"]
+        elapsed = time.perf_counter() - start
+
+        summary = {
+            "count": len(recommendations_list),
+            "elapsed": elapsed,
+            "num_tokens": num_tokens,
+            "tokens_per_sec": num_tokens / elapsed if elapsed > 0 else 0.0,
+            "output_path": output_path,
+        }
+        return summary
@@ -1,9 +1,29 @@
+from .base_embedding import BaseEmbedding
+from .base_reranker import BaseReranker
+from .base_generator import BaseGenerator
 from .embedding import VllmEmbedding
 from .reranker import VllmReranker
+from .torch_embedding import TorchEmbedding
+from .torch_reranker import TorchReranker
 from .generator import VllmGenerator
+from .torch_generator import TorchGenerator
+from .stub_embedding import StubEmbedding
+from .stub_reranker import StubReranker
+from .stub_generator import StubGenerator
+from .embedding_pool import EmbeddingPool
 
 __all__ = [
+    "BaseEmbedding",
+    "BaseReranker",
+    "BaseGenerator",
     "VllmEmbedding",
     "VllmReranker",
+    "TorchEmbedding",
+    "TorchReranker",
     "VllmGenerator",
+    "TorchGenerator",
+    "StubEmbedding",
+    "StubReranker",
+    "StubGenerator",
+    "EmbeddingPool",
 ]
@@ -0,0 +1,184 @@
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from ..caches import EmbeddingCache
+from ..databases import EmbeddingStore
+
+
+class BaseEmbedding:
+    def __init__(
+        self,
+        model_id: str,
+        instruction: str,
+        dim: int,
+        cache_size: int,
+        cache_ttl: Optional[float],
+        cache_path: Optional[str],
+        cache_disk_size: Optional[int],
+    ) -> None:
+        self.model_id = model_id
+        self.dim = dim
+        self.instruction = instruction
+
+        self.cache: Optional[EmbeddingCache] = None
+        if cache_size > 0 or cache_path is not None:
+            self.cache = EmbeddingCache(
+                max_size=cache_size,
+                ttl=cache_ttl,
+                path=cache_path,
+                max_disk_size=cache_disk_size,
+                dim=dim,
+                model_id=model_id,
+            )
+
+    def __call__(
+        self,
+        query: str,
+    ) -> np.ndarray:
+        embedding = self.embed(query=query)
+        return embedding
+
+    def encode(
+        self,
+        input_texts: List[str],
+    ) -> np.ndarray:
+        raise NotImplementedError
+
+    def embed(
+        self,
+        query: str,
+    ) -> np.ndarray:
+        canonical_query = self.canonicalize_query(query=query)
+        if self.cache is not None:
+            key = self.get_cache_key(query=canonical_query)
+            embedding = self.cache.get(key=key)
+            if embedding is not None:
+                return embedding
+
+        input_text = self.get_detailed_instruction(query=canonical_query)
+        embedding = self.encode(input_texts=[input_text])[0]
+
+        if self.cache is not None:
+            self.cache.set(
+                key=key,
+                embedding=embedding,
+            )
+        return embedding
+
+    def embed_many(
+        self,
+        queries: List[str],
+    ) -> np.ndarray:
+        embeddings = np.empty(
+            (len(queries), self.dim),
+            dtype=np.float32,
+        )
+        canonical_queries = [self.canonicalize_query(query=query) for query in queries]
+        keys = [self.get_cache_key(query=query) for query in canonical_queries]
+        missing = []
+        for i, key in enumerate(keys):
+            embedding = self.cache.get(key=key) if self.cache is not None else None
+            if embedding is None:
+                missing.append(i)
+            else:
+                embeddings[i] = embedding
+        if not missing:
+            return embeddings
+
+        unique_queries: Dict[str, str] = {}
+        for i in missing:
+            unique_queries.setdefault(keys[i], canonical_queries[i])
+        computed = self.embed_batch(
+            queries=list(unique_queries.values()),
+            batch_size=len(unique_queries),
+        )
+        computed = dict(zip(unique_queries, computed))
+        for i in missing:
+            embeddings[i] = computed[keys[i]]
+        if self.cache is not None:
+            for key, embedding in computed.items():
+                self.cache.set(
+                    key=key,
+                    embedding=embedding,
+                )
+        return embeddings
+
+    def embed_batch(
+        self,
+        queries: List[str],
+        batch_size: int,
+    ) -> np.ndarray:
+        embeddings = None
+        for start in range(0, len(queries), batch_size):
+            input_texts = [
+                self.get_detailed_instruction(query=query)
+                for query in queries[start : start + batch_size]
+            ]
+            batch = self.encode(input_texts=input_texts)
+            if embeddings is None:
+                embeddings = np.empty(
+                    (len(queries), batch.shape[1]),
+                    dtype=np.float32,
+                )
+            embeddings[start : start + len(batch)] = batch
+        if embeddings is None:
+            embeddings = np.empty(
+                (0, 0),
+                dtype=np.float32,
+            )
+        return embeddings
+
+    def get_detailed_instruction(
+        self,
+        query: str,
+    ) -> str:
+        instruction = self.format_instruction(
+            instruction=self.instruction,
+            query=query,
+        )
+        return instruction
+
+    def get_cache_key(
+        self,
+        query: str,
+    ) -> str:
+        key = self.get_key(
+            instruction=self.instruction,
+            query=query,
+        )
+        return key
+
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        if self.cache is None:
+            return None
+        return self.cache.get_stats()
+
+    @staticmethod
+    def canonicalize_query(
+        query: str,
+    ) -> str:
+        parts = [" ".join(part.split()).lower() for part in str(query).split("|")]
+        canonical_query = "|".join(part for part in parts if part)
+        return canonical_query
+
+    @classmethod
+    def get_key(
+        cls,
+        instruction: str,
+        query: str,
+    ) -> str:
+        key = EmbeddingStore.get_key(
+            cls.format_instruction(
+                instruction=instruction,
+                query=cls.canonicalize_query(query=query),
+            )
+        )
+        return key
+
+    @staticmethod
+    def format_instruction(
+        instruction: str,
+        query: str,
+    ) -> str:
+        return f"Instruct: {instruction}\nQuery:{query}"
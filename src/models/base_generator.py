@@ -0,0 +1,286 @@
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+import re
+import json
+import hashlib
+
+from transformers import AutoTokenizer
+
+from ..caches import TieredCache
+
+
+class BaseGenerator:
+    def __init__(
+        self,
+        model_id: str,
+        is_table: bool,
+        instruction: Dict[str, str],
+        role_column_name: str,
+        content_column_name: str,
+        max_new_tokens: int,
+        do_sample: bool,
+        generation_config: Dict[str, Any],
+        streaming: bool,
+        cache_size: int,
+        cache_ttl: Optional[float],
+        cache_path: Optional[str],
+        cache_disk_size: Optional[int],
+        cache_sampled: bool,
+    ) -> None:
+        self.model_id = model_id
+        self.streaming = streaming
+        self.tokenizer = self.load_tokenizer(model_id=model_id)
+
+        self.is_table = is_table
+        self.instruction = instruction
+        self.role_column_name = role_column_name
+        self.content_column_name = content_column_name
+        self.max_new_tokens = max_new_tokens
+
+        if do_sample:
+            self.generation_config = generation_config
+        else:
+            self.generation_config = {
+                "temperature": 0,
+                "top_p": 1,
+            }
+
+        self.set_cache(
+            model_id=model_id,
+            max_new_tokens=max_new_tokens,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            cache_path=cache_path,
+            cache_disk_size=cache_disk_size,
+            is_cacheable=not do_sample or cache_sampled,
+        )
+
+    @staticmethod
+    def load_tokenizer(
+        model_id: str,
+    ) -> Any:
+        tokenizer = AutoTokenizer.from_pretrained(
+            model_id,
+            use_fast=True,
+            is_enable_thinking=False,
+        )
+        if tokenizer.pad_token_id is None:
+            tokenizer.pad_token_id = tokenizer.eos_token_id
+        return tokenizer
+
+    def set_cache(
+        self,
+        model_id: str,
+        max_new_tokens: int,
+        cache_size: int,
+        cache_ttl: Optional[float],
+        cache_path: Optional[str],
+        cache_disk_size: Optional[int],
+        is_cacheable: bool,
+    ) -> None:
+        self.cache: Optional[TieredCache] = None
+        if (cache_size > 0 or cache_path is not None) and is_cacheable:
+            self.cache = TieredCache(
+                max_size=cache_size,
+                ttl=cache_ttl,
+                path=cache_path,
+                max_disk_size=cache_disk_size,
+            )
+        self.cache_namespace = self.get_hash(
+            json.dumps(
+                {
+                    "model_id": model_id,
+                    "instruction": dict(self.instruction),
+                    "generation_config": dict(self.generation_config),
+                    "max_new_tokens": max_new_tokens,
+                },
+                sort_keys=True,
+                ensure_ascii=False,
+            )
+        )
+
+    def __call__(
+        self,
+        recommendations: str,
+        instruction_name: Optional[str] = None,
+    ) -> str:
+        key = self.get_cache_key(
+            recommendations=recommendations,
+            instruction_name=instruction_name,
+        )
+        if self.cache is not None:
+            generation = self.cache.get(key=key)
+            if generation is not None:
+                return generation
+
+        prompt = self.get_prompt(
+            recommendations=recommendations,
+            instruction_name=instruction_name,
+        )
+        generation = self.generate(prompt=prompt)
+
+        if self.cache is not None:
+            self.cache.set(
+                key=key,
+                value=generation,
+            )
+        return generation
+
+    def stream(
+        self,
+        recommendations: str,
+        instruction_name: Optional[str] = None,
+    ) -> Iterator[str]:
+        key = self.get_cache_key(
+            recommendations=recommendations,
+            instruction_name=instruction_name,
+        )
+        if self.cache is not None:
+            generation = self.cache.get(key=key)
+            if generation is not None:
+                yield generation
+                return
+
+        prompt = self.get_prompt(
+            recommendations=recommendations,
+            instruction_name=instruction_name,
+        )
+        chunks = []
+        for chunk in self.generate_stream(prompt=prompt):
+            chunks.append(chunk)
+            yield chunk
+
+        if self.cache is not None:
+            self.cache.set(
+                key=key,
+                value="".join(chunks).strip(),
+            )
+
+    def batch(
+        self,
+        recommendations_list: List[str],
+        instruction_name: Optional[str] = None,
+    ) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        keys = [
+            self.get_cache_key(
+                recommendations=recommendations,
+                instruction_name=instruction_name,
+            )
+            for recommendations in recommendations_list
+        ]
+        cached = {}
+        if self.cache is not None:
+            cached = self.cache.get_many(keys=keys)
+
+        missing: Dict[str, List[int]] = {}
+        for i, key in enumerate(keys):
+            if key in cached:
+                yield i, cached[key], {
+                    "latency": 0.0,
+                    "ttft": None,
+                    "num_tokens": 0,
+                    "cached": True,
+                }
+            else:
+                missing.setdefault(key, []).append(i)
+        if not missing:
+            return
+
+        missing_keys = list(missing)
+        prompts = [
+            self.get_prompt(
+                recommendations=recommendations_list[missing[key][0]],
+                instruction_name=instruction_name,
+            )
+            for key in missing_keys
+        ]
+        for j, generation, timing in self.generate_batch(prompts=prompts):
+            key = missing_keys[j]
+            if self.cache is not None:
+                self.cache.set(
+                    key=key,
+                    value=generation,
+                )
+            for i in missing[key]:
+                yield i, generation, {
+                    **timing,
+                    "cached": False,
+                }
+
+    def generate(
+        self,
+        prompt: str,
+    ) -> str:
+        raise NotImplementedError
+
+    def generate_stream(
+        self,
+        prompt: str,
+    ) -> Iterator[str]:
+        raise NotImplementedError
+
+    def generate_batch(
+        self,
+        prompts: List[str],
+    ) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        raise NotImplementedError
+
+    def get_cache_key(
+        self,
+        recommendations: str,
+        instruction_name: Optional[str],
+    ) -> str:
+        if instruction_name is None:
+            instruction_name = "with_tables" if self.is_table else "base"
+        payload = self.normalize_recommendations(recommendations=recommendations)
+        key = f"{self.cache_namespace}:{instruction_name}:{self.get_hash(payload)}"
+        return key
+
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        if self.cache is None:
+            return None
+        return self.cache.get_stats()
+
+    @staticmethod
+    def normalize_recommendations(
+        recommendations: str,
+    ) -> str:
+        normalized = re.sub(r">\s+<", "><", str(recommendations))
+        normalized = " ".join(normalized.split())
+        return normalized
+
+    @staticmethod
+    def get_hash(
+        text: str,
+    ) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def get_prompt(
+        self,
+        recommendations: str,
+        instruction_name: Optional[str] = None,
+    ) -> str:
+        if instruction_name is None:
+            instruction_name = "with_tables" if self.is_table else "base"
+        if instruction_name not in self.instruction:
+            raise ValueError(
+                f"Invalid instruction_name: {instruction_name}. Use one of {list(self.instruction)}."
+            )
+        instruction = self.instruction[instruction_name]
+
+        conversation = [
+            {
+                self.role_column_name: "system",
+                self.content_column_name: instruction,
+            },
+            {
+                self.role_column_name: "user",
+                self.content_column_name: recommendations,
+            },
+        ]
+
+        prompt = self.tokenizer.apply_chat_template(
+            conversation,
+            tokenize=False,
+            add_generation_prompt=True,
+        )
+        return prompt
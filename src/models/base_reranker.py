@@ -0,0 +1,261 @@
+from typing import Dict, List, Any, Tuple, Optional
+import hashlib
+
+from transformers import AutoTokenizer
+
+from ..caches import LRUCache, TieredCache
+
+QUERY_MARKER = "<<QUERY>>"
+DOCUMENT_MARKER = "<<DOCUMENT>>"
+
+
+class BaseReranker:
+    def __init__(
+        self,
+        model_id: str,
+        max_length: int,
+        instruction: str,
+        cache_size: int,
+        cache_ttl: Optional[float],
+        cache_path: Optional[str],
+        cache_disk_size: Optional[int],
+    ) -> None:
+        self.model_id = model_id
+        self.max_length = max_length
+
+        self.tokenizer = AutoTokenizer.from_pretrained(
+            model_id,
+            use_fast=True,
+        )
+        self.tokenizer.padding_side = "left"
+        self.tokenizer.pad_token = self.tokenizer.eos_token
+
+        self.suffix = "<|im_end|>\n<|im_start|>assistant\n<think>\n\n</think>\n\n"
+        self.suffix_tokens = self.tokenizer.encode(
+            self.suffix,
+            add_special_tokens=False,
+        )
+
+        self.true_token = self.tokenizer(
+            "yes",
+            add_special_tokens=False,
+        ).input_ids[0]
+        self.false_token = self.tokenizer(
+            "no",
+            add_special_tokens=False,
+        ).input_ids[0]
+
+        self.instruction = instruction
+
+        self.set_cache(
+            model_id=model_id,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            cache_path=cache_path,
+            cache_disk_size=cache_disk_size,
+        )
+
+        template = self.tokenizer.apply_chat_template(
+            self.format_instruction(
+                query=QUERY_MARKER,
+                doc=DOCUMENT_MARKER,
+            ),
+            tokenize=False,
+            add_generation_prompt=False,
+            enable_thinking=False,
+        )
+        prefix, rest = template.split(QUERY_MARKER)
+        middle, _ = rest.split(DOCUMENT_MARKER)
+        self.prefix_tokens = self.tokenizer.encode(
+            prefix.rstrip(" "),
+            add_special_tokens=False,
+        )
+        self.middle_tokens = self.tokenizer.encode(
+            middle.rstrip(" "),
+            add_special_tokens=False,
+        )
+        self.prompt_budget = (
+            self.max_length
+            - 1
+            - len(self.prefix_tokens)
+            - len(self.middle_tokens)
+            - len(self.suffix_tokens)
+        )
+        self.query_tokens = LRUCache(
+            max_size=1024,
+            ttl=None,
+        )
+
+    def set_cache(
+        self,
+        model_id: str,
+        cache_size: int,
+        cache_ttl: Optional[float],
+        cache_path: Optional[str],
+        cache_disk_size: Optional[int],
+    ) -> None:
+        self.cache: Optional[TieredCache] = None
+        if cache_size > 0 or cache_path is not None:
+            self.cache = TieredCache(
+                max_size=cache_size,
+                ttl=cache_ttl,
+                path=cache_path,
+                max_disk_size=cache_disk_size,
+            )
+        self.cache_namespace = self.get_hash(f"{model_id}\x00{self.instruction}")
+
+    def __call__(
+        self,
+        query: str,
+        candidates: List[str],
+        candidate_tokens: Optional[List[List[int]]] = None,
+    ) -> List[float]:
+        scores = self.get_scores(
+            query=query,
+            candidates=candidates,
+            candidate_tokens=candidate_tokens,
+        )
+        return scores
+
+    def get_scores(
+        self,
+        query: str,
+        candidates: List[str],
+        candidate_tokens: Optional[List[List[int]]] = None,
+    ) -> List[float]:
+        scores = self.get_pair_scores(
+            pairs=[(query, candidate) for candidate in candidates],
+            doc_tokens=candidate_tokens,
+        )
+        return scores
+
+    def get_pair_scores(
+        self,
+        pairs: List[Tuple[str, str]],
+        doc_tokens: Optional[List[List[int]]] = None,
+    ) -> List[float]:
+        if self.cache is None:
+            scores = self.compute_scores(
+                pairs=pairs,
+                doc_tokens=doc_tokens,
+            )
+            return scores
+
+        query_hashes: Dict[str, str] = {}
+        keys = [
+            self.get_cache_key(
+                query_hashes.setdefault(query, self.get_hash(query)),
+                self.get_hash(doc),
+            )
+            for query, doc in pairs
+        ]
+        cached_scores = self.cache.get_many(keys=keys)
+        missing = [i for i, key in enumerate(keys) if key not in cached_scores]
+        if missing:
+            computed_scores = self.compute_scores(
+                pairs=[pairs[i] for i in missing],
+                doc_tokens=(
+                    [doc_tokens[i] for i in missing] if doc_tokens is not None else None
+                ),
+            )
+            computed_scores = {
+                keys[i]: score for i, score in zip(missing, computed_scores)
+            }
+            self.cache.set_many(values=computed_scores)
+            cached_scores.update(computed_scores)
+        scores = [cached_scores[key] for key in keys]
+        return scores
+
+    def compute_scores(
+        self,
+        pairs: List[Tuple[str, str]],
+        doc_tokens: Optional[List[List[int]]] = None,
+    ) -> List[float]:
+        raise NotImplementedError
+
+    def get_cache_key(
+        self,
+        query_hash: str,
+        doc_hash: str,
+    ) -> str:
+        return f"{self.cache_namespace}:{query_hash}:{doc_hash}"
+
+    def get_cache_stats(self) -> Optional[Dict[str, Any]]:
+        if self.cache is None:
+            return None
+        return self.cache.get_stats()
+
+    @staticmethod
+    def get_hash(
+        text: str,
+    ) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def format_instruction(
+        self,
+        query: str,
+        doc: str,
+    ) -> List[Dict[str, str]]:
+        text = [
+            {
+                "role": "system",
+                "content": 'Judge whether the Document meets the requirements based on the Query and the Instruct provided. Note that the answer can only be "yes" or "no".',
+            },
+            {
+                "role": "user",
+                "content": f"<Instruct>: {self.instruction}\n\n<Query>: {query}\n\n<Document>: {doc}",
+            },
+        ]
+        return text
+
+    def process_inputs(
+        self,
+        pairs: List[Tuple[str, str]],
+        doc_tokens: Optional[List[List[int]]] = None,
+    ) -> List[List[int]]:
+        if doc_tokens is None:
+            doc_tokens = self.tokenize_documents(
+                tokenizer=self.tokenizer,
+                documents=[doc for _, doc in pairs],
+            )
+
+        messages = []
+        for (query, _), doc in zip(pairs, doc_tokens):
+            query_tokens = self.get_query_tokens(query=query)[: self.prompt_budget]
+            doc = list(doc[: self.prompt_budget - len(query_tokens)])
+            message = (
+                self.prefix_tokens
+                + query_tokens
+                + self.middle_tokens
+                + doc
+                + self.suffix_tokens
+            )
+            messages.append(message)
+        return messages
+
+    def get_query_tokens(
+        self,
+        query: str,
+    ) -> List[int]:
+        query_tokens = self.query_tokens.get(query)
+        if query_tokens is None:
+            query_tokens = self.tokenize_documents(
+                tokenizer=self.tokenizer,
+                documents=[query],
+            )[0]
+            self.query_tokens.set(
+                key=query,
+                value=query_tokens,
+            )
+        return query_tokens
+
+    @staticmethod
+    def tokenize_documents(
+        tokenizer: AutoTokenizer,
+        documents: List[str],
+    ) -> List[List[int]]:
+        token_ids = tokenizer(
+            [f" {document}" for document in documents],
+            add_special_tokens=False,
+        ).input_ids
+        return token_ids
@@ -1,12 +1,17 @@
-from typing import Optional
+from typing import List, Optional
 import os
 
 import numpy as np
 
-from vllm import LLM
+try:
+    from vllm import LLM
+except ImportError:
+    LLM = None
 
+from .base_embedding import BaseEmbedding
 
-class VllmEmbedding:
+
+class VllmEmbedding(BaseEmbedding):
     def __init__(
         self,
         model_id: str,
@@ -20,7 +25,15 @@ class VllmEmbedding:
         master_port: Optional[int],
         nccl_socket_ifname: Optional[str],
         nccl_ib_disable: Optional[int],
+        dim: int,
+        cache_size: int,
+        cache_ttl: Optional[float],
+        cache_path: Optional[str],
+        cache_disk_size: Optional[int],
     ) -> None:
+        if LLM is None:
+            raise ImportError("vllm is not installed, use model=cpu for CPU inference.")
+
         if device_id is not None:
             os.environ["CUDA_VISIBLE_DEVICES"] = str(device_id)
         if master_addr is not None:
@@ -51,31 +64,26 @@ class VllmEmbedding:
             gpu_memory_utilization=gpu_memory_utilization,
         )
 
-        self.instruction = instruction
-
-    def __call__(
-        self,
-        query: str,
-    ) -> np.ndarray:
-        embedding = self.embed(query=query)
-        return embedding
+        super().__init__(
+            model_id=model_id,
+            instruction=instruction,
+            dim=dim,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            cache_path=cache_path,
+            cache_disk_size=cache_disk_size,
+        )
 
-    def embed(
+    def encode(
         self,
-        query: str,
+        input_texts: List[str],
     ) -> np.ndarray:
-        input_text = self.get_detailed_instruction(query=query)
-        output = self.llm.embed(input_text)
-        embedding = output[0].outputs.embedding
-        embedding = np.array(
-            embedding,
+        outputs = self.llm.embed(
+            input_texts,
+            use_tqdm=False,
+        )
+        embeddings = np.array(
+            [output.outputs.embedding for output in outputs],
             dtype=np.float32,
         )
-        return embedding
-
-    def get_detailed_instruction(
-        self,
-        query: str,
-    ) -> str:
-        instruction = f"Instruct: {self.instruction}\nQuery:{query}"
-        return instruction
+        return embeddings
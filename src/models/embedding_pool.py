@@ -0,0 +1,100 @@
+from typing import Dict, List, Any, Optional
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from omegaconf import DictConfig, OmegaConf
+from hydra.utils import instantiate
+
+_worker_embedding: Optional[Any] = None
+
+
+def _init_worker(
+    embedding_config: Dict[str, Any],
+    device_ids: List[int],
+    worker_ids: "mp.Queue",
+) -> None:
+    global _worker_embedding
+
+    worker_id = worker_ids.get()
+    embedding_config = dict(embedding_config)
+    embedding_config["device_id"] = device_ids[worker_id]
+    embedding_config["cache_size"] = 0
+    embedding_config["cache_path"] = None
+    if embedding_config.get("master_port") is not None:
+        embedding_config["master_port"] = (
+            int(embedding_config["master_port"]) + worker_id
+        )
+    _worker_embedding = instantiate(embedding_config)
+
+
+def _embed_shard(
+    queries: List[str],
+    batch_size: int,
+) -> np.ndarray:
+    return _worker_embedding.embed_batch(
+        queries=queries,
+        batch_size=batch_size,
+    )
+
+
+class EmbeddingPool:
+    def __init__(
+        self,
+        embedding_config: DictConfig,
+        device_ids: List[int],
+    ) -> None:
+        self.device_ids = list(device_ids)
+        self.num_workers = len(self.device_ids)
+
+        context = mp.get_context("spawn")
+        worker_ids = context.Queue()
+        for worker_id in range(self.num_workers):
+            worker_ids.put(worker_id)
+
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(
+                OmegaConf.to_container(
+                    embedding_config,
+                    resolve=True,
+                ),
+                self.device_ids,
+                worker_ids,
+            ),
+        )
+
+    def embed_batch(
+        self,
+        queries: List[str],
+        batch_size: int,
+    ) -> np.ndarray:
+        if not queries:
+            return np.empty(
+                (0, 0),
+                dtype=np.float32,
+            )
+
+        shard_size = -(-len(queries) // self.num_workers)
+        shards = [
+            queries[start : start + shard_size]
+            for start in range(0, len(queries), shard_size)
+        ]
+        embedded = list(
+            self.executor.map(
+                _embed_shard,
+                shards,
+                [batch_size] * len(shards),
+            )
+        )
+        embeddings = np.concatenate(
+            embedded,
+            axis=0,
+        )
+        return embeddings
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True)
@@ -1,12 +1,23 @@
-from typing import Dict, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, AsyncIterator, Tuple
 import os
+import asyncio
+import queue
+import threading
+import time
+import uuid
 
-from transformers import AutoTokenizer
+try:
+    from vllm import LLM, SamplingParams, AsyncEngineArgs, AsyncLLMEngine
+except ImportError:
+    LLM = None
+    SamplingParams = None
+    AsyncEngineArgs = None
+    AsyncLLMEngine = None
 
-from vllm import LLM, SamplingParams
+from .base_generator import BaseGenerator
 
 
-class VllmGenerator:
+class VllmGenerator(BaseGenerator):
     def __init__(
         self,
         model_id: str,
@@ -26,7 +37,16 @@ class VllmGenerator:
         master_port: Optional[int],
         nccl_socket_ifname: Optional[str],
         nccl_ib_disable: Optional[int],
+        streaming: bool,
+        cache_size: int,
+        cache_ttl: Optional[float],
+        cache_path: Optional[str],
+        cache_disk_size: Optional[int],
+        cache_sampled: bool,
     ) -> None:
+        if LLM is None:
+            raise ImportError("vllm is not installed, report generation needs vllm.")
+
         if device_id is not None:
             os.environ["CUDA_VISIBLE_DEVICES"] = str(device_id)
         if master_addr is not None:
@@ -47,35 +67,48 @@ class VllmGenerator:
                 del os.environ[var]
 
         tp = 1 if device_id is not None else num_gpus
-        self.llm = LLM(
-            model=model_id,
-            tensor_parallel_size=tp,
-            seed=seed,
-            trust_remote_code=True,
-            max_model_len=max_length,
-            gpu_memory_utilization=gpu_memory_utilization,
-        )
+        engine_args = {
+            "model": model_id,
+            "tensor_parallel_size": tp,
+            "seed": seed,
+            "trust_remote_code": True,
+            "max_model_len": max_length,
+            "gpu_memory_utilization": gpu_memory_utilization,
+        }
 
-        self.tokenizer = AutoTokenizer.from_pretrained(
-            model_id,
-            use_fast=True,
-            is_enable_thinking=False,
+        super().__init__(
+            model_id=model_id,
+            is_table=is_table,
+            instruction=instruction,
+            role_column_name=role_column_name,
+            content_column_name=content_column_name,
+            max_new_tokens=max_new_tokens,
+            do_sample=do_sample,
+            generation_config=generation_config,
+            streaming=streaming,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            cache_path=cache_path,
+            cache_disk_size=cache_disk_size,
+            cache_sampled=cache_sampled,
         )
-        if self.tokenizer.pad_token_id is None:
-            self.tokenizer.pad_token_id = self.tokenizer.eos_token_id
 
-        self.is_table = is_table
-        self.instruction = instruction
-        self.role_column_name = role_column_name
-        self.content_column_name = content_column_name
-
-        if do_sample:
-            self.generation_config = generation_config
+        self.llm: Optional[LLM] = None
+        self.engine: Optional[AsyncLLMEngine] = None
+        if self.streaming:
+            self.loop = asyncio.new_event_loop()
+            self.loop_thread = threading.Thread(
+                target=self.loop.run_forever,
+                name="generator-engine",
+                daemon=True,
+            )
+            self.loop_thread.start()
+            self.engine = asyncio.run_coroutine_threadsafe(
+                self.build_engine(engine_args=engine_args),
+                self.loop,
+            ).result()
         else:
-            self.generation_config = {
-                "temperature": 0,
-                "top_p": 1,
-            }
+            self.llm = LLM(**engine_args)
 
         self.sampling_params = SamplingParams(
             max_tokens=max_new_tokens,
@@ -84,18 +117,14 @@ class VllmGenerator:
             **self.generation_config,
         )
 
-    def __call__(
-        self,
-        recommendations: str,
-    ) -> str:
-        prompt = self.get_prompt(recommendations=recommendations)
-        generation = self.generate(prompt=prompt)
-        return generation
-
     def generate(
         self,
         prompt: str,
     ) -> str:
+        if self.streaming:
+            generation = "".join(self.generate_stream(prompt=prompt)).strip()
+            return generation
+
         output = self.llm.generate(
             prompts=[prompt],
             sampling_params=self.sampling_params,
@@ -103,29 +132,146 @@ class VllmGenerator:
         generation = output[0].outputs[0].text.strip()
         return generation
 
-    def get_prompt(
+    def generate_stream(
         self,
-        recommendations: str,
-    ) -> str:
-        if self.is_table:
-            instruction = self.instruction["with_tables"]
-        else:
-            instruction = self.instruction["base"]
-
-        conversation = [
-            {
-                self.role_column_name: "system",
-                self.content_column_name: instruction,
-            },
-            {
-                self.role_column_name: "user",
-                self.content_column_name: recommendations,
-            },
+        prompt: str,
+    ) -> Iterator[str]:
+        if not self.streaming:
+            yield self.generate(prompt=prompt)
+            return
+
+        yield from self.run_async_iterator(
+            async_iterator=self.agenerate_stream(prompt=prompt),
+        )
+
+    def generate_batch(
+        self,
+        prompts: List[str],
+    ) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        if self.streaming:
+            yield from self.run_async_iterator(
+                async_iterator=self.agenerate_batch(prompts=prompts),
+            )
+            return
+
+        start = time.perf_counter()
+        outputs = self.llm.generate(
+            prompts=prompts,
+            sampling_params=self.sampling_params,
+            use_tqdm=False,
+        )
+        elapsed = time.perf_counter() - start
+        for i, output in enumerate(outputs):
+            metrics = getattr(output, "metrics", None)
+            latency = elapsed
+            ttft = None
+            if metrics is not None and metrics.finished_time is not None:
+                latency = metrics.finished_time - metrics.arrival_time
+                if metrics.first_token_time is not None:
+                    ttft = metrics.first_token_time - metrics.arrival_time
+            timing = {
+                "latency": latency,
+                "ttft": ttft,
+                "num_tokens": len(output.outputs[0].token_ids),
+            }
+            yield i, output.outputs[0].text.strip(), timing
+
+    async def agenerate_batch(
+        self,
+        prompts: List[str],
+    ) -> AsyncIterator[Tuple[int, str, Dict[str, Any]]]:
+        async def generate_one(
+            i: int,
+            prompt: str,
+        ) -> Tuple[int, str, Dict[str, Any]]:
+            start = time.perf_counter()
+            ttft = None
+            output = None
+            request_id = uuid.uuid4().hex
+            try:
+                async for output in self.engine.generate(
+                    prompt,
+                    self.sampling_params,
+                    request_id=request_id,
+                ):
+                    if ttft is None:
+                        ttft = time.perf_counter() - start
+            finally:
+                if output is None or not output.finished:
+                    await self.engine.abort(request_id)
+            timing = {
+                "latency": time.perf_counter() - start,
+                "ttft": ttft,
+                "num_tokens": len(output.outputs[0].token_ids),
+            }
+            return i, output.outputs[0].text.strip(), timing
+
+        tasks = [
+            asyncio.ensure_future(generate_one(i, prompt))
+            for i, prompt in enumerate(prompts)
         ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
 
-        prompt = self.tokenizer.apply_chat_template(
-            conversation,
-            tokenize=False,
-            add_generation_prompt=True,
+    def run_async_iterator(
+        self,
+        async_iterator: AsyncIterator[Any],
+    ) -> Iterator[Any]:
+        items: queue.Queue = queue.Queue()
+        done = object()
+
+        async def produce() -> None:
+            try:
+                async for item in async_iterator:
+                    items.put(item)
+            except Exception as e:
+                items.put(e)
+            finally:
+                items.put(done)
+
+        future = asyncio.run_coroutine_threadsafe(
+            produce(),
+            self.loop,
         )
-        return prompt
+        try:
+            while True:
+                item = items.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            future.cancel()
+
+    async def agenerate_stream(
+        self,
+        prompt: str,
+    ) -> AsyncIterator[str]:
+        text = ""
+        output = None
+        request_id = uuid.uuid4().hex
+        try:
+            async for output in self.engine.generate(
+                prompt,
+                self.sampling_params,
+                request_id=request_id,
+            ):
+                generation = output.outputs[0].text.lstrip()
+                if len(generation) > len(text):
+                    yield generation[len(text) :]
+                    text = generation
+        finally:
+            if output is None or not output.finished:
+                await self.engine.abort(request_id)
+
+    @staticmethod
+    async def build_engine(
+        engine_args: Dict[str, Any],
+    ) -> AsyncLLMEngine:
+        engine = AsyncLLMEngine.from_engine_args(AsyncEngineArgs(**engine_args))
+        return engine
@@ -1,15 +1,20 @@
-from typing import Dict, List, Tuple, Optional
+from typing import List, Tuple, Optional
 import os
 
 import math
 
-from transformers import AutoTokenizer
+try:
+    from vllm import LLM, SamplingParams
+    from vllm.inputs import TokensPrompt
+except ImportError:
+    LLM = None
+    SamplingParams = None
+    TokensPrompt = None
 
-from vllm import LLM, SamplingParams
-from vllm.inputs import TokensPrompt
+from .base_reranker import BaseReranker
 
 
-class VllmReranker:
+class VllmReranker(BaseReranker):
     def __init__(
         self,
         model_id: str,
@@ -23,7 +28,14 @@ class VllmReranker:
         master_port: Optional[int],
         nccl_socket_ifname: Optional[str],
         nccl_ib_disable: Optional[int],
+        cache_size: int,
+        cache_ttl: Optional[float],
+        cache_path: Optional[str],
+        cache_disk_size: Optional[int],
     ) -> None:
+        if LLM is None:
+            raise ImportError("vllm is not installed, use model=cpu for CPU inference.")
+
         if device_id is not None:
             os.environ["CUDA_VISIBLE_DEVICES"] = str(device_id)
         if master_addr is not None:
@@ -43,39 +55,27 @@ class VllmReranker:
             if var in os.environ:
                 del os.environ[var]
 
-        self.max_length = max_length
         tp = 1 if device_id is not None else num_gpus
         self.llm = LLM(
             model=model_id,
             tensor_parallel_size=tp,
             seed=seed,
             trust_remote_code=True,
-            max_model_len=self.max_length,
+            max_model_len=max_length,
             enable_prefix_caching=True,
             gpu_memory_utilization=gpu_memory_utilization,
         )
 
-        self.tokenizer = AutoTokenizer.from_pretrained(
-            model_id,
-            use_fast=True,
-        )
-        self.tokenizer.padding_side = "left"
-        self.tokenizer.pad_token = self.tokenizer.eos_token
-
-        self.suffix = "<|im_end|>\n<|im_start|>assistant\n<think>\n\n</think>\n\n"
-        self.suffix_tokens = self.tokenizer.encode(
-            self.suffix,
-            add_special_tokens=False,
+        super().__init__(
+            model_id=model_id,
+            max_length=max_length,
+            instruction=instruction,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            cache_path=cache_path,
+            cache_disk_size=cache_disk_size,
         )
 
-        self.true_token = self.tokenizer(
-            "yes",
-            add_special_tokens=False,
-        ).input_ids[0]
-        self.false_token = self.tokenizer(
-            "no",
-            add_special_tokens=False,
-        ).input_ids[0]
         self.sampling_params = SamplingParams(
             temperature=0,
             max_tokens=1,
@@ -86,26 +86,18 @@ class VllmReranker:
             ],
         )
 
-        self.instruction = instruction
-
-    def __call__(
+    def compute_scores(
         self,
-        query: str,
-        candidates: List[str],
-    ) -> List[float]:
-        scores = self.get_scores(
-            query=query,
-            candidates=candidates,
-        )
-        return scores
-
-    def get_scores(
-        self,
-        query: str,
-        candidates: List[str],
+        pairs: List[Tuple[str, str]],
+        doc_tokens: Optional[List[List[int]]] = None,
     ) -> List[float]:
-        pairs = list(zip([query] * len(candidates), candidates))
-        messages = self.process_inputs(pairs=pairs)
+        messages = [
+            TokensPrompt(prompt_token_ids=message)
+            for message in self.process_inputs(
+                pairs=pairs,
+                doc_tokens=doc_tokens,
+            )
+        ]
         outputs = self.llm.generate(
             messages,
             self.sampling_params,
@@ -127,43 +119,3 @@ class VllmReranker:
             score = true_score / (true_score + false_score)
             scores.append(score)
         return scores
-
-    def format_instruction(
-        self,
-        query: str,
-        doc: str,
-    ) -> List[Dict[str, str]]:
-        text = [
-            {
-                "role": "system",
-                "content": 'Judge whether the Document meets the requirements based on the Query and the Instruct provided. Note that the answer can only be "yes" or "no".',
-            },
-            {
-                "role": "user",
-                "content": f"<Instruct>: {self.instruction}\n\n<Query>: {query}\n\n<Document>: {doc}",
-            },
-        ]
-        return text
-
-    def process_inputs(
-        self,
-        pairs: List[Tuple[str, str]],
-    ) -> List[TokensPrompt]:
-        messages = [
-            self.format_instruction(
-                query=query,
-                doc=doc,
-            )
-            for query, doc in pairs
-        ]
-        messages = self.tokenizer.apply_chat_template(
-            messages,
-            tokenize=True,
-            add_generation_prompt=False,
-            enable_thinking=False,
-        )
-        messages = [
-            message[: self.max_length] + self.suffix_tokens for message in messages
-        ]
-        messages = [TokensPrompt(prompt_token_ids=message) for message in messages]
-        return messages
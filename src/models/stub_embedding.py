@@ -0,0 +1,63 @@
+from typing import Dict, List, Optional
+import hashlib
+import re
+
+import numpy as np
+
+from .base_embedding import BaseEmbedding
+
+
+class StubEmbedding(BaseEmbedding):
+    def __init__(
+        self,
+        model_id: str,
+        instruction: str,
+        dim: int,
+        cache_size: int,
+        cache_ttl: Optional[float],
+        cache_path: Optional[str],
+        cache_disk_size: Optional[int],
+    ) -> None:
+        super().__init__(
+            model_id=model_id,
+            instruction=instruction,
+            dim=dim,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            cache_path=cache_path,
+            cache_disk_size=cache_disk_size,
+        )
+        self.token_vectors: Dict[str, np.ndarray] = {}
+
+    def encode(
+        self,
+        input_texts: List[str],
+    ) -> np.ndarray:
+        embeddings = np.zeros(
+            (len(input_texts), self.dim),
+            dtype=np.float32,
+        )
+        for i, input_text in enumerate(input_texts):
+            query = input_text.split("\nQuery:", 1)[-1]
+            for token in re.findall(r"\w+", query.lower()):
+                embeddings[i] += self.get_token_vector(token=token)
+        norms = np.linalg.norm(
+            embeddings,
+            axis=1,
+            keepdims=True,
+        )
+        embeddings /= np.maximum(norms, 1e-12)
+        return embeddings
+
+    def get_token_vector(
+        self,
+        token: str,
+    ) -> np.ndarray:
+        vector = self.token_vectors.get(token)
+        if vector is None:
+            seed = int(hashlib.sha1(token.encode("utf-8")).hexdigest()[:8], 16)
+            vector = (
+                np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+            )
+            self.token_vectors[token] = vector
+        return vector
@@ -0,0 +1,92 @@
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+import time
+
+from .base_generator import BaseGenerator
+
+MESSAGE_TEMPLATE = "<|im_start|>{role}\n{content}<|im_end|>\n"
+GENERATION_PROMPT = "<|im_start|>assistant\n"
+
+
+class StubChatTokenizer:
+    def apply_chat_template(
+        self,
+        conversation: List[Dict[str, str]],
+        tokenize: bool,
+        add_generation_prompt: bool,
+    ) -> str:
+        prompt = "".join(
+            MESSAGE_TEMPLATE.format(
+                role=message["role"],
+                content=message["content"],
+            )
+            for message in conversation
+        )
+        if add_generation_prompt:
+            prompt += GENERATION_PROMPT
+        return prompt
+
+
+class StubGenerator(BaseGenerator):
+    def __init__(
+        self,
+        model_id: str,
+        is_table: bool,
+        instruction: Dict[str, str],
+        role_column_name: str,
+        content_column_name: str,
+        max_new_tokens: int,
+        cache_size: int,
+        cache_ttl: Optional[float],
+        cache_path: Optional[str],
+        cache_disk_size: Optional[int],
+    ) -> None:
+        super().__init__(
+            model_id=model_id,
+            is_table=is_table,
+            instruction=instruction,
+            role_column_name=role_column_name,
+            content_column_name=content_column_name,
+            max_new_tokens=max_new_tokens,
+            do_sample=False,
+            generation_config={},
+            streaming=False,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            cache_path=cache_path,
+            cache_disk_size=cache_disk_size,
+            cache_sampled=False,
+        )
+
+    @staticmethod
+    def load_tokenizer(
+        model_id: str,
+    ) -> StubChatTokenizer:
+        return StubChatTokenizer()
+
+    def generate(
+        self,
+        prompt: str,
+    ) -> str:
+        generation = "".join(self.generate_stream(prompt=prompt)).strip()
+        return generation
+
+    def generate_stream(
+        self,
+        prompt: str,
+    ) -> Iterator[str]:
+        prompt_hash = self.get_hash(prompt)
+        for i in range(min(self.max_new_tokens, 64)):
+            yield f"{prompt_hash[i % len(prompt_hash)]} "
+
+    def generate_batch(
+        self,
+        prompts: List[str],
+    ) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        for i, prompt in enumerate(prompts):
+            start = time.perf_counter()
+            generation = self.generate(prompt=prompt)
+            yield i, generation, {
+                "latency": time.perf_counter() - start,
+                "ttft": None,
+                "num_tokens": len(generation.split()),
+            }
@@ -0,0 +1,41 @@
+from typing import List, Tuple, Optional
+import re
+
+from .base_reranker import BaseReranker
+
+
+class StubReranker(BaseReranker):
+    def __init__(
+        self,
+        model_id: str,
+        instruction: str,
+        cache_size: int,
+        cache_ttl: Optional[float],
+        cache_path: Optional[str],
+        cache_disk_size: Optional[int],
+    ) -> None:
+        self.model_id = model_id
+        self.instruction = instruction
+
+        self.set_cache(
+            model_id=model_id,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            cache_path=cache_path,
+            cache_disk_size=cache_disk_size,
+        )
+
+    def compute_scores(
+        self,
+        pairs: List[Tuple[str, str]],
+        doc_tokens: Optional[List[List[int]]] = None,
+    ) -> List[float]:
+        scores = []
+        for query, doc in pairs:
+            query_terms = set(re.findall(r"\w+", query.lower()))
+            doc_terms = set(re.findall(r"\w+", doc.lower()))
+            union = query_terms | doc_terms
+            overlap = len(query_terms & doc_terms) / len(union) if union else 0.0
+            jitter = int(self.get_hash(f"{query}\x00{doc}")[:4], 16) / 0xFFFF
+            scores.append(0.9 * overlap + 0.1 * jitter)
+        return scores
@@ -0,0 +1,108 @@
+from typing import List, Optional
+
+import numpy as np
+
+try:
+    import torch
+    import torch.nn.functional as F
+except ImportError:
+    torch = None
+    F = None
+
+from transformers import AutoTokenizer, AutoModel
+
+from .base_embedding import BaseEmbedding
+
+
+class TorchEmbedding(BaseEmbedding):
+    def __init__(
+        self,
+        model_id: str,
+        max_length: int,
+        instruction: str,
+        dim: int,
+        num_threads: Optional[int],
+        batch_size: int,
+        quantize: bool,
+        cache_size: int,
+        cache_ttl: Optional[float],
+        cache_path: Optional[str],
+        cache_disk_size: Optional[int],
+    ) -> None:
+        if torch is None:
+            raise ImportError("torch is not installed, model=cpu needs torch.")
+
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+
+        self.max_length = max_length
+        self.batch_size = batch_size
+        self.quantize = quantize
+
+        self.tokenizer = AutoTokenizer.from_pretrained(
+            model_id,
+            use_fast=True,
+        )
+        self.tokenizer.padding_side = "left"
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+
+        model = AutoModel.from_pretrained(
+            model_id,
+            torch_dtype=torch.float32,
+            trust_remote_code=True,
+        )
+        model.eval()
+        if self.quantize:
+            model = torch.ao.quantization.quantize_dynamic(
+                model,
+                {torch.nn.Linear},
+                dtype=torch.qint8,
+            )
+        self.model = model
+
+        super().__init__(
+            model_id=model_id,
+            instruction=instruction,
+            dim=dim,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            cache_path=cache_path,
+            cache_disk_size=cache_disk_size,
+        )
+
+    def encode(
+        self,
+        input_texts: List[str],
+    ) -> np.ndarray:
+        embeddings = np.empty(
+            (len(input_texts), self.dim),
+            dtype=np.float32,
+        )
+        order = sorted(
+            range(len(input_texts)),
+            key=lambda i: len(input_texts[i]),
+        )
+        for start in range(0, len(order), self.batch_size):
+            positions = order[start : start + self.batch_size]
+            inputs = self.tokenizer(
+                [input_texts[i] for i in positions],
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+                return_tensors="pt",
+            )
+            attention_mask = inputs["attention_mask"]
+            with torch.inference_mode():
+                outputs = self.model(
+                    input_ids=inputs["input_ids"],
+                    attention_mask=attention_mask,
+                    position_ids=(attention_mask.cumsum(dim=-1) - 1).clamp(min=0),
+                )
+                batch = F.normalize(
+                    outputs.last_hidden_state[:, -1, : self.dim],
+                    p=2,
+                    dim=-1,
+                )
+            embeddings[positions] = batch.numpy()
+        return embeddings
@@ -0,0 +1,209 @@
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+import threading
+import time
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+from transformers import (
+    AutoModelForCausalLM,
+    StoppingCriteria,
+    StoppingCriteriaList,
+    TextIteratorStreamer,
+)
+
+from .base_generator import BaseGenerator
+
+
+class StopOnEvent(StoppingCriteria):
+    def __init__(
+        self,
+        event: threading.Event,
+    ) -> None:
+        self.event = event
+
+    def __call__(
+        self,
+        input_ids: Any,
+        scores: Any,
+        **kwargs: Any,
+    ) -> Any:
+        return torch.full(
+            (input_ids.shape[0],),
+            self.event.is_set(),
+            dtype=torch.bool,
+            device=input_ids.device,
+        )
+
+
+class TorchGenerator(BaseGenerator):
+    def __init__(
+        self,
+        model_id: str,
+        is_table: bool,
+        instruction: Dict[str, str],
+        role_column_name: str,
+        content_column_name: str,
+        max_new_tokens: int,
+        do_sample: bool,
+        generation_config: Dict[str, Any],
+        num_threads: Optional[int],
+        batch_size: int,
+        quantize: bool,
+        streaming: bool,
+        cache_size: int,
+        cache_ttl: Optional[float],
+        cache_path: Optional[str],
+        cache_disk_size: Optional[int],
+        cache_sampled: bool,
+    ) -> None:
+        if torch is None:
+            raise ImportError("torch is not installed, model=cpu needs torch.")
+
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+
+        self.batch_size = batch_size
+        self.quantize = quantize
+
+        super().__init__(
+            model_id=model_id,
+            is_table=is_table,
+            instruction=instruction,
+            role_column_name=role_column_name,
+            content_column_name=content_column_name,
+            max_new_tokens=max_new_tokens,
+            do_sample=do_sample,
+            generation_config=generation_config,
+            streaming=streaming,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            cache_path=cache_path,
+            cache_disk_size=cache_disk_size,
+            cache_sampled=cache_sampled,
+        )
+
+        model = AutoModelForCausalLM.from_pretrained(
+            model_id,
+            torch_dtype=torch.float32,
+            trust_remote_code=True,
+        )
+        model.eval()
+        if self.quantize:
+            model = torch.ao.quantization.quantize_dynamic(
+                model,
+                {torch.nn.Linear},
+                dtype=torch.qint8,
+            )
+        self.model = model
+
+        self.generate_kwargs = {
+            "max_new_tokens": max_new_tokens,
+            "do_sample": do_sample,
+            "pad_token_id": self.tokenizer.pad_token_id,
+            "eos_token_id": self.tokenizer.eos_token_id,
+        }
+        if do_sample:
+            self.generate_kwargs.update(dict(self.generation_config))
+
+    @staticmethod
+    def load_tokenizer(
+        model_id: str,
+    ) -> Any:
+        tokenizer = BaseGenerator.load_tokenizer(model_id=model_id)
+        tokenizer.padding_side = "left"
+        return tokenizer
+
+    def generate(
+        self,
+        prompt: str,
+    ) -> str:
+        _, generation, _ = next(self.generate_batch(prompts=[prompt]))
+        return generation
+
+    def generate_stream(
+        self,
+        prompt: str,
+    ) -> Iterator[str]:
+        if not self.streaming:
+            yield self.generate(prompt=prompt)
+            return
+
+        inputs = self.tokenizer(
+            [prompt],
+            return_tensors="pt",
+            add_special_tokens=False,
+        )
+        streamer = TextIteratorStreamer(
+            self.tokenizer,
+            skip_prompt=True,
+            skip_special_tokens=True,
+        )
+        stop = threading.Event()
+        errors = []
+
+        def run() -> None:
+            try:
+                with torch.inference_mode():
+                    self.model.generate(
+                        **inputs,
+                        **self.generate_kwargs,
+                        streamer=streamer,
+                        stopping_criteria=StoppingCriteriaList([StopOnEvent(stop)]),
+                    )
+            except Exception as e:
+                errors.append(e)
+                streamer.end()
+
+        thread = threading.Thread(
+            target=run,
+            name="generator-stream",
+            daemon=True,
+        )
+        thread.start()
+        text = ""
+        try:
+            for chunk in streamer:
+                if not text:
+                    chunk = chunk.lstrip()
+                if chunk:
+                    text += chunk
+                    yield chunk
+        finally:
+            stop.set()
+            thread.join()
+        if errors:
+            raise errors[0]
+
+    def generate_batch(
+        self,
+        prompts: List[str],
+    ) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        for start in range(0, len(prompts), self.batch_size):
+            batch_start = time.perf_counter()
+            inputs = self.tokenizer(
+                prompts[start : start + self.batch_size],
+                return_tensors="pt",
+                padding=True,
+                add_special_tokens=False,
+            )
+            with torch.inference_mode():
+                outputs = self.model.generate(
+                    **inputs,
+                    **self.generate_kwargs,
+                )
+            outputs = outputs[:, inputs["input_ids"].shape[1] :]
+            num_tokens = (outputs != self.tokenizer.pad_token_id).sum(dim=1).tolist()
+            generations = self.tokenizer.batch_decode(
+                outputs,
+                skip_special_tokens=True,
+            )
+            latency = time.perf_counter() - batch_start
+            for i, generation in enumerate(generations):
+                yield start + i, generation.strip(), {
+                    "latency": latency,
+                    "ttft": None,
+                    "num_tokens": num_tokens[i],
+                }
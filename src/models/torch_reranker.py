@@ -0,0 +1,110 @@
+from typing import List, Tuple, Optional
+
+try:
+    import torch
+except ImportError:
+    torch = None
+
+from transformers import AutoModelForCausalLM
+
+from .base_reranker import BaseReranker
+
+
+class TorchReranker(BaseReranker):
+    def __init__(
+        self,
+        model_id: str,
+        max_length: int,
+        instruction: str,
+        num_threads: Optional[int],
+        batch_size: int,
+        quantize: bool,
+        cache_size: int,
+        cache_ttl: Optional[float],
+        cache_path: Optional[str],
+        cache_disk_size: Optional[int],
+    ) -> None:
+        if torch is None:
+            raise ImportError("torch is not installed, model=cpu needs torch.")
+
+        if num_threads is not None:
+            torch.set_num_threads(num_threads)
+
+        self.batch_size = batch_size
+        self.quantize = quantize
+
+        model = AutoModelForCausalLM.from_pretrained(
+            model_id,
+            torch_dtype=torch.float32,
+            trust_remote_code=True,
+        )
+        model.eval()
+        if self.quantize:
+            model = torch.ao.quantization.quantize_dynamic(
+                model,
+                {torch.nn.Linear},
+                dtype=torch.qint8,
+            )
+        self.model = model
+
+        super().__init__(
+            model_id=model_id,
+            max_length=max_length,
+            instruction=instruction,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            cache_path=cache_path,
+            cache_disk_size=cache_disk_size,
+        )
+
+    def compute_scores(
+        self,
+        pairs: List[Tuple[str, str]],
+        doc_tokens: Optional[List[List[int]]] = None,
+    ) -> List[float]:
+        messages = self.process_inputs(
+            pairs=pairs,
+            doc_tokens=doc_tokens,
+        )
+        scores = [0.0] * len(messages)
+        order = sorted(
+            range(len(messages)),
+            key=lambda i: len(messages[i]),
+        )
+        for start in range(0, len(order), self.batch_size):
+            positions = order[start : start + self.batch_size]
+            length = max(len(messages[i]) for i in positions)
+            input_ids = torch.full(
+                (len(positions), length),
+                self.tokenizer.pad_token_id,
+                dtype=torch.long,
+            )
+            attention_mask = torch.zeros(
+                (len(positions), length),
+                dtype=torch.long,
+            )
+            for row, i in enumerate(positions):
+                message = messages[i]
+                input_ids[row, length - len(message) :] = torch.tensor(
+                    message,
+                    dtype=torch.long,
+                )
+                attention_mask[row, length - len(message) :] = 1
+
+            with torch.inference_mode():
+                logits = self.model(
+                    input_ids=input_ids,
+                    attention_mask=attention_mask,
+                    position_ids=(attention_mask.cumsum(dim=-1) - 1).clamp(min=0),
+                    logits_to_keep=1,
+                ).logits[:, -1, :]
+                batch_scores = torch.stack(
+                    [
+                        logits[:, self.false_token],
+                        logits[:, self.true_token],
+                    ],
+                    dim=1,
+                ).softmax(dim=1)[:, 1]
+            for i, score in zip(positions, batch_scores.tolist()):
+                scores[i] = score
+        return scores
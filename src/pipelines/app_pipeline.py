@@ -1,4 +1,5 @@
-from typing import Dict, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterator, Tuple
+import json
 
 import streamlit as st
 import requests
@@ -22,13 +23,15 @@ def pipeline(
         input_value: str,
         input_type: str,
         category_value: Optional[str],
-    ) -> Optional[str]:
+        include_summary: bool = False,
+    ) -> Tuple[Any, Optional[Dict[str, Any]]]:
         if not config.remote_api_base_recommend:
             raise RuntimeError("remote_api_base_recommend is not set.")
         payload = {
             "input_value": input_value,
             "input_type": input_type,
             "category_value": category_value,
+            "include_summary": include_summary,
         }
         r = requests.post(
             f"{config.remote_api_base_recommend}/recommend",
@@ -38,21 +41,78 @@ def pipeline(
         )
         r.raise_for_status()
         data = r.json()
-        return data.get("result", data)
+        return data.get("result", data), data.get("summary")
 
-    def remote_report(recommendations: str) -> str:
+    def remote_report_stream(
+        recommendations: Union[str, Dict[str, Any]],
+    ) -> Iterator[str]:
         if not config.remote_api_base_report:
             raise RuntimeError("remote_api_base_report is not set.")
-        payload = {"recommendations": recommendations}
-        r = requests.post(
-            f"{config.remote_api_base_report}/report",
+        if isinstance(recommendations, dict):
+            payload = {"summary": recommendations}
+        else:
+            payload = {"recommendations": recommendations}
+        with requests.post(
+            f"{config.remote_api_base_report}/report/stream",
             json=payload,
             headers=_headers(),
             timeout=240,
+            stream=True,
+        ) as r:
+            r.raise_for_status()
+            r.encoding = "utf-8"
+            event = "message"
+            for line in r.iter_lines(decode_unicode=True):
+                if not line:
+                    event = "message"
+                    continue
+                if line.startswith("event:"):
+                    event = line[len("event:") :].strip()
+                elif line.startswith("data:"):
+                    data = json.loads(line[len("data:") :].strip())
+                    if event == "error":
+                        raise RuntimeError(
+                            data.get("detail", "Report generation failed.")
+                        )
+                    if event == "done":
+                        return
+                    yield data.get("text", "")
+
+    def recommend(
+        input_value: str,
+        input_type: str,
+        category_value: Optional[str],
+    ) -> Tuple[Any, Optional[List[Dict[str, Any]]], Optional[Dict[str, Any]]]:
+        if recommendation_manager is not None:
+            recommendations, candidates = (
+                recommendation_manager.recommend_with_candidates(
+                    input_value=input_value,
+                    input_type=input_type,
+                    category_value=category_value,
+                )
+            )
+            return recommendations, candidates, None
+        recommendations, summary = remote_recommend(
+            input_value=input_value,
+            input_type=input_type,
+            category_value=category_value,
+            include_summary=True,
         )
-        r.raise_for_status()
-        data = r.json()
-        return data.get("text", "")
+        return recommendations, None, summary
+
+    def get_summary() -> Optional[Dict[str, Any]]:
+        if recommendation_manager is not None:
+            return recommendation_manager.summarize(
+                st.session_state.get("last_candidates")
+            )
+        return st.session_state.get("last_summary")
+
+    def stream_report(
+        recommendations: Union[str, Dict[str, Any]],
+    ) -> Iterator[str]:
+        if report_manager is not None:
+            return report_manager.stream(recommendations=recommendations)
+        return remote_report_stream(recommendations=recommendations)
 
     @st.cache_resource(show_spinner=True)
     def get_cached_manager(
@@ -68,6 +128,7 @@ def pipeline(
     report_manager = get_cached_manager(manager_type="report")
 
     st.title("Recipe AI Demo")
+    report_streamed = False
 
     lab_number_recommendation_mode = "Lab number based recommendation"
     ingredients_recommendation_mode = "Ingredients based recommendation"
@@ -83,16 +144,7 @@ def pipeline(
     if option == lab_number_recommendation_mode:
         lab_id = st.text_input("Enter the lab number to recommend for:")
         try:
-            categories = (
-                recommendation_manager.index.df[
-                    recommendation_manager.category_column_name
-                ]
-                .dropna()
-                .astype(str)
-                .unique()
-                .tolist()
-            )
-            categories = sorted(categories)
+            categories = recommendation_manager.index.categories
         except Exception:
             categories = []
         category_options = ["ALL"] + categories
@@ -124,22 +176,17 @@ def pipeline(
 
                 with st.spinner("Recommendation in progress..."):
                     try:
-                        if recommendation_manager is not None:
-                            recommendations = recommendation_manager.recommend(
-                                input_value=lab_id,
-                                input_type=config.input_mode.lab_id,
-                                category_value=category_value,
-                            )
-                        else:
-                            recommendations = remote_recommend(
-                                input_value=lab_id,
-                                input_type=config.input_mode.lab_id,
-                                category_value=category_value,
-                            )
+                        recommendations, candidates, summary = recommend(
+                            input_value=lab_id,
+                            input_type=config.input_mode.lab_id,
+                            category_value=category_value,
+                        )
                     except Exception as e:
                         st.error(f"Error during recommendation: {e}")
                     else:
                         st.session_state["last_recommendations"] = recommendations
+                        st.session_state["last_candidates"] = candidates
+                        st.session_state["last_summary"] = summary
                         st.session_state["last_report"] = None
         if st.session_state.get("last_recommendations") is not None:
             st.subheader("Summary of AI recommendations")
@@ -153,25 +200,22 @@ def pipeline(
             else:
                 st.write(_rec)
             if st.button("generate report", key="gen_report_lab"):
-                with st.spinner("Report generation in progress..."):
-                    try:
-                        if report_manager is not None:
-                            report = report_manager.generate(
-                                recommendations=st.session_state[
-                                    "last_recommendations"
-                                ],
-                            )
-                        else:
-                            report = remote_report(
-                                recommendations=st.session_state[
-                                    "last_recommendations"
-                                ],
-                            )
-                    except Exception as e:
-                        st.error(f"Error during report generation: {e}")
-                    else:
-                        st.session_state["last_report"] = report
-        if st.session_state.get("last_report") is not None:
+                st.subheader("Summary of AI report")
+                try:
+                    report = st.write_stream(
+                        stream_report(
+                            recommendations=(
+                                get_summary()
+                                or st.session_state["last_recommendations"]
+                            ),
+                        )
+                    )
+                except Exception as e:
+                    st.error(f"Error during report generation: {e}")
+                else:
+                    st.session_state["last_report"] = report
+                    report_streamed = True
+        if st.session_state.get("last_report") is not None and not report_streamed:
             st.subheader("Summary of AI report")
             st.write(st.session_state["last_report"])
     elif option == ingredients_recommendation_mode:
@@ -183,16 +227,7 @@ def pipeline(
         )
 
         try:
-            categories = (
-                recommendation_manager.index.df[
-                    recommendation_manager.category_column_name
-                ]
-                .dropna()
-                .astype(str)
-                .unique()
-                .tolist()
-            )
-            categories = sorted(categories)
+            categories = recommendation_manager.index.categories
         except Exception:
             categories = []
         category_options = ["ALL"] + categories
@@ -223,7 +258,7 @@ def pipeline(
 
             with st.spinner("Recommendation in progress..."):
                 try:
-                    recommendations = recommendation_manager.recommend(
+                    recommendations, candidates, summary = recommend(
                         input_value=ingredients_query,
                         input_type=config.input_mode.ingredients,
                         category_value=category_value,
@@ -232,6 +267,8 @@ def pipeline(
                     st.error(f"Error during recommendation: {e}")
                 else:
                     st.session_state["last_recommendations"] = recommendations
+                    st.session_state["last_candidates"] = candidates
+                    st.session_state["last_summary"] = summary
                     st.session_state["last_report"] = None
         if st.session_state.get("last_recommendations") is not None:
             st.subheader("Summary of AI recommendations")
@@ -245,16 +282,22 @@ def pipeline(
             else:
                 st.write(_rec)
             if st.button("generate report", key="gen_report_ing"):
-                with st.spinner("Report generation in progress..."):
-                    try:
-                        report = report_manager.generate(
-                            recommendations=st.session_state["last_recommendations"],
+                st.subheader("Summary of AI report")
+                try:
+                    report = st.write_stream(
+                        stream_report(
+                            recommendations=(
+                                get_summary()
+                                or st.session_state["last_recommendations"]
+                            ),
                         )
-                    except Exception as e:
-                        st.error(f"Error during report generation: {e}")
-                    else:
-                        st.session_state["last_report"] = report
-        if st.session_state.get("last_report") is not None:
+                    )
+                except Exception as e:
+                    st.error(f"Error during report generation: {e}")
+                else:
+                    st.session_state["last_report"] = report
+                    report_streamed = True
+        if st.session_state.get("last_report") is not None and not report_streamed:
             st.subheader("Summary of AI report")
             st.write(st.session_state["last_report"])
     else:
@@ -76,7 +76,7 @@ def pipeline(
         if category_value.lower() == "all":
             category_value = None
 
-        recommendations = recommendation_manager.recommend(
+        recommendations, candidates = recommendation_manager.recommend_with_candidates(
             input_value=query_value,
             input_type=query_type,
             category_value=category_value,
@@ -101,9 +101,13 @@ def pipeline(
             print("Exiting. Bye!")
             break
         elif choice == "1":
-            report = report_manager.generate(recommendations=recommendations)
             print("\nSummary of AI report")
-            print(report)
+            summary = recommendation_manager.summarize(candidates)
+            for chunk in report_manager.stream(
+                recommendations=summary if summary is not None else recommendations,
+            ):
+                print(chunk, end="", flush=True)
+            print()
             continue
         elif choice == "2":
             continue
@@ -1,5 +1,15 @@
 from .setup import SetUp
+from .metrics import Histogram, render_metrics, render_gauges, render_stats
+from .batcher import MicroBatcher
+from .admission import AdmissionController, ServiceOverloaded
 
 __all__ = [
     "SetUp",
+    "Histogram",
+    "render_metrics",
+    "render_gauges",
+    "render_stats",
+    "MicroBatcher",
+    "AdmissionController",
+    "ServiceOverloaded",
 ]
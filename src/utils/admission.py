@@ -0,0 +1,159 @@
+from typing import Dict, Any, Callable, Optional, Iterator, AsyncIterator
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from contextlib import asynccontextmanager
+import asyncio
+import functools
+
+
+class ServiceOverloaded(Exception):
+    def __init__(
+        self,
+        status_code: int,
+        retry_after: float,
+        detail: str,
+    ) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.detail = detail
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue_size: int,
+        queue_timeout: float,
+        retry_after: float,
+    ) -> None:
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    async def acquire(self) -> None:
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.active + self.waiting >= self.max_concurrency + self.max_queue_size:
+            self.rejected += 1
+            raise ServiceOverloaded(
+                status_code=429,
+                retry_after=self.retry_after,
+                detail=f"{self.name} queue is full.",
+            )
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(
+                self.semaphore.acquire(),
+                timeout=self.queue_timeout,
+            )
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise ServiceOverloaded(
+                status_code=503,
+                retry_after=self.retry_after,
+                detail=f"{self.name} timed out waiting for capacity.",
+            )
+        finally:
+            self.waiting -= 1
+
+        self.admitted += 1
+        self.active += 1
+
+    def release(self) -> None:
+        self.active -= 1
+        self.semaphore.release()
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix=self.name,
+            )
+        return self.executor
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        async with self.admit():
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self.get_executor(),
+                functools.partial(func, *args, **kwargs),
+            )
+        return result
+
+    async def iterate(
+        self,
+        iterator: Iterator[Any],
+    ) -> AsyncIterator[Any]:
+        executor = self.get_executor()
+        sentinel = object()
+        pending: Optional[Future] = None
+        try:
+            while True:
+                pending = executor.submit(
+                    next,
+                    iterator,
+                    sentinel,
+                )
+                item = await asyncio.wrap_future(pending)
+                pending = None
+                if item is sentinel:
+                    break
+                yield item
+        finally:
+            if getattr(iterator, "close", None) is not None:
+                await asyncio.wrap_future(
+                    executor.submit(
+                        self.close_iterator,
+                        iterator,
+                        pending,
+                    )
+                )
+
+    @staticmethod
+    def close_iterator(
+        iterator: Iterator[Any],
+        pending: Optional[Future],
+    ) -> None:
+        if pending is not None:
+            wait([pending])
+        iterator.close()
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+        return stats
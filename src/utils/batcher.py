@@ -0,0 +1,185 @@
+from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import Future
+import queue
+import threading
+import time
+
+from ..managers import RecommendationManager
+from .metrics import Histogram
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        manager: RecommendationManager,
+        max_batch_size: int,
+        max_wait_ms: float,
+    ) -> None:
+        self.manager = manager
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self.requests: queue.Queue = queue.Queue()
+        self.batch_size_histogram = Histogram(
+            name="recommend_batch_size",
+            description="Number of requests served per batched call.",
+            buckets=[1, 2, 4, 8, 16, 32, 64, 128],
+        )
+        self.queue_depth_histogram = Histogram(
+            name="recommend_queue_depth",
+            description="Requests still queued when a batch is dispatched.",
+            buckets=[0, 1, 2, 4, 8, 16, 32, 64, 128, 256],
+        )
+        self.wait_histogram = Histogram(
+            name="recommend_queue_wait_seconds",
+            description="Time a request waits in the queue before dispatch.",
+            buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25],
+        )
+
+        self.running = True
+        self.worker = threading.Thread(
+            target=self.run,
+            name="recommend-batcher",
+            daemon=True,
+        )
+        self.worker.start()
+
+    def submit(
+        self,
+        input_value: str,
+        input_type: Any,
+        category_value: Optional[str],
+    ) -> Future:
+        if not self.running:
+            raise RuntimeError("Batcher is stopped.")
+        future: Future = Future()
+        self.requests.put(
+            (
+                (input_value, input_type, category_value),
+                future,
+                time.perf_counter(),
+            )
+        )
+        return future
+
+    def recommend(
+        self,
+        input_value: str,
+        input_type: Any,
+        category_value: Optional[str],
+        timeout: Optional[float] = None,
+    ) -> Tuple[str, Optional[List[Dict[str, Any]]], Optional[str]]:
+        future = self.submit(
+            input_value=input_value,
+            input_type=input_type,
+            category_value=category_value,
+        )
+        recommendation = future.result(timeout=timeout)
+        return recommendation
+
+    def run(self) -> None:
+        while self.running:
+            try:
+                first = self.requests.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if first is None:
+                break
+
+            batch = [first]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    request = (
+                        self.requests.get(timeout=remaining)
+                        if remaining > 0
+                        else self.requests.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if request is None:
+                    self.running = False
+                    break
+                batch.append(request)
+
+            self.dispatch(batch=batch)
+
+        self.drain()
+
+    def dispatch(
+        self,
+        batch: List[Tuple[Tuple[str, Any, Optional[str]], Future, float]],
+    ) -> None:
+        now = time.perf_counter()
+        self.batch_size_histogram.observe(len(batch))
+        self.queue_depth_histogram.observe(self.requests.qsize())
+        inputs = []
+        futures = []
+        for request, future, enqueued_at in batch:
+            self.wait_histogram.observe(now - enqueued_at)
+            if future.set_running_or_notify_cancel():
+                inputs.append(request)
+                futures.append(future)
+        if not futures:
+            return
+
+        with self.manager.index.pinned() as generation:
+            try:
+                recommendations = self.manager.recommend_batch_with_candidates(
+                    inputs=inputs
+                )
+            except Exception as e:
+                if len(futures) == 1:
+                    futures[0].set_exception(e)
+                    return
+                for request, future in zip(inputs, futures):
+                    self.dispatch_one(
+                        request=request,
+                        future=future,
+                        version=generation.version,
+                    )
+                return
+
+        for future, recommendation in zip(futures, recommendations):
+            future.set_result((*recommendation, generation.version))
+
+    def dispatch_one(
+        self,
+        request: Tuple[str, Any, Optional[str]],
+        future: Future,
+        version: Optional[str],
+    ) -> None:
+        try:
+            recommendation = self.manager.recommend_with_candidates(*request)
+        except Exception as e:
+            future.set_exception(e)
+            return
+        future.set_result((*recommendation, version))
+
+    def drain(self) -> None:
+        while True:
+            try:
+                request = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None:
+                request[1].cancel()
+
+    def shutdown(self) -> None:
+        self.running = False
+        self.requests.put(None)
+        self.worker.join()
+
+    def get_histograms(self) -> List[Histogram]:
+        return [
+            self.batch_size_histogram,
+            self.queue_depth_histogram,
+            self.wait_histogram,
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = {
+            histogram.name: histogram.get_stats() for histogram in self.get_histograms()
+        }
+        return stats
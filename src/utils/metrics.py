@@ -0,0 +1,114 @@
+from typing import Dict, List, Any
+import bisect
+import threading
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: List[float],
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(
+        self,
+        value: float,
+    ) -> None:
+        with self.lock:
+            self.counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.total += value
+            self.count += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            counts = list(self.counts)
+            total = self.total
+            count = self.count
+
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip(self.buckets + [float("inf")], counts):
+            cumulative += bucket_count
+            buckets[str(bound)] = cumulative
+        stats = {
+            "count": count,
+            "sum": total,
+            "mean": total / count if count else 0.0,
+            "buckets": buckets,
+        }
+        return stats
+
+    def render(self) -> str:
+        stats = self.get_stats()
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for bound, cumulative in stats["buckets"].items():
+            le = "+Inf" if bound == "inf" else bound
+            lines.append(f'{self.name}_bucket{{le="{le}"}} {cumulative}')
+        lines.append(f"{self.name}_sum {stats['sum']}")
+        lines.append(f"{self.name}_count {stats['count']}")
+        return "\n".join(lines)
+
+
+def render_metrics(
+    histograms: List[Histogram],
+) -> str:
+    text = "\n".join(histogram.render() for histogram in histograms) + "\n"
+    return text
+
+
+def render_gauges(
+    prefix: str,
+    values: Dict[str, float],
+) -> str:
+    lines = []
+    for key, value in values.items():
+        lines.append(f"# TYPE {prefix}_{key} gauge")
+        lines.append(f"{prefix}_{key} {value}")
+    text = "\n".join(lines) + "\n"
+    return text
+
+
+def get_gauges(
+    stats: Dict[str, Any],
+    prefix: str = "",
+) -> Dict[str, float]:
+    gauges = {}
+    for key, value in stats.items():
+        name = f"{prefix}_{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            gauges.update(
+                get_gauges(
+                    stats=value,
+                    prefix=name,
+                )
+            )
+        elif isinstance(value, bool):
+            gauges[name] = int(value)
+        elif isinstance(value, (int, float)):
+            gauges[name] = value
+    return gauges
+
+
+def render_stats(
+    prefix: str,
+    stats: Dict[str, Any],
+) -> str:
+    gauges = get_gauges(stats=stats)
+    if not gauges:
+        return ""
+    text = render_gauges(
+        prefix=prefix,
+        values=gauges,
+    )
+    return text
@@ -0,0 +1,187 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import pytest
+
+from hydra import initialize, compose
+from hydra.utils import instantiate
+from omegaconf import DictConfig
+
+from tokenizers import Tokenizer, decoders, models, pre_tokenizers, trainers
+from transformers import PreTrainedTokenizerFast
+
+from src.databases import FaissIndex
+from src.models import BaseEmbedding
+from src.managers import RecommendationManager
+
+NUM_LABS = 300
+CATEGORY_NAMES = ["cream", "lotion", "serum", "toner"]
+INGREDIENT_NAMES = [
+    "water",
+    "glycerin",
+    "butylene glycol",
+    "niacinamide",
+    "dimethicone",
+    "cetearyl alcohol",
+    "panthenol",
+    "squalane",
+    "sodium hyaluronate",
+    "tocopherol",
+    "allantoin",
+    "adenosine",
+    "xanthan gum",
+    "phenoxyethanol",
+    "shea butter",
+    "zinc oxide",
+]
+SPECIAL_TOKENS = [
+    "<|endoftext|>",
+    "<|im_start|>",
+    "<|im_end|>",
+    "<think>",
+    "</think>",
+]
+CHAT_TEMPLATE = (
+    "{% for message in messages %}"
+    "<|im_start|>{{ message['role'] }}\n{{ message['content'] }}<|im_end|>\n"
+    "{% endfor %}"
+    "{% if add_generation_prompt %}<|im_start|>assistant\n{% endif %}"
+)
+
+
+@pytest.fixture
+def config(
+    tmp_path,
+    monkeypatch,
+) -> DictConfig:
+    for name in ("PROJECT_DIR", "CONNECTED_DIR"):
+        monkeypatch.setenv(name, str(tmp_path))
+    with initialize(
+        version_base=None,
+        config_path="../configs",
+    ):
+        config = compose(
+            config_name="main.yaml",
+            overrides=[
+                "model=stub",
+                f"data_path={tmp_path}/data",
+                "dim=64",
+                "top_k.retrieval=20",
+            ],
+        )
+    return config
+
+
+def make_catalog(
+    config: DictConfig,
+) -> pd.DataFrame:
+    rng = np.random.default_rng(config.seed)
+    ingredients = []
+    amounts = []
+    for _ in range(NUM_LABS):
+        count = int(rng.integers(3, 8))
+        names = rng.choice(
+            INGREDIENT_NAMES,
+            size=count,
+            replace=False,
+        )
+        ingredients.append("|".join(names))
+        amount = np.sort(rng.dirichlet(np.ones(count)))[::-1] * 100
+        amounts.append("|".join(f"{value:.2f}" for value in amount))
+    categories = rng.integers(0, len(CATEGORY_NAMES), size=NUM_LABS)
+    catalog = pd.DataFrame(
+        {
+            config.lab_id_column_name: [f"LAB{i:05d}" for i in range(NUM_LABS)],
+            config.category_column_name: [f"C{c}" for c in categories.tolist()],
+            config.category_name_column_name: [
+                CATEGORY_NAMES[c] for c in categories.tolist()
+            ],
+            config.target_column_name: ingredients,
+            config.amount_column_name: amounts,
+        }
+    )
+    return catalog
+
+
+def build_index(
+    config: DictConfig,
+    embedding: BaseEmbedding,
+) -> FaissIndex:
+    os.makedirs(
+        config.data_path,
+        exist_ok=True,
+    )
+    make_catalog(config=config).to_csv(
+        os.path.join(
+            config.data_path,
+            config.items_name,
+        ),
+        index=False,
+    )
+    index: FaissIndex = instantiate(config.database)
+    index.import_items()
+    queries = index.items.column(config.target_column_name).tolist()
+    index.lexical.build(documents=queries)
+    index.lexical.save(version=index.version)
+    index.add(
+        embedded=embedding.embed_batch(
+            queries=[embedding.canonicalize_query(query=query) for query in queries],
+            batch_size=64,
+        )
+    )
+    index.save()
+    index.publish(keep_generations=config.build.keep_generations)
+    index.load()
+    return index
+
+
+@pytest.fixture
+def manager(
+    config: DictConfig,
+) -> RecommendationManager:
+    embedding = instantiate(config.model.embedding)
+    reranker = instantiate(config.model.reranker)
+    index = build_index(
+        config=config,
+        embedding=embedding,
+    )
+    manager: RecommendationManager = instantiate(
+        config.manager.recommendation,
+        embedding=embedding,
+        reranker=reranker,
+        index=index,
+    )
+    return manager
+
+
+@pytest.fixture(scope="session")
+def tokenizer_path(
+    tmp_path_factory,
+) -> str:
+    path = str(tmp_path_factory.mktemp("tokenizer"))
+    tokenizer = Tokenizer(models.BPE())
+    tokenizer.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    tokenizer.decoder = decoders.ByteLevel()
+    tokenizer.train_from_iterator(
+        INGREDIENT_NAMES
+        + [
+            'Judge whether the Document meets the requirements based on the Query and the Instruct provided. Note that the answer can only be "yes" or "no".',
+            "Given a recipe, retrieve similar recipes",
+        ],
+        trainers.BpeTrainer(
+            vocab_size=384,
+            special_tokens=SPECIAL_TOKENS,
+            initial_alphabet=pre_tokenizers.ByteLevel.alphabet(),
+        ),
+    )
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer,
+        eos_token="<|im_end|>",
+        pad_token="<|endoftext|>",
+        additional_special_tokens=SPECIAL_TOKENS[1:],
+    )
+    tokenizer.chat_template = CHAT_TEMPLATE
+    tokenizer.save_pretrained(path)
+    return path
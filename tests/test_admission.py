@@ -0,0 +1,69 @@
+from typing import Iterator
+import asyncio
+
+import pytest
+
+from src.utils import AdmissionController, ServiceOverloaded
+
+
+def get_controller() -> AdmissionController:
+    controller = AdmissionController(
+        name="test",
+        max_concurrency=1,
+        max_queue_size=1,
+        queue_timeout=0.05,
+        retry_after=3,
+    )
+    return controller
+
+
+def test_rejects_when_full_and_times_out_when_queued() -> None:
+    async def run() -> AdmissionController:
+        controller = get_controller()
+        await controller.acquire()
+        queued = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0)
+        assert controller.get_stats()["waiting"] == 1
+
+        with pytest.raises(ServiceOverloaded) as rejected:
+            await controller.acquire()
+        assert rejected.value.status_code == 429
+        assert rejected.value.retry_after == 3
+
+        with pytest.raises(ServiceOverloaded) as timed_out:
+            await queued
+        assert timed_out.value.status_code == 503
+
+        controller.release()
+        assert await controller.run(sum, [1, 2, 3]) == 6
+        controller.shutdown()
+        return controller
+
+    controller = asyncio.run(run())
+    assert controller.get_stats() == {
+        "active": 0,
+        "waiting": 0,
+        "admitted": 2,
+        "rejected": 1,
+        "timed_out": 1,
+    }
+
+
+def test_iterate_closes_abandoned_iterator() -> None:
+    closed = []
+
+    def generate() -> Iterator[int]:
+        try:
+            yield from range(10)
+        finally:
+            closed.append(True)
+
+    async def run() -> None:
+        controller = get_controller()
+        iterator = controller.iterate(generate())
+        assert [await iterator.__anext__(), await iterator.__anext__()] == [0, 1]
+        await iterator.aclose()
+        controller.shutdown()
+
+    asyncio.run(run())
+    assert closed == [True]
@@ -0,0 +1,105 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils import MicroBatcher
+
+VERSION = "v1"
+
+
+class FakeIndex:
+    @contextmanager
+    def pinned(self) -> Iterator[SimpleNamespace]:
+        yield SimpleNamespace(version=VERSION)
+
+
+class FakeManager:
+    def __init__(self) -> None:
+        self.index = FakeIndex()
+        self.batches: List[List[Tuple[str, Any, Optional[str]]]] = []
+
+    def recommend_batch_with_candidates(
+        self,
+        inputs: List[Tuple[str, Any, Optional[str]]],
+    ) -> List[Tuple[str, Optional[List[Dict[str, Any]]]]]:
+        self.batches.append(inputs)
+        return [self.recommend_with_candidates(*request) for request in inputs]
+
+    def recommend_with_candidates(
+        self,
+        input_value: str,
+        input_type: Any,
+        category_value: Optional[str],
+    ) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
+        if input_value == "bad":
+            raise ValueError(input_value)
+        return f"{input_value}:{category_value}", None
+
+
+def get_batcher(
+    manager: FakeManager,
+) -> MicroBatcher:
+    batcher = MicroBatcher(
+        manager=manager,
+        max_batch_size=8,
+        max_wait_ms=200,
+    )
+    return batcher
+
+
+def test_requests_share_one_batch() -> None:
+    manager = FakeManager()
+    batcher = get_batcher(manager=manager)
+    try:
+        futures = [
+            batcher.submit(
+                input_value=f"LAB{i}",
+                input_type=0,
+                category_value="C0",
+            )
+            for i in range(3)
+        ]
+        assert [future.result(timeout=5) for future in futures] == [
+            (f"LAB{i}:C0", None, VERSION) for i in range(3)
+        ]
+    finally:
+        batcher.shutdown()
+    assert len(manager.batches) == 1
+    assert batcher.get_stats()["recommend_batch_size"]["sum"] == 3
+    with pytest.raises(RuntimeError):
+        batcher.submit(
+            input_value="LAB0",
+            input_type=0,
+            category_value=None,
+        )
+
+
+def test_failed_batch_falls_back_to_single_requests() -> None:
+    manager = FakeManager()
+    batcher = get_batcher(manager=manager)
+    try:
+        futures = [
+            batcher.submit(
+                input_value=input_value,
+                input_type=0,
+                category_value=None,
+            )
+            for input_value in ("LAB0", "bad", "LAB1")
+        ]
+        assert futures[0].result(timeout=5) == ("LAB0:None", None, VERSION)
+        with pytest.raises(ValueError):
+            futures[1].result(timeout=5)
+        assert futures[2].result(timeout=5) == ("LAB1:None", None, VERSION)
+
+        with pytest.raises(ValueError):
+            batcher.recommend(
+                input_value="bad",
+                input_type=0,
+                category_value=None,
+                timeout=5,
+            )
+    finally:
+        batcher.shutdown()
+    assert [len(batch) for batch in manager.batches] == [3, 1]
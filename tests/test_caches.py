@@ -0,0 +1,204 @@
+from typing import List, Tuple, Optional
+import time
+
+import numpy as np
+
+from src.caches import LRUCache, SqliteCache, TieredCache, EmbeddingCache
+from src.models import StubReranker
+
+DIM = 4
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    cache = LRUCache(
+        max_size=2,
+        ttl=None,
+    )
+    cache.set(key="a", value=1)
+    cache.set(key="b", value=2)
+    assert cache.get("a") == 1
+    cache.set(key="c", value=3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    stats = cache.get_stats()
+    assert (stats["size"], stats["hits"], stats["misses"], stats["evictions"]) == (
+        2,
+        3,
+        1,
+        1,
+    )
+
+    disabled = LRUCache(
+        max_size=0,
+        ttl=None,
+    )
+    disabled.set(key="a", value=1)
+    assert len(disabled) == 0
+
+
+def test_lru_cache_expires_entries(
+    monkeypatch,
+) -> None:
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = LRUCache(
+        max_size=4,
+        ttl=10.0,
+    )
+    cache.set(key="a", value=1)
+    now[0] += 10.0
+    assert cache.get("a") == 1
+    now[0] += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0 and cache.get_stats()["evictions"] == 1
+
+
+def get_embedding_cache(
+    path: str,
+    max_size: int,
+) -> EmbeddingCache:
+    cache = EmbeddingCache(
+        max_size=max_size,
+        ttl=None,
+        path=path,
+        max_disk_size=10,
+        dim=DIM,
+        model_id="test",
+    )
+    return cache
+
+
+def test_embedding_cache_compacts_disk_tier(
+    tmp_path,
+) -> None:
+    path = str(tmp_path / "embedding_cache")
+    cache = get_embedding_cache(
+        path=path,
+        max_size=2,
+    )
+    keys = [f"{i:040x}" for i in range(12)]
+    for i, key in enumerate(keys[:11]):
+        cache.set(
+            key=key,
+            embedding=np.full(DIM, i, dtype=np.float32),
+        )
+    assert len(cache.disk) == 11
+    assert cache.get_stats()["disk_evictions"] == 0
+
+    cache.set(
+        key=keys[11],
+        embedding=np.full(DIM, 11, dtype=np.float32),
+    )
+    assert len(cache.disk) == 10
+    assert cache.get_stats()["disk_evictions"] == 2
+
+    reopened = get_embedding_cache(
+        path=path,
+        max_size=2,
+    )
+    assert reopened.get(keys[1]) is None
+    np.testing.assert_array_equal(reopened.get(keys[5]), np.full(DIM, 5))
+    stats = reopened.get_stats()
+    assert (stats["hits"], stats["disk_hits"], stats["misses"]) == (0, 1, 1)
+    np.testing.assert_array_equal(reopened.get(keys[5]), np.full(DIM, 5))
+    assert reopened.get_stats()["hits"] == 1
+
+
+def test_sqlite_cache_evicts_oldest_past_slack(
+    tmp_path,
+    monkeypatch,
+) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    path = str(tmp_path / "cache.sqlite")
+    cache = SqliteCache(
+        path=path,
+        max_size=10,
+        ttl=None,
+    )
+    for i in range(11):
+        now[0] += 1.0
+        cache.set_many(values={str(i): {"score": i}})
+    assert len(cache) == 11 and cache.evictions == 0
+
+    now[0] += 1.0
+    cache.set_many(values={"11": {"score": 11}})
+    assert len(cache) == 10 and cache.evictions == 2
+    assert cache.get_many(keys=["0", "1", "2"]) == {"2": {"score": 2}}
+
+    expiring = SqliteCache(
+        path=path,
+        max_size=None,
+        ttl=5.0,
+    )
+    assert len(expiring) == 6 and expiring.evictions == 4
+    now[0] += 1.0
+    assert set(expiring.get_many(keys=[str(i) for i in range(12)])) == {
+        str(i) for i in range(7, 12)
+    }
+
+
+def test_tiered_cache_promotes_disk_hits(
+    tmp_path,
+) -> None:
+    path = str(tmp_path / "cache.sqlite")
+    cache = TieredCache(
+        max_size=4,
+        ttl=None,
+        path=path,
+        max_disk_size=None,
+    )
+    cache.set_many(values={"a": 0.5, "b": 0.25})
+
+    reopened = TieredCache(
+        max_size=4,
+        ttl=None,
+        path=path,
+        max_disk_size=None,
+    )
+    assert reopened.get_many(keys=["a", "b", "c"]) == {"a": 0.5, "b": 0.25}
+    assert reopened.get("a") == 0.5
+    stats = reopened.get_stats()
+    assert (stats["hits"], stats["disk_hits"], stats["misses"]) == (1, 2, 1)
+    assert stats["disk_size"] == 2
+    assert stats["hit_rate"] == 0.75
+
+
+def test_reranker_scores_only_uncached_pairs(
+    tmp_path,
+) -> None:
+    reranker = StubReranker(
+        model_id="test",
+        instruction="Given a recipe, retrieve similar recipes",
+        cache_size=16,
+        cache_ttl=None,
+        cache_path=str(tmp_path / "reranker.sqlite"),
+        cache_disk_size=None,
+    )
+    computed = []
+    compute_scores = reranker.compute_scores
+
+    def count_scores(
+        pairs: List[Tuple[str, str]],
+        doc_tokens: Optional[List[List[int]]] = None,
+    ) -> List[float]:
+        computed.extend(pairs)
+        return compute_scores(
+            pairs=pairs,
+            doc_tokens=doc_tokens,
+        )
+
+    reranker.compute_scores = count_scores
+    scores = reranker(
+        query="water|glycerin",
+        candidates=["water", "glycerin"],
+    )
+    assert reranker(
+        query="water|glycerin",
+        candidates=["glycerin", "squalane", "water"],
+    ) == [
+        scores[1],
+        compute_scores(pairs=[("water|glycerin", "squalane")])[0],
+        scores[0],
+    ]
+    assert [doc for _, doc in computed] == ["water", "glycerin", "squalane"]
@@ -0,0 +1,86 @@
+from typing import List
+import hashlib
+
+import numpy as np
+
+import faiss
+
+from src.models import BaseEmbedding
+
+DIM = 32
+INSTRUCTION = "Given a recipe, retrieve similar recipes"
+CATALOG = [
+    "Water|Glycerin|Niacinamide",
+    "water| glycerin |SQUALANE",
+    "Butylene Glycol|Panthenol",
+    "Zinc Oxide|Titanium Dioxide|Dimethicone",
+    "Cetearyl Alcohol|Shea Butter",
+]
+
+
+class CaseSensitiveEmbedding(BaseEmbedding):
+    def encode(
+        self,
+        input_texts: List[str],
+    ) -> np.ndarray:
+        embeddings = np.stack(
+            [
+                np.random.default_rng(
+                    int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:8], 16)
+                ).standard_normal(self.dim)
+                for text in input_texts
+            ]
+        ).astype(np.float32)
+        embeddings /= np.linalg.norm(
+            embeddings,
+            axis=1,
+            keepdims=True,
+        )
+        return embeddings
+
+
+def get_embedding() -> CaseSensitiveEmbedding:
+    embedding = CaseSensitiveEmbedding(
+        model_id="test",
+        instruction=INSTRUCTION,
+        dim=DIM,
+        cache_size=16,
+        cache_ttl=None,
+        cache_path=None,
+        cache_disk_size=None,
+    )
+    return embedding
+
+
+def test_catalog_item_retrieves_itself() -> None:
+    embedding = get_embedding()
+    embedded = embedding.embed_batch(
+        queries=[BaseEmbedding.canonicalize_query(query=query) for query in CATALOG],
+        batch_size=2,
+    )
+    index = faiss.IndexFlatIP(DIM)
+    index.add(embedded)
+
+    _, indices = index.search(
+        embedding.embed_many(queries=CATALOG),
+        k=1,
+    )
+    assert indices[:, 0].tolist() == list(range(len(CATALOG)))
+    for row_id, query in enumerate(CATALOG):
+        _, indices = index.search(
+            embedding.embed(query=query).reshape(1, -1),
+            k=1,
+        )
+        assert indices[0, 0] == row_id
+
+
+def test_cache_key_matches_store_key() -> None:
+    embedding = get_embedding()
+    for query in CATALOG:
+        assert embedding.get_cache_key(query=query) == BaseEmbedding.get_key(
+            instruction=INSTRUCTION,
+            query=BaseEmbedding.canonicalize_query(query=query),
+        )
+    assert embedding.get_cache_key(query=CATALOG[0]) == embedding.get_cache_key(
+        query=" water |GLYCERIN|niacinamide "
+    )
@@ -0,0 +1,87 @@
+from typing import List, Optional
+
+import numpy as np
+
+from omegaconf import OmegaConf
+
+from src.models import StubEmbedding, EmbeddingPool
+
+DIM = 16
+INSTRUCTION = "Given a recipe, retrieve similar recipes"
+
+
+class DeviceEmbedding(StubEmbedding):
+    def __init__(
+        self,
+        model_id: str,
+        instruction: str,
+        dim: int,
+        device_id: int,
+        cache_size: int,
+        cache_ttl: Optional[float],
+        cache_path: Optional[str],
+        cache_disk_size: Optional[int],
+    ) -> None:
+        super().__init__(
+            model_id=model_id,
+            instruction=instruction,
+            dim=dim,
+            cache_size=cache_size,
+            cache_ttl=cache_ttl,
+            cache_path=cache_path,
+            cache_disk_size=cache_disk_size,
+        )
+        self.device_id = device_id
+
+    def encode(
+        self,
+        input_texts: List[str],
+    ) -> np.ndarray:
+        embeddings = super().encode(input_texts=input_texts)
+        embeddings[:, -1] = self.device_id
+        return embeddings
+
+
+def test_pool_shards_rows_in_order() -> None:
+    queries = [f"water|glycerin|ingredient {i}" for i in range(11)]
+    pool = EmbeddingPool(
+        embedding_config=OmegaConf.create(
+            {
+                "_target_": f"{__name__}.DeviceEmbedding",
+                "model_id": "test",
+                "instruction": INSTRUCTION,
+                "dim": DIM,
+                "device_id": None,
+                "cache_size": 16,
+                "cache_ttl": None,
+                "cache_path": None,
+                "cache_disk_size": None,
+            }
+        ),
+        device_ids=[0, 1],
+    )
+    try:
+        embedded = pool.embed_batch(
+            queries=queries,
+            batch_size=4,
+        )
+    finally:
+        pool.shutdown()
+
+    expected = StubEmbedding(
+        model_id="test",
+        instruction=INSTRUCTION,
+        dim=DIM,
+        cache_size=0,
+        cache_ttl=None,
+        cache_path=None,
+        cache_disk_size=None,
+    ).embed_batch(
+        queries=queries,
+        batch_size=4,
+    )
+    np.testing.assert_allclose(embedded[:, :-1], expected[:, :-1], rtol=1e-6)
+    devices = embedded[:, -1]
+    assert len(set(devices[:6].tolist())) == 1
+    assert len(set(devices[6:].tolist())) == 1
+    assert set(devices.tolist()) <= {0.0, 1.0}
@@ -0,0 +1,160 @@
+from typing import List
+import os
+import multiprocessing
+
+import numpy as np
+
+import pytest
+
+from src.databases import EmbeddingStore
+
+DIM = 8
+MODEL_ID = "test"
+
+
+def get_store(
+    store_path: str,
+) -> EmbeddingStore:
+    store = EmbeddingStore(
+        store_path=store_path,
+        dim=DIM,
+        model_id=MODEL_ID,
+    )
+    return store
+
+
+def get_vectors(
+    texts: List[str],
+) -> np.ndarray:
+    vectors = np.stack(
+        [
+            np.random.default_rng(
+                int(EmbeddingStore.get_key(text)[:8], 16)
+            ).standard_normal(DIM)
+            for text in texts
+        ]
+    ).astype(np.float32)
+    return vectors
+
+
+def put_texts(
+    store_path: str,
+    worker: int,
+) -> None:
+    store = get_store(store_path=store_path)
+    for start in range(0, 40, 5):
+        texts = [f"{worker}-{i}" for i in range(start, start + 5)] + ["shared"]
+        store.put_many(
+            keys=[EmbeddingStore.get_key(text) for text in texts],
+            vectors=get_vectors(texts=texts),
+            sync=False,
+        )
+
+
+def test_put_many_dedupes_and_checks_meta(
+    tmp_path,
+) -> None:
+    store_path = str(tmp_path / "store")
+    store = get_store(store_path=store_path)
+    texts = ["a", "b", "a"]
+    keys = [EmbeddingStore.get_key(text) for text in texts]
+    store.put_many(
+        keys=keys,
+        vectors=get_vectors(texts=texts),
+    )
+    assert len(store) == 2
+    assert store.get_rows(keys=keys + ["missing"]).tolist() == [0, 1, 0, -1]
+    np.testing.assert_array_equal(store.get(keys[1]), get_vectors(texts=["b"])[0])
+
+    with pytest.raises(ValueError):
+        EmbeddingStore(
+            store_path=store_path,
+            dim=DIM + 1,
+            model_id=MODEL_ID,
+        )
+
+
+def test_concurrent_writers_keep_keys_and_vectors_aligned(
+    tmp_path,
+) -> None:
+    store_path = str(tmp_path / "store")
+    reader = get_store(store_path=store_path)
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(
+            target=put_texts,
+            args=(store_path, worker),
+        )
+        for worker in range(4)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+        assert process.exitcode == 0
+
+    texts = [f"{worker}-{i}" for worker in range(4) for i in range(40)] + ["shared"]
+    for store in (reader, get_store(store_path=store_path)):
+        store.refresh()
+        assert len(store) == len(texts)
+        rows = store.get_rows(keys=[EmbeddingStore.get_key(text) for text in texts])
+        np.testing.assert_array_equal(
+            store.vectors[rows],
+            get_vectors(texts=texts),
+        )
+
+
+def test_compact_keeps_newest_rows_for_every_reader(
+    tmp_path,
+) -> None:
+    store_path = str(tmp_path / "store")
+    writer = get_store(store_path=store_path)
+    reader = get_store(store_path=store_path)
+    texts = [str(i) for i in range(10)]
+    for text in texts:
+        writer.put_many(
+            keys=[EmbeddingStore.get_key(text)],
+            vectors=get_vectors(texts=[text]),
+        )
+
+    assert writer.compact(max_size=4, ttl=None) == 6
+    assert writer.compact(max_size=4, ttl=None) == 0
+    reader.put_many(
+        keys=[EmbeddingStore.get_key("new")],
+        vectors=get_vectors(texts=["new"]),
+    )
+    writer.refresh()
+    for store in (writer, reader):
+        assert len(store) == 5
+        for text in texts[6:] + ["new"]:
+            np.testing.assert_array_equal(
+                store.get(EmbeddingStore.get_key(text)),
+                get_vectors(texts=[text])[0],
+            )
+        assert EmbeddingStore.get_key(texts[0]) not in store
+
+    assert writer.compact(max_size=None, ttl=0.0) == 5
+    reader.refresh()
+    assert len(reader) == 0 and reader.vectors is None
+
+
+def test_load_drops_torn_tail(
+    tmp_path,
+) -> None:
+    store_path = str(tmp_path / "store")
+    store = get_store(store_path=store_path)
+    texts = ["a", "b"]
+    store.put_many(
+        keys=[EmbeddingStore.get_key(text) for text in texts],
+        vectors=get_vectors(texts=texts),
+    )
+    with open(store.vectors_path, "ab") as f:
+        f.write(b"\0" * (DIM * 4 + 3))
+    with open(store.keys_path, "a") as f:
+        f.write("partial")
+
+    store = get_store(store_path=store_path)
+    assert len(store) == 2
+    assert os.path.getsize(store.vectors_path) == 2 * DIM * 4
+    with open(store.keys_path, "r") as f:
+        assert len(f.read().splitlines()) == 2
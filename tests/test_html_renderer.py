@@ -0,0 +1,77 @@
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+import pytest
+
+from src.managers import HtmlTableRenderer
+
+COLUMNS = ["성분 명칭", "함량(%)"]
+
+
+def render_with_styler(
+    rows: List[List[str]],
+    uuid: str,
+) -> str:
+    table_df = pd.DataFrame(
+        rows,
+        columns=COLUMNS,
+    )
+    html_table = (
+        table_df.style.set_uuid(uuid)
+        .set_properties(**{"text-align": "left"})
+        .set_table_styles(
+            [
+                {"selector": "th", "props": [("text-align", "left")]},
+                {"selector": "td", "props": [("text-align", "left")]},
+            ]
+        )
+        .hide(axis="index")
+        .to_html()
+    )
+    return html_table
+
+
+@pytest.mark.parametrize(
+    "rows",
+    [
+        [["water", "70.0000"]],
+        [
+            ["water", "62.5000"],
+            ["butylene glycol", "20.1250"],
+            ["zinc oxide", "n/a"],
+            ["<b>shea butter</b>", "0.0100"],
+        ],
+    ],
+)
+def test_render_table_matches_styler(
+    rows: List[List[str]],
+) -> None:
+    pytest.importorskip("jinja2")
+    assert HtmlTableRenderer.render_table(
+        columns=COLUMNS,
+        rows=rows,
+        table_id="T_42",
+    ) == render_with_styler(
+        rows=rows,
+        uuid="42",
+    )
+
+
+def test_fragments_are_cached_per_generation(
+    manager,
+) -> None:
+    candidates = manager.index.get_candidates(
+        indices=np.array([[0, 1, 0]]),
+        distances=np.array([[0.9, 0.8, 0.7]]),
+        score_column_name=manager.score_column_name,
+    )[0]
+    html_tables = manager.create_html_tables(reranked_candidates=candidates)
+    assert html_tables.count("<details>") == 3
+    assert 'id="T_1"' in html_tables
+    stats = manager.renderer.get_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+    assert manager.create_html_tables(reranked_candidates=candidates) == html_tables
+    assert manager.renderer.get_stats()["hits"] == 4
@@ -0,0 +1,140 @@
+import numpy as np
+
+from src.databases import LexicalIndex
+
+DOCUMENTS = [
+    "Water|Glycerin|Niacinamide",
+    "water|glycerin|squalane",
+    "Water|Zinc  Oxide",
+    "glycerin|panthenol|niacinamide|squalane",
+    float("nan"),
+]
+
+
+def get_lexical(
+    index_path: str,
+) -> LexicalIndex:
+    lexical = LexicalIndex(
+        index_path=index_path,
+        k1=1.2,
+        b=0.75,
+    )
+    lexical.build(documents=DOCUMENTS)
+    return lexical
+
+
+def test_tokenize_normalizes_terms() -> None:
+    assert LexicalIndex.tokenize(" Zinc  Oxide |WATER||") == ["zinc oxide", "water"]
+    assert LexicalIndex.tokenize(None) == []
+
+
+def test_search_ranks_rare_terms_first(
+    tmp_path,
+) -> None:
+    lexical = get_lexical(index_path=str(tmp_path / "lexical.npz"))
+    row_ids, scores = lexical.search(
+        query="zinc oxide|water",
+        top_k=10,
+    )
+    assert row_ids[0] == 2
+    assert sorted(row_ids.tolist()) == [0, 1, 2]
+    assert np.all(np.diff(scores) <= 0)
+
+    row_ids, _ = lexical.search(
+        query="niacinamide",
+        top_k=10,
+        rows=np.array([1, 3]),
+    )
+    assert row_ids.tolist() == [3]
+
+    row_ids, scores = lexical.search(
+        query="retinol",
+        top_k=10,
+    )
+    assert len(row_ids) == 0 and len(scores) == 0
+
+
+def test_save_and_load_check_version(
+    tmp_path,
+) -> None:
+    index_path = str(tmp_path / "lexical.npz")
+    lexical = get_lexical(index_path=index_path)
+    lexical.save(version="v1")
+    expected = lexical.search(
+        query="glycerin|squalane",
+        top_k=3,
+    )
+
+    loaded = LexicalIndex(
+        index_path=index_path,
+        k1=1.2,
+        b=0.75,
+    )
+    assert loaded.load(
+        num_rows=len(DOCUMENTS),
+        version="v1",
+    )
+    actual = loaded.search(
+        query="glycerin|squalane",
+        top_k=3,
+    )
+    np.testing.assert_array_equal(actual[0], expected[0])
+    np.testing.assert_allclose(actual[1], expected[1])
+
+    assert not loaded.load(
+        num_rows=len(DOCUMENTS),
+        version="v2",
+    )
+    assert not loaded.is_loaded
+    assert not loaded.load(
+        num_rows=len(DOCUMENTS) + 1,
+        version="v1",
+    )
+
+
+def test_fuse_ranks_rows_found_by_both_lists(
+    config,
+    manager,
+) -> None:
+    row_id = config.row_id_column_name
+    dense = [
+        {row_id: 1, "distance": 0.9},
+        {row_id: 2, "distance": 0.8},
+        {row_id: 3, "distance": 0.7},
+    ]
+    lexical = [
+        {row_id: 3, "lexical_score": 5.0},
+        {row_id: 4, "lexical_score": 4.0},
+    ]
+    fused = manager.fuse(ranked_lists=[dense, lexical])
+    assert [candidate[row_id] for candidate in fused] == [3, 1, 2, 4]
+    assert fused[0] == {row_id: 3, "distance": 0.7, "lexical_score": 5.0}
+
+    many = [{row_id: i} for i in range(manager.index.retrieval_top_k + 5)]
+    assert len(manager.fuse(ranked_lists=[many])) == manager.index.retrieval_top_k
+
+
+def test_hybrid_retrieval_adds_lexical_candidates(
+    config,
+    manager,
+) -> None:
+    query = manager.index.items.get_value(
+        row_id=0,
+        column_name=config.target_column_name,
+    )
+    dense = manager.retrieve_batch(
+        queries=[query],
+        query_embeddings=[None],
+        category_values=[None],
+        mode="dense",
+    )[0]
+    hybrid = manager.retrieve_batch(
+        queries=[query],
+        query_embeddings=[None],
+        category_values=[None],
+        mode="hybrid",
+    )[0]
+    assert config.retrieval.mode == "dense"
+    assert all(config.lexical_score_column_name not in c for c in dense)
+    assert any(config.lexical_score_column_name in c for c in hybrid)
+    assert hybrid[0][config.row_id_column_name] == 0
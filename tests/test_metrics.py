@@ -0,0 +1,54 @@
+from src.utils import render_stats
+
+
+def test_manager_stats_are_exported(
+    config,
+    manager,
+) -> None:
+    lab_id = manager.index.items.get_value(
+        row_id=0,
+        column_name=config.lab_id_column_name,
+    )
+    for _ in range(2):
+        manager.recommend(
+            input_value=lab_id,
+            input_type=config.input_mode.lab_id,
+            category_value=None,
+        )
+    text = render_stats(
+        prefix="recommend",
+        stats=manager.get_stats(),
+    )
+    names = {line.split()[0] for line in text.splitlines() if not line.startswith("#")}
+    for name in (
+        "recommend_embedding_cache_hit_rate",
+        "recommend_reranker_cache_hit_rate",
+        "recommend_result_cache_hits",
+        "recommend_cascade_requests",
+        "recommend_neighbor_table_loaded",
+        "recommend_neighbor_table_hits",
+        "recommend_index_num_rows",
+    ):
+        assert name in names
+    assert "recommend_index_version" not in names
+    assert "recommend_result_cache_hits 1" in text
+
+
+def test_render_stats_flattens_and_skips_non_numeric() -> None:
+    text = render_stats(
+        prefix="x",
+        stats={
+            "a": {"b": 1, "c": None, "d": {"e": 0.5}},
+            "f": True,
+            "g": "text",
+        },
+    )
+    assert text.splitlines() == [
+        "# TYPE x_a_b gauge",
+        "x_a_b 1",
+        "# TYPE x_a_d_e gauge",
+        "x_a_d_e 0.5",
+        "# TYPE x_f gauge",
+        "x_f 1",
+    ]
+    assert render_stats(prefix="x", stats={"a": None}) == ""
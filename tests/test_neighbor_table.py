@@ -0,0 +1,133 @@
+import os
+
+import numpy as np
+
+import pytest
+
+from hydra.utils import instantiate
+
+from src.databases import FaissIndex, NeighborTable
+
+TOP_N = 3
+
+
+def get_table(
+    path: str,
+) -> NeighborTable:
+    table = NeighborTable(
+        members_path=os.path.join(path, "neighbors.members.npy"),
+        rows_path=os.path.join(path, "neighbors.rows.npy"),
+        scores_path=os.path.join(path, "neighbors.scores.npy"),
+        counts_path=os.path.join(path, "neighbors.counts.npy"),
+        meta_path=os.path.join(path, "neighbors.json"),
+    )
+    return table
+
+
+def test_scopes_are_sized_by_members(
+    tmp_path,
+) -> None:
+    table = get_table(path=str(tmp_path))
+    table.create(
+        row_ids=np.array([7, 0, 3, 5]),
+        category_rows={
+            "C0": np.array([0, 5, 6]),
+            "C1": np.array([3]),
+        },
+        top_n=TOP_N,
+    )
+    assert table.rows.shape == (4 + 2 + 1, TOP_N)
+    assert table.get_members(category_value=None).tolist() == [0, 3, 5, 7]
+    assert table.get_members(category_value="C0").tolist() == [0, 5]
+
+    table.set(
+        row_id=5,
+        category_value="C0",
+        row_ids=[5, 0, 1, 2],
+        scores=[0.9, 0.8, 0.7, 0.6],
+    )
+    table.set(
+        row_id=3,
+        category_value=None,
+        row_ids=[],
+        scores=[],
+    )
+    with pytest.raises(KeyError):
+        table.set(
+            row_id=3,
+            category_value="C0",
+            row_ids=[3],
+            scores=[1.0],
+        )
+    table.commit(
+        version="v1",
+        reranker_id="reranker",
+    )
+
+    loaded = get_table(path=str(tmp_path))
+    assert not loaded.load(version="v2")
+    assert loaded.load(version="v1")
+    rows, scores = loaded.get(
+        row_id=5,
+        category_value="C0",
+    )
+    assert rows.tolist() == [5, 0, 1]
+    np.testing.assert_allclose(scores, [0.9, 0.8, 0.7])
+    rows, _ = loaded.get(
+        row_id=3,
+        category_value=None,
+    )
+    assert len(rows) == 0
+    assert loaded.get(row_id=0, category_value="C0") is None
+    assert loaded.get(row_id=6, category_value="C0") is None
+    assert loaded.get(row_id=3, category_value="C2") is None
+    assert loaded.get(row_id=100, category_value=None) is None
+
+
+def test_table_is_published_with_its_generation(
+    config,
+    manager,
+) -> None:
+    index = manager.index
+    published = index.version
+    assert not index.neighbors.is_loaded
+
+    staged: FaissIndex = instantiate(config.database)
+    staged.import_items()
+    staged.add(embedded=index.index.reconstruct_n(0, index.index.ntotal))
+    staged.save()
+    assert staged.get_staged_versions() == [staged.version]
+
+    staged.load(version=staged.version)
+    assert index.get_version() == published
+    staged.neighbors.create(
+        row_ids=np.fromiter(
+            staged.lab_rows.values(),
+            dtype=np.int64,
+        ),
+        category_rows=staged.category_rows,
+        top_n=TOP_N,
+    )
+    assert len(staged.neighbors.members) == 2 * len(staged.lab_rows)
+    staged.neighbors.set(
+        row_id=0,
+        category_value=None,
+        row_ids=[0, 1, 2],
+        scores=[3.0, 2.0, 1.0],
+    )
+    staged.neighbors.commit(
+        version=staged.version,
+        reranker_id=manager.reranker.cache_namespace,
+    )
+    staged.publish(keep_generations=config.build.keep_generations)
+    assert staged.get_staged_versions() == []
+
+    assert index.reload(wait=True)
+    assert index.version == staged.version
+    assert index.neighbors.is_loaded
+    neighbors = index.get_neighbors(
+        row_id=0,
+        category_value=None,
+        score_column_name=config.score_column_name,
+    )
+    assert [row[config.row_id_column_name] for row in neighbors] == [0, 1, 2]
@@ -0,0 +1,106 @@
+from typing import List, Tuple, Optional
+
+from src.models import BaseReranker
+
+INSTRUCTION = "Given a recipe, retrieve similar recipes"
+QUERY = "water|glycerin|niacinamide"
+DOCUMENT = "squalane|panthenol|shea butter|zinc oxide"
+
+
+class LengthReranker(BaseReranker):
+    def compute_scores(
+        self,
+        pairs: List[Tuple[str, str]],
+        doc_tokens: Optional[List[List[int]]] = None,
+    ) -> List[float]:
+        messages = self.process_inputs(
+            pairs=pairs,
+            doc_tokens=doc_tokens,
+        )
+        return [float(len(message)) for message in messages]
+
+
+def get_reranker(
+    model_id: str,
+    max_length: int,
+) -> LengthReranker:
+    reranker = LengthReranker(
+        model_id=model_id,
+        max_length=max_length,
+        instruction=INSTRUCTION,
+        cache_size=0,
+        cache_ttl=None,
+        cache_path=None,
+        cache_disk_size=None,
+    )
+    return reranker
+
+
+def test_prompt_matches_chat_template(
+    tokenizer_path: str,
+) -> None:
+    reranker = get_reranker(
+        model_id=tokenizer_path,
+        max_length=512,
+    )
+    message = reranker.process_inputs(pairs=[(QUERY, DOCUMENT)])[0]
+    template = reranker.tokenizer.apply_chat_template(
+        reranker.format_instruction(
+            query=QUERY,
+            doc=DOCUMENT,
+        ),
+        tokenize=False,
+        add_generation_prompt=False,
+    )
+    assert template.endswith("<|im_end|>\n")
+    expected = template[: -len("<|im_end|>\n")] + reranker.suffix
+    assert (
+        reranker.tokenizer.decode(
+            message,
+            clean_up_tokenization_spaces=False,
+        )
+        == expected
+    )
+
+    doc_tokens = BaseReranker.tokenize_documents(
+        tokenizer=reranker.tokenizer,
+        documents=[DOCUMENT],
+    )
+    assert (
+        reranker.process_inputs(
+            pairs=[(QUERY, DOCUMENT)],
+            doc_tokens=doc_tokens,
+        )[0]
+        == message
+    )
+
+
+def test_prompts_fit_max_length(
+    tokenizer_path: str,
+) -> None:
+    full_length = len(
+        get_reranker(
+            model_id=tokenizer_path,
+            max_length=512,
+        ).process_inputs(
+            pairs=[(QUERY, DOCUMENT)]
+        )[0]
+    )
+    reranker = get_reranker(
+        model_id=tokenizer_path,
+        max_length=full_length - 3,
+    )
+    assert reranker.prompt_budget > 0
+    query_tokens = reranker.get_query_tokens(query=QUERY)
+    message = reranker.process_inputs(pairs=[(QUERY, DOCUMENT)])[0]
+    assert len(message) == reranker.max_length - 1
+    assert message[-len(reranker.suffix_tokens) :] == reranker.suffix_tokens
+    start = len(reranker.prefix_tokens)
+    assert message[start : start + len(query_tokens)] == query_tokens
+
+    long_query = "|".join([QUERY] * 100)
+    for pair in ((long_query, DOCUMENT), (QUERY, "|".join([DOCUMENT] * 100))):
+        assert reranker(
+            query=pair[0],
+            candidates=[pair[1]],
+        ) == [float(reranker.max_length - 1)]
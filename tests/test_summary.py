@@ -0,0 +1,45 @@
+def test_summarize_counts_ingredients_across_labs(
+    config,
+    manager,
+) -> None:
+    candidates = [
+        {
+            config.lab_id_column_name: "L1",
+            config.category_name_column_name: "cream|lotion",
+            config.score_column_name: 0.91234,
+            config.target_column_name: "water|glycerin|niacinamide",
+            config.amount_column_name: "70|20|10",
+        },
+        {
+            config.lab_id_column_name: "L2",
+            config.category_name_column_name: "cream",
+            config.score_column_name: 0.5,
+            config.target_column_name: "water|glycerin",
+            config.amount_column_name: "80|x",
+        },
+        {
+            config.lab_id_column_name: "L3",
+            config.category_name_column_name: float("nan"),
+            config.score_column_name: float("nan"),
+            config.target_column_name: "water|squalane",
+            config.amount_column_name: "90",
+        },
+    ]
+    summary = manager.summarize(candidates)
+    assert summary["num_labs"] == 3
+    assert summary["labs"] == [
+        {"lab_id": "L1", "category": "cream, lotion", "score": 0.912},
+        {"lab_id": "L2", "category": "cream", "score": 0.5},
+        {"lab_id": "L3", "category": None, "score": None},
+    ]
+    assert summary["categories"] == [
+        {"name": "cream", "count": 2},
+        {"name": "lotion", "count": 1},
+    ]
+    assert summary["ingredients"] == [
+        {"name": "water", "count": 3, "min_amount": 70.0, "max_amount": 80.0},
+        {"name": "glycerin", "count": 2, "min_amount": 20.0, "max_amount": 20.0},
+        {"name": "niacinamide", "count": 1, "min_amount": 10.0, "max_amount": 10.0},
+        {"name": "squalane", "count": 1, "min_amount": None, "max_amount": None},
+    ]
+    assert manager.summarize([]) is None
@@ -0,0 +1,154 @@
+import numpy as np
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from transformers import PreTrainedTokenizerFast, Qwen3Config, Qwen3ForCausalLM
+
+from src.models import TorchEmbedding, TorchReranker, TorchGenerator
+
+DIM = 16
+TEXTS = [
+    "Water|Glycerin|Niacinamide",
+    "Butylene Glycol|Panthenol|Squalane",
+    "Zinc Oxide|Titanium Dioxide|Dimethicone",
+    "Judge whether the Document meets the requirements based on the Query and the Instruct provided.",
+    'Note that the answer can only be "yes" or "no".',
+]
+INSTRUCTION = {
+    "base": "Summarize the recommended recipes.",
+    "with_tables": "Summarize the recommended recipe tables.",
+}
+
+
+@pytest.fixture(scope="module")
+def model_id(
+    tmp_path_factory,
+    tokenizer_path: str,
+) -> str:
+    path = str(tmp_path_factory.mktemp("tiny-qwen3"))
+    tokenizer = PreTrainedTokenizerFast.from_pretrained(tokenizer_path)
+    tokenizer.save_pretrained(path)
+
+    torch.manual_seed(0)
+    model = Qwen3ForCausalLM(
+        Qwen3Config(
+            vocab_size=len(tokenizer),
+            hidden_size=32,
+            intermediate_size=64,
+            num_hidden_layers=2,
+            num_attention_heads=4,
+            num_key_value_heads=2,
+            head_dim=8,
+            max_position_embeddings=512,
+            eos_token_id=tokenizer.eos_token_id,
+            pad_token_id=tokenizer.pad_token_id,
+        )
+    )
+    model.save_pretrained(path)
+    return path
+
+
+def test_embedding_is_padding_invariant(
+    model_id: str,
+) -> None:
+    embedding = TorchEmbedding(
+        model_id=model_id,
+        max_length=64,
+        instruction="Given a recipe, retrieve similar recipes",
+        dim=DIM,
+        num_threads=1,
+        batch_size=2,
+        quantize=False,
+        cache_size=0,
+        cache_ttl=None,
+        cache_path=None,
+        cache_disk_size=None,
+    )
+    embedded = embedding.embed_batch(
+        queries=TEXTS[:3],
+        batch_size=3,
+    )
+    assert embedded.shape == (3, DIM)
+    np.testing.assert_allclose(
+        np.linalg.norm(embedded, axis=1),
+        1.0,
+        rtol=1e-5,
+    )
+    for i, query in enumerate(TEXTS[:3]):
+        np.testing.assert_allclose(
+            embedding.encode(
+                input_texts=[embedding.get_detailed_instruction(query=query)]
+            )[0],
+            embedded[i],
+            atol=1e-5,
+        )
+
+
+def test_reranker_scores_are_batch_invariant(
+    model_id: str,
+) -> None:
+    reranker = TorchReranker(
+        model_id=model_id,
+        max_length=256,
+        instruction="Given a recipe, retrieve similar recipes",
+        num_threads=1,
+        batch_size=2,
+        quantize=False,
+        cache_size=0,
+        cache_ttl=None,
+        cache_path=None,
+        cache_disk_size=None,
+    )
+    scores = reranker(
+        query=TEXTS[0],
+        candidates=TEXTS[:3],
+    )
+    assert len(scores) == 3
+    assert all(0.0 <= score <= 1.0 for score in scores)
+    for candidate, score in zip(TEXTS[:3], scores):
+        assert reranker(
+            query=TEXTS[0],
+            candidates=[candidate],
+        )[
+            0
+        ] == pytest.approx(score, abs=1e-5)
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_generator_generates_text(
+    model_id: str,
+    streaming: bool,
+) -> None:
+    generator = TorchGenerator(
+        model_id=model_id,
+        is_table=False,
+        instruction=INSTRUCTION,
+        role_column_name="role",
+        content_column_name="content",
+        max_new_tokens=4,
+        do_sample=False,
+        generation_config={},
+        num_threads=1,
+        batch_size=2,
+        quantize=False,
+        streaming=streaming,
+        cache_size=8,
+        cache_ttl=None,
+        cache_path=None,
+        cache_disk_size=None,
+        cache_sampled=False,
+    )
+    generation = generator(recommendations=TEXTS[0])
+    assert isinstance(generation, str)
+    assert isinstance("".join(generator.stream(recommendations=TEXTS[1])), str)
+
+    results = list(generator.batch(recommendations_list=TEXTS[:3]))
+    assert sorted(i for i, _, _ in results) == [0, 1, 2]
+    assert dict((i, text) for i, text, _ in results)[0] == generation
+    assert [timing["cached"] for i, _, timing in sorted(results)] == [
+        True,
+        True,
+        False,
+    ]
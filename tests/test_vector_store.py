@@ -0,0 +1,244 @@
+from typing import Dict, Any
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import pytest
+
+import faiss
+
+from src.databases import FaissIndex
+from src.databases.vector_store import LEGACY_VERSION
+
+NUM_ROWS = 2000
+DIM = 16
+RARE_ROWS = [7, 1500]
+NULL_ROWS = [3, 900]
+
+
+def get_index(
+    data_path: str,
+    index_factory: str,
+    exact_search_max_rows: int,
+    keep_generations: int = 1,
+) -> FaissIndex:
+    rng = np.random.default_rng(0)
+    categories = rng.choice(
+        ["a", "b"],
+        size=NUM_ROWS,
+    ).astype(object)
+    categories[RARE_ROWS] = "rare"
+    categories[NULL_ROWS] = None
+    pd.DataFrame(
+        {
+            "lab_no": [f"L{i}" for i in range(NUM_ROWS)],
+            "category": categories,
+            "ingredient_en": [f"ing{i % 50}|ing{i % 7}" for i in range(NUM_ROWS)],
+        }
+    ).to_csv(
+        f"{data_path}/items.csv",
+        index=False,
+    )
+
+    config: Dict[str, Any] = {
+        "data_path": data_path,
+        "indices_name": "items.faiss",
+        "items_name": "items.csv",
+        "item_columns": ["lab_no", "category", "ingredient_en"],
+        "dim": DIM,
+        "index_factory": index_factory,
+        "nlist": 16,
+        "nprobe": 4,
+        "hnsw_m": 8,
+        "ef_construction": 40,
+        "ef_search": 16,
+        "pq_m": 4,
+        "exact_search_max_rows": exact_search_max_rows,
+        "bm25_k1": 1.2,
+        "bm25_b": 0.75,
+        "retrieval_top_k": 10,
+        "lab_id_column_name": "lab_no",
+        "category_column_name": "category",
+        "row_id_column_name": "row_id",
+        "distance_column_name": "distance",
+        "lexical_score_column_name": "lexical_score",
+    }
+    index = FaissIndex(**config)
+    index.import_items()
+    embedded = rng.standard_normal((NUM_ROWS, DIM)).astype(np.float32)
+    embedded /= np.linalg.norm(
+        embedded,
+        axis=1,
+        keepdims=True,
+    )
+    if not index.is_trained:
+        index.train(embedded=embedded)
+    index.add(embedded=embedded)
+    index.save()
+    index.publish(keep_generations=keep_generations)
+    index.load()
+    return index
+
+
+@pytest.mark.parametrize(
+    "index_factory",
+    ["IVF16,Flat", "HNSW8"],
+)
+@pytest.mark.parametrize(
+    "exact_search_max_rows",
+    [0, 20000],
+)
+def test_rare_category_is_not_lost(
+    tmp_path,
+    index_factory: str,
+    exact_search_max_rows: int,
+) -> None:
+    index = get_index(
+        data_path=str(tmp_path),
+        index_factory=index_factory,
+        exact_search_max_rows=exact_search_max_rows,
+    )
+    query_embeddings = np.stack(
+        [index.get_vector(row_id=row_id) for row_id in range(20)]
+    )
+    for candidates in index.search_batch(
+        query_embeddings=query_embeddings,
+        category_value="rare",
+    ):
+        assert sorted(candidate["row_id"] for candidate in candidates) == RARE_ROWS
+
+
+@pytest.mark.parametrize(
+    "index_factory",
+    ["IVF16,Flat", "HNSW8"],
+)
+def test_filtered_search_returns_top_k(
+    tmp_path,
+    index_factory: str,
+) -> None:
+    index = get_index(
+        data_path=str(tmp_path),
+        index_factory=index_factory,
+        exact_search_max_rows=0,
+    )
+    query_embeddings = np.stack(
+        [index.get_vector(row_id=row_id) for row_id in range(20)]
+    )
+    for candidates in index.search_batch(
+        query_embeddings=query_embeddings,
+        category_value="a",
+    ):
+        assert len(candidates) == index.retrieval_top_k
+        assert all(candidate["category"] == "a" for candidate in candidates)
+
+
+@pytest.mark.parametrize(
+    "index_factory",
+    ["IVF16,Flat", "HNSW8"],
+)
+def test_search_parameters_scale_with_selectivity(
+    tmp_path,
+    index_factory: str,
+) -> None:
+    index = get_index(
+        data_path=str(tmp_path),
+        index_factory=index_factory,
+        exact_search_max_rows=0,
+    )
+    wide = index.get_search_parameters(
+        selector=index.category_selectors["a"],
+        num_rows=len(index.category_rows["a"]),
+    )
+    narrow = index.get_search_parameters(
+        selector=index.category_selectors["rare"],
+        num_rows=len(index.category_rows["rare"]),
+    )
+    if isinstance(narrow, faiss.SearchParametersIVF):
+        assert index.nprobe < wide.nprobe < narrow.nprobe == 16
+    else:
+        assert index.ef_search < wide.efSearch < narrow.efSearch == NUM_ROWS
+
+
+def test_null_categories_are_not_keys(
+    tmp_path,
+) -> None:
+    index = get_index(
+        data_path=str(tmp_path),
+        index_factory="Flat",
+        exact_search_max_rows=0,
+    )
+    assert sorted(index.category_rows) == ["a", "b", "rare"]
+    assert index.categories == ["a", "b", "rare"]
+    category_rows = np.concatenate(list(index.category_rows.values()))
+    assert len(category_rows) == NUM_ROWS - len(NULL_ROWS)
+    assert not set(NULL_ROWS) & set(category_rows.tolist())
+
+
+def test_legacy_layout_loads_as_a_generation(
+    tmp_path,
+) -> None:
+    data_path = str(tmp_path)
+    index = get_index(
+        data_path=data_path,
+        index_factory="Flat",
+        exact_search_max_rows=0,
+    )
+    faiss.write_index(
+        index.index,
+        f"{data_path}/items.faiss",
+    )
+    shutil.copy(
+        index.items.store_path,
+        f"{data_path}/items.arrow",
+    )
+    os.remove(index.manifest_path)
+    shutil.rmtree(index.generations_path)
+
+    index.load()
+    assert index.version == LEGACY_VERSION
+    assert len(index.items) == NUM_ROWS
+    assert (
+        index.search_batch(
+            query_embeddings=index.get_vector(row_id=0).reshape(1, -1),
+            category_value=None,
+        )[0][0]["row_id"]
+        == 0
+    )
+    assert not index.reload()
+
+
+def test_publish_prunes_only_published_generations(
+    tmp_path,
+) -> None:
+    data_path = str(tmp_path)
+    published = []
+    for i in range(3):
+        if i == 2:
+            staged = os.path.join(
+                index.generations_path,
+                "00000000000000-staged",
+            )
+            os.makedirs(staged)
+        index = get_index(
+            data_path=data_path,
+            index_factory="Flat",
+            exact_search_max_rows=0,
+            keep_generations=2,
+        )
+        published.append(index.version)
+    assert index.read_manifest()["history"] == published[-2:]
+    assert sorted(os.listdir(index.generations_path)) == sorted(
+        published[-2:] + [os.path.basename(staged)]
+    )
+
+    builder = get_index(
+        data_path=data_path,
+        index_factory="Flat",
+        exact_search_max_rows=0,
+    )
+    assert index.read_manifest()["history"] == [builder.version]
+    assert sorted(os.listdir(index.generations_path)) == sorted(
+        [builder.version, os.path.basename(staged)]
+    )